@@ -0,0 +1,124 @@
+"""Benchmark sensor file loading: load time and peak RSS per loader variant.
+
+Usage:
+    python benchmarks/bench_loader.py --size-mb 1024
+    python benchmarks/bench_loader.py --file path/to/recording.txt
+
+Each variant runs in a fresh child process so its peak RSS is not polluted by
+the other variants.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+VARIANTS = ('read_csv+to_numeric', 'c', 'c-float32', 'pyarrow', 'pyarrow-float32', 'chunked')
+
+
+def peak_rss_mb():
+    """Peak resident set size of the current process in MB (None if unknown)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and kilobytes on Linux
+        return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+    except ImportError:
+        try:
+            import psutil
+            return round(psutil.Process().memory_info().peak_wset / (1024 * 1024), 1)
+        except (ImportError, AttributeError):
+            return None
+
+
+def write_synthetic_file(path, size_mb, seed=0):
+    """Write a semicolon separated Index;Value file of roughly size_mb megabytes"""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    target_bytes = size_mb * 1024 * 1024
+    block = 1_000_000
+    start = 0
+    with open(path, 'w') as f:
+        while f.tell() < target_bytes:
+            index = np.arange(start, start + block)
+            values = np.round(rng.normal(0.0, 1000.0, block), 4)
+            f.write('\n'.join(f"{i};{v}" for i, v in zip(index.tolist(), values.tolist())))
+            f.write('\n')
+            start += block
+
+
+def run_variant(variant, file_path):
+    """Load file_path with one loader variant and return its measurements"""
+    import pandas as pd
+    from sensor_io import load_sensor_file, pyarrow_available
+
+    if variant.startswith('pyarrow') and not pyarrow_available():
+        return {'variant': variant, 'skipped': 'pyarrow not installed'}
+
+    start_time = time.perf_counter()
+    if variant == 'read_csv+to_numeric':
+        # The original Tab 1 / Tab 2 loading path
+        data = pd.read_csv(file_path, sep=';', header=None, names=['Index', 'Value'])
+        data['Index'] = pd.to_numeric(data['Index'])
+        data['Value'] = pd.to_numeric(data['Value'])
+    elif variant == 'chunked':
+        data = load_sensor_file(file_path, chunksize=1_000_000)
+    else:
+        engine, _, value_dtype = variant.partition('-')
+        data = load_sensor_file(file_path, engine=engine, value_dtype=value_dtype or 'float64')
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        'variant': variant,
+        'rows': len(data),
+        'seconds': round(elapsed, 3),
+        'peak_rss_mb': peak_rss_mb(),
+        'frame_mb': round(data.memory_usage(index=False).sum() / (1024 * 1024), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--file', help="existing sensor file to load (default: generate one)")
+    parser.add_argument('--size-mb', type=int, default=1024, help="size of the generated file in MB")
+    parser.add_argument('--variants', nargs='+', default=list(VARIANTS), choices=VARIANTS)
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_variant(args.child, args.file)))
+        return
+
+    file_path = args.file
+    temp_dir = None
+    if not file_path:
+        temp_dir = tempfile.TemporaryDirectory()
+        file_path = os.path.join(temp_dir.name, 'synthetic_sensor.txt')
+        print(f"Generating {args.size_mb} MB synthetic file...", file=sys.stderr)
+        write_synthetic_file(file_path, args.size_mb)
+
+    results = []
+    try:
+        for variant in args.variants:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--file', file_path, '--child', variant],
+                capture_output=True, text=True, check=True
+            ).stdout
+            result = json.loads(output)
+            results.append(result)
+            print(json.dumps(result), file=sys.stderr)
+    finally:
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+    print(json.dumps({'file_mb': round(os.path.getsize(file_path) / (1024 * 1024), 1) if args.file else args.size_mb,
+                      'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark window output formats: write and read-back throughput of xlsx, Parquet and HDF5.
+
+Usage:
+    python benchmarks/bench_output.py
+    python benchmarks/bench_output.py --windows 200 --rows 20000
+
+Every format receives the same synthetic windows through the extraction
+writers and is then read back sheet by sheet through WorkbookSheetCache, the
+path the Professional Plotting tab uses.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# (label, output format, Excel writer mode)
+VARIANTS = (
+    ('xlsx-standard', 'xlsx', 'standard'),
+    ('xlsx-streaming', 'xlsx', 'streaming'),
+    ('parquet', 'parquet', 'standard'),
+    ('hdf5', 'hdf5', 'standard'),
+)
+
+
+def path_size_mb(path):
+    if os.path.isdir(path):
+        size = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    else:
+        size = os.path.getsize(path)
+    return round(size / (1024 * 1024), 2)
+
+
+def synthetic_data(windows, rows, seed=0):
+    """Return (data, window tuples) with back-to-back windows of rows samples each"""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    total = windows * rows
+    data = pd.DataFrame({'Index': np.arange(total, dtype='int64'), 'Value': rng.normal(0.0, 1000.0, total)})
+    template = [(f"Window_{i+1}", i * rows, (i + 1) * rows - 1, rows) for i in range(windows)]
+    return data, template
+
+
+def run_variant(label, output_format, mode, data, template, folder):
+    from sensor_export import extract_windows
+    from sensor_store import OUTPUT_EXTENSIONS
+    from sensor_workbook import WorkbookSheetCache
+
+    output_path = os.path.join(folder, f"{label}{OUTPUT_EXTENSIONS[output_format]}")
+    try:
+        start_time = time.perf_counter()
+        summary = extract_windows(data, template, output_path, mode=mode, output_format=output_format)
+        write_seconds = time.perf_counter() - start_time
+    except ImportError as e:
+        return {'variant': label, 'skipped': str(e)}
+
+    sheet_cache = WorkbookSheetCache(max_rows=0)
+    start_time = time.perf_counter()
+    rows_read = 0
+    for sheet_name in sheet_cache.sheet_names(output_path):
+        rows_read += len(sheet_cache.read(output_path, sheet_name))
+    read_seconds = time.perf_counter() - start_time
+    sheet_cache.clear()
+
+    return {
+        'variant': label,
+        'rows': summary['rows'],
+        'write_seconds': round(write_seconds, 3),
+        'write_rows_per_second': round(summary['rows'] / write_seconds),
+        'read_seconds': round(read_seconds, 3),
+        'read_rows_per_second': round(rows_read / read_seconds) if read_seconds > 0 else None,
+        'size_mb': path_size_mb(output_path),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--windows', type=int, default=50, help="number of windows")
+    parser.add_argument('--rows', type=int, default=20000, help="rows per window")
+    parser.add_argument('--variants', nargs='+', default=[label for label, _, _ in VARIANTS],
+                        choices=[label for label, _, _ in VARIANTS])
+    args = parser.parse_args()
+
+    data, template = synthetic_data(args.windows, args.rows)
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        for label, output_format, mode in VARIANTS:
+            if label not in args.variants:
+                continue
+            result = run_variant(label, output_format, mode, data, template, folder)
+            results.append(result)
+            print(json.dumps(result), file=sys.stderr)
+
+    print(json.dumps({'windows': args.windows, 'rows_per_window': args.rows, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
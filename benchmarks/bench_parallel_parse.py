@@ -0,0 +1,84 @@
+"""Benchmark parsing one large sensor file in a process pool against a single pd.read_csv call.
+
+Usage:
+    python benchmarks/bench_parallel_parse.py --size-mb 2048 --workers 1 4 8 16
+    python benchmarks/bench_parallel_parse.py --file path/to/recording.txt
+
+The serial baselines are load_sensor_file with the pandas C parser (one
+core) and, when it is installed, with pyarrow's multi-threaded reader. Each
+parallel run is checked to return exactly the rows of the serial parse.
+Timings include starting the worker processes.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def timed(function, *args, **kwargs):
+    start_time = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--file', help="existing sensor file to parse (default: generate one)")
+    parser.add_argument('--size-mb', type=int, default=1024, help="size of the generated file in MB")
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4, os.cpu_count() or 1],
+                        help="process pool sizes to time")
+    parser.add_argument('--repeat', type=int, default=1, help="runs per variant (the fastest is reported)")
+    args = parser.parse_args()
+
+    from bench_loader import write_synthetic_file
+    from sensor_io import load_sensor_file, pyarrow_available
+    from sensor_parallel import load_sensor_file_parallel
+
+    file_path = args.file
+    temp_dir = None
+    if not file_path:
+        temp_dir = tempfile.TemporaryDirectory()
+        file_path = os.path.join(temp_dir.name, 'synthetic_sensor.txt')
+        print(f"Generating {args.size_mb} MB synthetic file...", file=sys.stderr)
+        write_synthetic_file(file_path, args.size_mb)
+
+    size_mb = os.path.getsize(file_path) / (1024 * 1024)
+    variants = [('read_csv-c', lambda: load_sensor_file(file_path, engine='c'))]
+    if pyarrow_available():
+        variants.append(('read_csv-pyarrow', lambda: load_sensor_file(file_path, engine='pyarrow')))
+    for workers in sorted(set(args.workers)):
+        variants.append((f"parallel-{workers}",
+                         lambda workers=workers: load_sensor_file_parallel(file_path, workers)))
+
+    results = []
+    reference = None
+    baseline_seconds = None
+    try:
+        for variant, load in variants:
+            seconds = None
+            for _ in range(max(args.repeat, 1)):
+                data, elapsed = timed(load)
+                seconds = elapsed if seconds is None else min(seconds, elapsed)
+            if reference is None:
+                reference = data
+                baseline_seconds = seconds
+            result = {'variant': variant, 'rows': len(data), 'seconds': round(seconds, 3),
+                      'mb_per_second': round(size_mb / seconds, 1),
+                      'speedup': round(baseline_seconds / seconds, 2),
+                      'identical': bool(data.equals(reference))}
+            results.append(result)
+            print(json.dumps(result), file=sys.stderr)
+            del data
+    finally:
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+    print(json.dumps({'file_mb': round(size_mb, 1), 'cpu_count': os.cpu_count(), 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""Benchmark GUI cold start: time to first paint and -X importtime totals.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 10
+
+Each measurement runs in a fresh interpreter. "lazy" is the normal start
+(Tab 1 only, heavy imports deferred); "eager" imports every heavy module and
+builds all five tabs before the first paint, which is how the application
+used to start. First paint needs a display; without one only the import
+times are reported.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+MODES = ('lazy', 'eager')
+
+# "import time: self [us] | cumulative | imported package", nested imports are indented
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)')
+
+
+def run_first_paint(mode, launched_at):
+    """Child process: start the GUI and report when its window is first mapped"""
+    child_start = time.perf_counter()
+    import tkinter as tk
+    import sensor_Data_Extractor as app_module
+
+    if mode == 'eager':
+        import importlib
+        for module_name in app_module.PRELOAD_MODULES + ('matplotlib.pyplot', 'matplotlib.backends.backend_tkagg'):
+            importlib.import_module(module_name)
+    imported = time.perf_counter()
+
+    root = tk.Tk()
+    app = app_module.SensorDataAnalyzer(root)
+    if mode == 'eager':
+        app.build_all_tabs()
+        app.ensure_plot_canvas()
+    constructed = time.perf_counter()
+
+    result = {'mode': mode}
+
+    def on_map(event):
+        if 'first_paint_seconds' in result:
+            return
+        root.update_idletasks()
+        result['first_paint_seconds'] = round(time.time() - launched_at, 3)
+        result['in_process_seconds'] = round(time.perf_counter() - child_start, 3)
+        result['import_seconds'] = round(imported - child_start, 3)
+        result['construct_seconds'] = round(constructed - imported, 3)
+        root.after(0, root.destroy)
+
+    root.bind('<Map>', on_map)
+    # Never hang the benchmark if the window manager does not map the window
+    root.after(30000, root.destroy)
+    root.mainloop()
+    return result
+
+
+def measure_first_paint(mode):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', mode, '--launched-at', repr(time.time())],
+        capture_output=True, text=True, check=True, cwd=REPO_DIR
+    ).stdout
+    return json.loads(output)
+
+
+def measure_importtime(module_name='sensor_Data_Extractor', top=10):
+    """Import time of module_name and its slowest direct imports from python -X importtime"""
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module_name}"],
+        capture_output=True, text=True, check=True, cwd=REPO_DIR
+    ).stderr
+
+    entries = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            entries.append((len(match.group(3)), match.group(4), int(match.group(2))))
+
+    # One space after the bar marks an import made by the startup script itself; importtime
+    # prints a module after everything it imported, so its direct imports (three spaces)
+    # are the lines just above it back to the previous top-level module
+    top_level = [(name, us) for indent, name, us in entries if indent == 1]
+    direct = []
+    for position, (indent, name, us) in enumerate(entries):
+        if indent == 1 and name == module_name:
+            for child_indent, child_name, child_us in reversed(entries[:position]):
+                if child_indent == 1:
+                    break
+                if child_indent == 3:
+                    direct.append((child_name, child_us))
+
+    module_cumulative = dict(top_level).get(module_name)
+    return {
+        'module': module_name,
+        'cumulative_ms': round(module_cumulative / 1000, 1) if module_cumulative is not None else None,
+        'total_ms': round(sum(us for _, us in top_level) / 1000, 1),
+        'slowest_imports': [{'module': name, 'cumulative_ms': round(us / 1000, 1)}
+                            for name, us in sorted(direct, key=lambda item: item[1], reverse=True)[:top]],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help="cold starts per mode (the median is reported)")
+    parser.add_argument('--modes', nargs='+', default=list(MODES), choices=MODES)
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--launched-at', type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_first_paint(args.child, args.launched_at)))
+        return
+
+    report = {'importtime': measure_importtime(), 'first_paint': []}
+    print(json.dumps(report['importtime']), file=sys.stderr)
+
+    if sys.platform.startswith('linux') and not os.environ.get('DISPLAY') and not os.environ.get('WAYLAND_DISPLAY'):
+        report['first_paint'] = {'skipped': 'no display available'}
+    else:
+        for mode in args.modes:
+            runs = [measure_first_paint(mode) for _ in range(args.repeat)]
+            result = {'mode': mode, 'runs': len(runs)}
+            for key in ('first_paint_seconds', 'in_process_seconds', 'import_seconds', 'construct_seconds'):
+                values = [run[key] for run in runs if key in run]
+                result[key] = round(statistics.median(values), 3) if values else None
+            report['first_paint'].append(result)
+            print(json.dumps(result), file=sys.stderr)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,270 @@
+"""Benchmark suite for the load, slice, export, scan and render hot paths.
+
+Usage:
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --rows 100000 10000000 100000000 --windows 10 500 5000
+    python benchmarks/bench_suite.py --output results.json --compare baseline.json
+
+Synthetic semicolon sensor files and text templates are generated into
+--work-dir (and reused by later runs with the same sizes). For every file
+size the suite times:
+
+  load    parsing the file as Tab 1 / Tab 2 load it (load_sensor_file)
+  slice   resolving every template window to its rows (WindowIndex) and
+          the Summary statistics pass
+  export  writing the windows to Excel as extract_from_template does, with
+          the standard and the streaming writer
+  scan    scanning the exported workbook as an Excel template and parsing
+          the text template
+  render  rendering the first sheets of the exported workbook as Tab 3 does
+
+Results are printed (and written to --output) as JSON. --compare prints the
+ratio of every timing to a previous results file and exits with status 1
+when any stage got slower than --threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+STAGES = ('load', 'slice', 'export', 'scan', 'render')
+EXPORT_MODES = ('standard', 'streaming')
+
+
+def write_sensor_file(path, rows, seed=0, block=1_000_000):
+    """Write an Index;Value file with rows samples"""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as f:
+        for start in range(0, rows, block):
+            count = min(block, rows - start)
+            values = np.round(rng.normal(0.0, 1000.0, count), 4)
+            f.write('\n'.join(f"{i};{v}" for i, v in zip(range(start, start + count), values.tolist())))
+            f.write('\n')
+    os.replace(temp_path, path)
+
+
+def write_text_template(path, rows, windows, window_rows):
+    """Write a text template with windows of window_rows samples spread evenly over rows"""
+    window_rows = max(1, min(window_rows, rows // windows))
+    spacing = rows // windows
+    with open(path, 'w') as f:
+        for i in range(windows):
+            start = i * spacing
+            f.write(f"{start},{start + window_rows - 1}\n")
+
+
+def synthetic_inputs(work_dir, rows, windows, window_rows):
+    """Return (data file, template file), generating them if they are not in work_dir yet"""
+    os.makedirs(work_dir, exist_ok=True)
+    data_file = os.path.join(work_dir, f"sensor_{rows}.txt")
+    if not os.path.exists(data_file):
+        print(f"Generating {rows:,} row sensor file...", file=sys.stderr)
+        write_sensor_file(data_file, rows)
+    template_file = os.path.join(work_dir, f"template_{rows}_{windows}_{window_rows}.txt")
+    if not os.path.exists(template_file):
+        write_text_template(template_file, rows, windows, window_rows)
+    return data_file, template_file
+
+
+def timed(function, *args, **kwargs):
+    start_time = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start_time
+
+
+def bench_load(data_file, rows):
+    from sensor_io import load_sensor_file
+
+    data, seconds = timed(load_sensor_file, data_file)
+    size_mb = os.path.getsize(data_file) / (1024 * 1024)
+    return data, {'stage': 'load', 'rows': rows, 'seconds': round(seconds, 4),
+                  'rows_per_second': round(rows / seconds), 'mb_per_second': round(size_mb / seconds, 1)}
+
+
+def bench_slice(data, windows, rows):
+    from sensor_stats import window_summary
+    from sensor_windows import WindowIndex
+
+    def slice_all():
+        data_index = WindowIndex(data)
+        return data_index, sum(len(data_index.window(start, end)) for _, start, end, _ in windows)
+
+    (data_index, window_rows), seconds = timed(slice_all)
+    _, summary_seconds = timed(window_summary, data_index, windows)
+    return {'stage': 'slice', 'rows': rows, 'windows': len(windows), 'window_rows_total': window_rows,
+            'seconds': round(seconds, 4), 'us_per_window': round(seconds / len(windows) * 1e6, 1),
+            'summary_seconds': round(summary_seconds, 4)}
+
+
+def bench_export(data, windows, rows, output_folder, mode):
+    from sensor_export import extract_windows
+
+    output_path = os.path.join(output_folder, f"export_{rows}_{len(windows)}_{mode}.xlsx")
+    summary, seconds = timed(extract_windows, data, windows, output_path, mode=mode)
+    return output_path, {'stage': 'export', 'variant': mode, 'rows': rows, 'windows': len(windows),
+                         'window_rows_total': summary['rows'], 'seconds': round(seconds, 4),
+                         'rows_per_second': round(summary['rows'] / seconds),
+                         'size_mb': round(os.path.getsize(output_path) / (1024 * 1024), 2)}
+
+
+def bench_scan(workbook, template_file, rows, windows):
+    from sensor_templates import parse_text_template, scan_excel_template
+
+    (_, excel_results), excel_seconds = timed(scan_excel_template, workbook)
+    _, text_seconds = timed(parse_text_template, template_file)
+    return [
+        {'stage': 'scan', 'variant': 'excel', 'rows': rows, 'windows': windows,
+         'sheets': len(excel_results), 'seconds': round(excel_seconds, 4)},
+        {'stage': 'scan', 'variant': 'text', 'rows': rows, 'windows': windows, 'seconds': round(text_seconds, 4)},
+    ]
+
+
+def bench_render(workbook, rows, windows, sheets, output_folder):
+    from sensor_plotting import plot_workbook_sheets
+    from sensor_stats import SUMMARY_SHEET
+    from sensor_workbook import WorkbookSheetCache
+
+    options = {'width': 12, 'height': 8, 'dpi': 300, 'file_format': 'png', 'style': None,
+               'x_label': 'Index', 'y_label': 'Value'}
+    sheet_cache = WorkbookSheetCache(max_rows=0)
+    sheet_names = [name for name in sheet_cache.sheet_names(workbook) if name != SUMMARY_SHEET][:sheets]
+    summary, seconds = timed(plot_workbook_sheets, workbook, sheet_names, output_folder, options,
+                             sheet_cache=sheet_cache)
+    return {'stage': 'render', 'rows': rows, 'windows': windows, 'figures': summary['successful'],
+            'seconds': round(seconds, 4), 'seconds_per_figure': round(seconds / max(summary['successful'], 1), 4)}
+
+
+def run_size(rows, window_counts, args, output_folder):
+    """All stages for one data file size"""
+    from sensor_templates import load_template
+
+    results = []
+    data_file, _ = synthetic_inputs(args.work_dir, rows, window_counts[0], args.window_rows)
+    # Every other stage works on the loaded data, so the file is always loaded
+    data, result = bench_load(data_file, rows)
+    if 'load' in args.stages:
+        results.append(result)
+        print(json.dumps(result), file=sys.stderr)
+
+    for window_count in window_counts:
+        _, template_file = synthetic_inputs(args.work_dir, rows, window_count, args.window_rows)
+        windows = load_template(template_file, 'text')
+        stage_results = []
+        if 'slice' in args.stages:
+            stage_results.append(bench_slice(data, windows, rows))
+
+        workbook = None
+        exported_rows = len(windows) * min(args.window_rows, rows // window_count)
+        # Scan and render read an exported workbook; one writer is enough when export is not timed
+        export_modes = EXPORT_MODES if 'export' in args.stages else ('streaming',)
+        for mode in export_modes:
+            if not {'export', 'scan', 'render'} & set(args.stages):
+                break
+            if exported_rows > args.export_max_rows:
+                stage_results.append({'stage': 'export', 'variant': mode, 'rows': rows, 'windows': window_count,
+                                      'skipped': f"{exported_rows:,} window rows > --export-max-rows"})
+                continue
+            workbook, result = bench_export(data, windows, rows, output_folder, mode)
+            if 'export' in args.stages:
+                stage_results.append(result)
+
+        if workbook is not None:
+            if 'scan' in args.stages:
+                stage_results.extend(bench_scan(workbook, template_file, rows, window_count))
+            if 'render' in args.stages:
+                stage_results.append(bench_render(workbook, rows, window_count, args.render_sheets, output_folder))
+
+        for result in stage_results:
+            print(json.dumps(result), file=sys.stderr)
+        results.extend(stage_results)
+    return results
+
+
+def environment():
+    """Versions and machine details recorded with every run"""
+    import numpy as np
+    import pandas as pd
+
+    try:
+        commit = subprocess.run(['git', 'describe', '--always', '--dirty'], capture_output=True, text=True,
+                                cwd=REPO_DIR, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'commit': commit, 'python': platform.python_version(), 'numpy': np.__version__,
+            'pandas': pd.__version__, 'platform': platform.platform(), 'cpu_count': os.cpu_count()}
+
+
+def result_key(result):
+    return (result['stage'], result.get('variant'), result['rows'], result.get('windows'))
+
+
+def compare(results, baseline, threshold):
+    """Print each timing against the baseline run; return True if any got slower than threshold"""
+    previous = {result_key(result): result for result in baseline['results'] if 'seconds' in result}
+    regressed = False
+    for result in results:
+        old = previous.get(result_key(result))
+        if old is None or 'seconds' not in result or not old['seconds']:
+            continue
+        ratio = result['seconds'] / old['seconds']
+        flag = ''
+        if ratio > threshold:
+            flag = '  REGRESSION'
+            regressed = True
+        stage, variant, rows, windows = result_key(result)
+        label = f"{stage}{'/' + variant if variant else ''} rows={rows:,}{f' windows={windows}' if windows else ''}"
+        print(f"{label}: {old['seconds']:.4f}s -> {result['seconds']:.4f}s (x{ratio:.2f}){flag}", file=sys.stderr)
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000, 10_000_000],
+                        help="data file sizes in rows (up to 100000000)")
+    parser.add_argument('--windows', type=int, nargs='+', default=[10, 100, 1000, 5000],
+                        help="template sizes in windows")
+    parser.add_argument('--window-rows', type=int, default=200, help="rows per template window")
+    parser.add_argument('--stages', nargs='+', default=list(STAGES), choices=STAGES)
+    parser.add_argument('--export-max-rows', type=int, default=1_000_000,
+                        help="skip Excel export (and scan/render) above this many window rows")
+    parser.add_argument('--render-sheets', type=int, default=5, help="figures rendered per template size")
+    parser.add_argument('--work-dir', default=os.path.join(tempfile.gettempdir(), 'sensor_bench'),
+                        help="where synthetic inputs are generated and kept")
+    parser.add_argument('--output', help="also write the JSON results to this file")
+    parser.add_argument('--compare', help="previous results file to compare against")
+    parser.add_argument('--threshold', type=float, default=1.2, help="slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as output_folder:
+        for rows in args.rows:
+            window_counts = [count for count in args.windows if count <= rows]
+            if window_counts:
+                results.extend(run_size(rows, window_counts, args, output_folder))
+
+    report = {'environment': environment(), 'results': results}
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,33 @@
+# -*- coding: cp1252 -*-
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
 import os
+import threading
 import time
 from datetime import datetime
 
+# pandas, matplotlib and openpyxl take most of the cold start, so they (and the
+# sensor_* modules built on them) are imported where they are first used and
+# warmed up on a background thread once the window is on screen
+from sensor_decimation import DECIMATION_METHODS
+from sensor_jobs import BackgroundJob, default_worker_count, format_duration
+
+# Imported by preload_heavy_modules() after the first paint
+PRELOAD_MODULES = ('numpy', 'pandas', 'openpyxl', 'matplotlib.figure', 'matplotlib.backends.backend_agg',
+                   'sensor_cache', 'sensor_export', 'sensor_templates', 'sensor_windows', 'sensor_workbook')
+
+
+def preload_heavy_modules():
+    """Import the heavy modules ahead of the first click that needs them (runs on a daemon thread)"""
+    import importlib
+    for module_name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            # Reported properly by the feature that needs the module
+            pass
+
+
 class SensorDataAnalyzer:
     def __init__(self, root):
         self.root = root
@@ -40,18 +60,56 @@ class SensorDataAnalyzer:
         
         # Initialize variables for all tabs
         self.data = None
+        self.data_index = None
         self.current_window_data = None
         self.excel_writer = None
         self.excel_filename = None
         self.window_ranges = []
         self.current_sensor_index = 0
         
-        # Setup all tabs
+        # Shared loader setting for Tab 1 and Tab 2 (float32 halves the Value column memory)
+        self.compact_values = tk.BooleanVar(value=False)
+        
+        # Parsed sensor files are cached as binary columns so re-opening a file skips the text parse
+        self.use_parse_cache = tk.BooleanVar(value=True)
+        self.sensor_cache = None  # SensorFileCache, created on first load
+        
+        # Memory-mapped columns keep huge recordings on disk; only touched windows become resident
+        self.use_memory_map = tk.BooleanVar(value=False)
+        
+        # Processes parsing one large text file in parallel (1 parses it on the calling thread)
+        self.parse_workers = tk.StringVar(value=str(default_worker_count()))
+        
+        # Output format for new exports (Excel workbook, Parquet folder or HDF5 file)
+        self.output_format = tk.StringVar(value="xlsx")
+        
+        # Setup the first tab now; the others are built the first time they are selected
         self.setup_tab1()
-        self.setup_tab2()
-        self.setup_tab3()
-        self.setup_tab4()  # New tutorial tab
-        self.setup_tab5()  # New about tab
+        self.tab_builders = {
+            str(self.tab2): self.setup_tab2,
+            str(self.tab3): self.setup_tab3,
+            str(self.tab4): self.setup_tab4,  # New tutorial tab
+            str(self.tab5): self.setup_tab5,  # New about tab
+        }
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        
+        # Warm up the heavy imports once the window is on screen
+        self.root.after_idle(lambda: threading.Thread(target=preload_heavy_modules, daemon=True).start())
+        
+    def on_tab_changed(self, event=None):
+        """Build a tab the first time it is selected"""
+        self.build_tab(self.notebook.select())
+        
+    def build_tab(self, tab):
+        """Build one lazily constructed tab (no-op if it is already built)"""
+        builder = self.tab_builders.pop(str(tab), None)
+        if builder is not None:
+            builder()
+        
+    def build_all_tabs(self):
+        """Build every tab that has not been shown yet"""
+        for tab in list(self.tab_builders):
+            self.build_tab(tab)
         
     def setup_tab1(self):
         # Main frame for tab1
@@ -68,6 +126,7 @@ class SensorDataAnalyzer:
         self.file_path = tk.StringVar()
         ttk.Entry(main_frame, textvariable=self.file_path, width=50).grid(row=0, column=1, sticky=(tk.W, tk.E), pady=5, padx=5)
         ttk.Button(main_frame, text="Browse", command=self.browse_file).grid(row=0, column=2, pady=5, padx=5)
+        self.create_loader_options(main_frame).grid(row=0, column=3, sticky=tk.W, pady=5, padx=5)
         
         # Plot controls section
         plot_frame = ttk.LabelFrame(main_frame, text="Plot Controls", padding="10")
@@ -95,6 +154,29 @@ class SensorDataAnalyzer:
         self.windows_listbox.grid(row=2, column=0, columnspan=6, sticky=(tk.W, tk.E), pady=5)
         ttk.Button(plot_frame, text="Remove Selected", command=self.remove_selected_window).grid(row=2, column=6, pady=5, padx=5)
         
+        # Plot decimation (large series are drawn at screen resolution and refined on zoom)
+        ttk.Label(plot_frame, text="Plot Decimation:").grid(row=3, column=0, sticky=tk.W, pady=5, padx=5)
+        self.decimation_method = tk.StringVar(value="minmax")
+        decimation_combo = ttk.Combobox(plot_frame, textvariable=self.decimation_method, width=10, state='readonly')
+        decimation_combo['values'] = DECIMATION_METHODS
+        decimation_combo.grid(row=3, column=1, sticky=tk.W, pady=5, padx=5)
+        
+        # Channel shown for multi-channel recordings (filled in when a file is loaded)
+        ttk.Label(plot_frame, text="Channel:").grid(row=3, column=2, sticky=tk.W, pady=5, padx=5)
+        self.plot_channel = tk.StringVar(value="Value")
+        self.channel_combo = ttk.Combobox(plot_frame, textvariable=self.plot_channel, width=15, state='readonly')
+        self.channel_combo['values'] = ('Value',)
+        self.channel_combo.grid(row=3, column=3, columnspan=2, sticky=tk.W, pady=5, padx=5)
+        
+        # Follow mode: keep parsing rows appended to a recording that is still being written
+        self.follow_file = tk.BooleanVar(value=False)
+        ttk.Checkbutton(plot_frame, text="Follow File (live)", variable=self.follow_file, command=self.toggle_follow).grid(row=4, column=0, sticky=tk.W, pady=5, padx=5)
+        ttk.Label(plot_frame, text="Refresh (s):").grid(row=4, column=1, sticky=tk.W, pady=5, padx=5)
+        self.follow_interval = tk.StringVar(value="2")
+        ttk.Spinbox(plot_frame, from_=0.5, to=60, increment=0.5, textvariable=self.follow_interval, width=6).grid(row=4, column=2, sticky=tk.W, pady=5, padx=5)
+        self.follow_extract = tk.BooleanVar(value=False)
+        ttk.Checkbutton(plot_frame, text="Extract Template Windows Live", variable=self.follow_extract).grid(row=4, column=3, columnspan=3, sticky=tk.W, pady=5, padx=5)
+        
         # Excel export section
         export_frame = ttk.LabelFrame(main_frame, text="Export to Excel", padding="10")
         export_frame.grid(row=2, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=10)
@@ -114,6 +196,7 @@ class SensorDataAnalyzer:
         self.excel_status_var.set("No Excel file created yet")
         excel_status_label = ttk.Label(export_frame, textvariable=self.excel_status_var, foreground="red")
         excel_status_label.grid(row=1, column=0, columnspan=5, sticky=tk.W, pady=5)
+        self.create_output_format_options(export_frame).grid(row=2, column=0, columnspan=5, sticky=tk.W, pady=5)
         
         # Status section
         self.status_var = tk.StringVar()
@@ -128,11 +211,67 @@ class SensorDataAnalyzer:
         plot_area_frame.rowconfigure(0, weight=1)
         main_frame.rowconfigure(4, weight=2)
         
+        # The figure and canvas are created on the first plot (matplotlib is slow to import)
+        self.plot_area_frame = plot_area_frame
+        self.fig = self.ax = self.canvas = None
+        self.plotted_line = None
+        self.plotted_channel = None
+        self.plot_shows_all = False
+        
+        # Follow mode state (SensorFileFollower, LiveWindowExtractor, the initial load job and the pending timer)
+        self.follower = None
+        self.live_extractor = None
+        self.follow_job = None
+        self.follow_after_id = None
+        
+    def ensure_plot_canvas(self):
+        """Create the Tab 1 figure, canvas and toolbar on first use"""
+        if self.canvas is not None:
+            return
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        from matplotlib.figure import Figure
+        
         # Create figure and canvas with 2x height
-        self.fig, self.ax = plt.subplots(figsize=(10, 12))
-        self.canvas = FigureCanvasTkAgg(self.fig, master=plot_area_frame)
+        self.fig = Figure(figsize=(10, 12))
+        self.ax = self.fig.add_subplot(111)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_area_frame)
         self.canvas.get_tk_widget().grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
+        # Zoom/pan toolbar; decimated lines re-sample the visible range on every change
+        toolbar = NavigationToolbar2Tk(self.canvas, self.plot_area_frame, pack_toolbar=False)
+        toolbar.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        
+    def create_loader_options(self, parent):
+        """Create the sensor file loader options shared by Tab 1 and Tab 2"""
+        options_frame = ttk.Frame(parent)
+        ttk.Checkbutton(options_frame, text="Load values as float32", variable=self.compact_values).grid(row=0, column=0, padx=5)
+        ttk.Checkbutton(options_frame, text="Use parse cache", variable=self.use_parse_cache).grid(row=0, column=1, padx=5)
+        ttk.Checkbutton(options_frame, text="Memory-map (huge files)", variable=self.use_memory_map).grid(row=0, column=2, padx=5)
+        ttk.Label(options_frame, text="Parse workers:").grid(row=0, column=3, padx=5)
+        ttk.Spinbox(options_frame, from_=1, to=max(os.cpu_count() or 1, 1), textvariable=self.parse_workers, width=4).grid(row=0, column=4, padx=5)
+        return options_frame
+        
+    def create_output_format_options(self, parent):
+        """Create the output format selector shared by Tab 1 and Tab 2"""
+        options_frame = ttk.Frame(parent)
+        ttk.Label(options_frame, text="Output Format:").grid(row=0, column=0, padx=5)
+        format_combo = ttk.Combobox(options_frame, textvariable=self.output_format, width=10, state='readonly')
+        # sensor_store.OUTPUT_FORMATS, spelled out so pandas stays off the startup path
+        format_combo['values'] = ('xlsx', 'parquet', 'hdf5')
+        format_combo.grid(row=0, column=1, padx=5)
+        ttk.Label(options_frame, text="(Parquet/HDF5: fast columnar store, no sheet row limit, plots in Tab 3)",
+                  foreground="gray").grid(row=0, column=2, padx=5)
+        return options_frame
+        
+    def output_filetypes(self):
+        """Return (default extension, file dialog types) for the selected output format"""
+        output_format = self.output_format.get()
+        if output_format == 'parquet':
+            return ".parquet", [("Parquet window store", "*.parquet"), ("All files", "*.*")]
+        if output_format == 'hdf5':
+            return ".h5", [("HDF5 files", "*.h5 *.hdf5"), ("All files", "*.*")]
+        return ".xlsx", [("Excel files", "*.xlsx"), ("All files", "*.*")]
+        
     def setup_tab2(self):
         """Setup the batch extraction tab"""
         # Main frame for tab2
@@ -180,6 +319,28 @@ class SensorDataAnalyzer:
         self.new_data_file_path = tk.StringVar()
         ttk.Entry(data_frame, textvariable=self.new_data_file_path, width=50).grid(row=0, column=1, sticky=(tk.W, tk.E), pady=5, padx=5)
         ttk.Button(data_frame, text="Browse Data", command=self.browse_new_data_file).grid(row=0, column=2, pady=5, padx=5)
+        self.create_loader_options(data_frame).grid(row=0, column=3, sticky=tk.W, pady=5, padx=5)
+        
+        # Multi-file batch: the same template applied to every file in a folder or glob pattern
+        ttk.Label(data_frame, text="Or Batch Folder / Pattern:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        self.batch_data_source = tk.StringVar()
+        ttk.Entry(data_frame, textvariable=self.batch_data_source, width=50).grid(row=1, column=1, sticky=(tk.W, tk.E), pady=5, padx=5)
+        ttk.Button(data_frame, text="Browse Folder", command=self.browse_batch_data_folder).grid(row=1, column=2, pady=5, padx=5)
+        
+        # Streaming extraction reads the data file in chunks instead of loading it
+        self.stream_extraction = tk.BooleanVar(value=False)
+        ttk.Checkbutton(data_frame, text="Stream data file in chunks (files larger than RAM, uses the streaming writer)",
+                        variable=self.stream_extraction).grid(row=2, column=0, columnspan=3, sticky=tk.W, pady=5)
+        
+        # Incremental extraction only rewrites the windows that changed since the last run
+        self.incremental_extraction = tk.BooleanVar(value=False)
+        ttk.Checkbutton(data_frame, text="Incremental: only write new or changed windows and drop removed ones",
+                        variable=self.incremental_extraction).grid(row=3, column=0, columnspan=3, sticky=tk.W, pady=5)
+        
+        # Seeking reads only the template windows through a byte-offset index of the data file
+        self.seek_extraction = tk.BooleanVar(value=False)
+        ttk.Checkbutton(data_frame, text="Seek to windows with a byte-offset index (a few windows from a huge file sorted by Index)",
+                        variable=self.seek_extraction).grid(row=4, column=0, columnspan=3, sticky=tk.W, pady=5)
         
         # Output file section
         output_frame = ttk.LabelFrame(main_frame, text="Output File", padding="10")
@@ -190,7 +351,21 @@ class SensorDataAnalyzer:
         self.output_file_path = tk.StringVar()
         ttk.Entry(output_frame, textvariable=self.output_file_path, width=50).grid(row=0, column=1, sticky=(tk.W, tk.E), pady=5, padx=5)
         ttk.Button(output_frame, text="Browse Output", command=self.browse_output_file).grid(row=0, column=2, pady=5, padx=5)
-        
+
+        ttk.Label(output_frame, text="Batch Output Folder:").grid(row=2, column=0, sticky=tk.W, pady=5)
+        self.batch_output_folder = tk.StringVar()
+        ttk.Entry(output_frame, textvariable=self.batch_output_folder, width=50).grid(row=2, column=1, sticky=(tk.W, tk.E), pady=5, padx=5)
+        ttk.Button(output_frame, text="Browse Folder", command=self.browse_batch_output_folder).grid(row=2, column=2, pady=5, padx=5)
+
+        # Excel writer mode selection
+        export_mode_frame = ttk.Frame(output_frame)
+        export_mode_frame.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=5)
+
+        self.export_mode = tk.StringVar(value="standard")
+        ttk.Radiobutton(export_mode_frame, text="Standard Writer", variable=self.export_mode, value="standard").grid(row=0, column=0, padx=10)
+        ttk.Radiobutton(export_mode_frame, text="Streaming Writer (low memory)", variable=self.export_mode, value="streaming").grid(row=0, column=1, padx=10)
+        self.create_output_format_options(output_frame).grid(row=3, column=0, columnspan=3, sticky=tk.W, pady=5)
+
         # Process button
         process_frame = ttk.Frame(main_frame)
         process_frame.grid(row=3, column=0, columnspan=3, pady=20)
@@ -199,6 +374,12 @@ class SensorDataAnalyzer:
                   command=self.extract_from_template, 
                   style="Accent.TButton").grid(row=0, column=0, pady=10)
         
+        ttk.Button(process_frame, text="EXTRACT ALL FILES IN BATCH", 
+                  command=self.extract_batch_files).grid(row=0, column=1, pady=10, padx=10)
+        ttk.Label(process_frame, text="Workers:").grid(row=0, column=2, padx=5)
+        self.batch_workers = tk.StringVar(value=str(default_worker_count()))
+        ttk.Spinbox(process_frame, from_=1, to=max(os.cpu_count() or 1, 1) * 2, textvariable=self.batch_workers, width=6).grid(row=0, column=3, padx=5)
+        
         # Create a style for the accent button
         style = ttk.Style()
         style.configure("Accent.TButton", foreground="white", background="#0078D4")
@@ -208,9 +389,12 @@ class SensorDataAnalyzer:
         progress_frame.grid(row=4, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=10)
         progress_frame.columnconfigure(0, weight=1)
         
-        # Progress bar
-        self.progress_bar = ttk.Progressbar(progress_frame, mode='indeterminate')
-        self.progress_bar.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+        # Progress bar (one step per template window)
+        self.progress_bar = ttk.Progressbar(progress_frame, mode='determinate')
+        self.progress_bar.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=5)
+        
+        self.cancel_extraction_button = ttk.Button(progress_frame, text="Cancel", command=self.cancel_extraction, state='disabled')
+        self.cancel_extraction_button.grid(row=0, column=1, pady=5, padx=5)
         
         # Timing labels
         timing_frame = ttk.Frame(progress_frame)
@@ -224,6 +408,12 @@ class SensorDataAnalyzer:
         ttk.Label(timing_frame, textvariable=self.end_time_var).grid(row=0, column=1, sticky=tk.W, padx=20)
         ttk.Label(timing_frame, textvariable=self.duration_var).grid(row=0, column=2, sticky=tk.W, padx=5)
         
+        self.eta_var = tk.StringVar(value="ETA: --")
+        self.throughput_var = tk.StringVar(value="Throughput: --")
+        
+        ttk.Label(timing_frame, textvariable=self.eta_var).grid(row=1, column=0, sticky=tk.W, padx=5)
+        ttk.Label(timing_frame, textvariable=self.throughput_var).grid(row=1, column=1, columnspan=2, sticky=tk.W, padx=20)
+        
         # Status section for tab2
         self.tab2_status_var = tk.StringVar()
         self.tab2_status_var.set("Please load a template file to begin")
@@ -233,6 +423,10 @@ class SensorDataAnalyzer:
         # Variables for template data
         self.template_sheets = []  # List of (sheet_name, start_index, end_index, data_points)
         self.new_sensor_data = None
+        self.extraction_job = None
+        
+        # Scanned templates keyed by (template type, path, size, mtime) -> (template_sheets, info_text)
+        self.template_cache = {}
         
     def setup_tab3(self):
         """Setup the professional plotting tab"""
@@ -326,6 +520,23 @@ class SensorDataAnalyzer:
         self.y_axis_label = tk.StringVar(value="Sensor Value")
         ttk.Entry(plot_options_frame, textvariable=self.y_axis_label, width=15).grid(row=2, column=3, sticky=tk.W, pady=5, padx=5)
         
+        # Parallel rendering options
+        self.parallel_plotting = tk.BooleanVar(value=False)
+        ttk.Checkbutton(plot_options_frame, text="Parallel Rendering", variable=self.parallel_plotting).grid(row=3, column=0, sticky=tk.W, pady=5)
+        
+        ttk.Label(plot_options_frame, text="Worker Processes:").grid(row=3, column=2, sticky=tk.W, pady=5, padx=(20,0))
+        self.plot_workers = tk.StringVar(value=str(default_worker_count()))
+        ttk.Spinbox(plot_options_frame, from_=1, to=max(os.cpu_count() or 1, 1) * 2, textvariable=self.plot_workers, width=8).grid(row=3, column=3, sticky=tk.W, pady=5, padx=5)
+        
+        # Channel selection for multi-channel windows
+        ttk.Label(plot_options_frame, text="Channels:").grid(row=4, column=0, sticky=tk.W, pady=5)
+        self.plot_channels = tk.StringVar(value="")
+        ttk.Entry(plot_options_frame, textvariable=self.plot_channels, width=15).grid(row=4, column=1, sticky=tk.W, pady=5, padx=5)
+        self.overlay_channels = tk.BooleanVar(value=True)
+        ttk.Checkbutton(plot_options_frame, text="Overlay Channels", variable=self.overlay_channels).grid(row=4, column=2, sticky=tk.W, pady=5, padx=(20,0))
+        ttk.Label(plot_options_frame, text="Comma separated channel names, empty for all; unchecked overlay saves one plot per channel",
+                  foreground="gray", font=("Arial", 8)).grid(row=5, column=0, columnspan=4, sticky=tk.W)
+        
         # Output folder section
         output_frame = ttk.LabelFrame(main_frame, text="Output Folder", padding="10")
         output_frame.grid(row=3, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=10)
@@ -355,7 +566,10 @@ class SensorDataAnalyzer:
         
         # Progress bar
         self.plot_progress_bar = ttk.Progressbar(progress_frame, mode='determinate')
-        self.plot_progress_bar.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+        self.plot_progress_bar.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=5)
+        
+        self.cancel_plot_button = ttk.Button(progress_frame, text="Cancel", command=self.cancel_plotting, state='disabled')
+        self.cancel_plot_button.grid(row=0, column=1, pady=5, padx=5)
         
         # Progress labels
         self.plot_progress_var = tk.StringVar(value="Ready to plot")
@@ -371,6 +585,11 @@ class SensorDataAnalyzer:
         # Variables for plotting
         self.excel_sheets = []
         self.current_excel_data = None
+        self.plot_job = None
+        
+        # One workbook handle and an LRU of parsed sheets shared by preview and plotting
+        from sensor_workbook import WorkbookSheetCache
+        self.sheet_cache = WorkbookSheetCache()
         
     def setup_tab4(self):
         """Setup the tutorial tab"""
@@ -425,13 +644,32 @@ STEP-BY-STEP GUIDE:
 
 1. LOADING DATA:
    - Click "Browse" to select your sensor data file (TXT or CSV format)
+   - Compressed files (.gz, .xz, .zst, .bz2) are read directly, decompressed
+     while they are parsed; with "Use parse cache" only the first open pays
+     for decompression
    - The file should contain semicolon-separated values with two columns: Index and Value
+   - Multi-channel files (Index followed by several channel columns) are also
+     supported; the channels are named Channel_1, Channel_2, ... unless the
+     first line is a header with their names. "Channel" selects the one plotted
+   - "Load values as float32" halves the memory used by the Value column
+   - "Use parse cache" keeps a binary copy of each parsed file, so opening the
+     same unchanged file again is almost instant
+   - "Memory-map (huge files)" reads the data straight from that binary copy on
+     disk, so recordings larger than the available memory can still be opened
+   - "Parse workers" splits a large text file (64 MB or more) into pieces
+     parsed side by side by that many processes; 1 parses it in one process
    - Once loaded, the status will show the data shape and available range
 
 2. PLOTTING DATA:
    - "Plot All Data": Visualizes the entire dataset
    - "Plot Selected Window": Plots a specific range defined by start and end indices
    - Range Input: Supports mathematical expressions (e.g., 400+600, 500-50)
+   - "Follow File (live)": For a recording that is still being written, keeps
+     reading only the newly appended rows every "Refresh (s)" seconds and
+     grows the full-data plot (zoom in to hold the view still)
+   - "Extract Template Windows Live": While following, writes each window of
+     the template loaded in the Batch Extract tab to that tab's output file
+     as soon as the data has reached the window's end index
 
 3. WINDOW MANAGEMENT:
    - "Add Window to List": Saves the current window range for batch processing
@@ -473,16 +711,49 @@ STEP-BY-STEP GUIDE:
 3. SELECT NEW DATA:
    - Choose the new sensor data file to extract windows from
    - Ensure the format matches the expected semicolon-separated structure
+   - "Stream data file in chunks" extracts recordings larger than memory: the
+     file is read a million rows at a time and each chunk's rows are written
+     straight to the windows they fall in (always uses the streaming writer)
+   - "Incremental" re-runs an edited template against the same output: only
+     new or moved windows are written and deleted ones are dropped. A
+     manifest saved with the output remembers the data file and the window
+     ranges; if the data file changed, everything is extracted again
+   - "Seek to windows with a byte-offset index" pulls a few windows out of a
+     huge file sorted by Index without loading it: the first run scans the
+     file once and saves every 4096th line's Index and byte offset, then each
+     window is read by seeking straight to it
 
 4. SET OUTPUT FILE:
    - Specify the destination Excel file for extracted data
    - The system will create multiple sheets matching the template structure
+   - "Streaming Writer (low memory)" writes rows as they are extracted and is
+     recommended for batches with hundreds of windows
+   - A "Summary" sheet lists the rows, first/last Index, min, max, mean, RMS,
+     peak-to-peak and standard deviation of every extracted window (one set
+     of statistic columns per channel for multi-channel files)
+   - "Output Format" can write a Parquet window store (a folder with one file
+     per window) or an HDF5 file instead of Excel; both are much faster,
+     have no sheet row limit and open directly in Tab 3
+   - In Excel output a window longer than 1,048,575 rows continues on
+     Window_3_p2, Window_3_p3, ... sheets; Tab 3 and Excel templates treat
+     the parts as one window
 
 5. EXECUTE EXTRACTION:
    - Click "EXTRACT DATA FROM TEMPLATE" to start the batch process
-   - Monitor progress through the progress bar and timing information
+   - Monitor progress through the progress bar, ETA and throughput information
+   - The window stays responsive during extraction; "Cancel" stops after the
+     current window and keeps the sheets already written
    - The system provides detailed completion reports
 
+6. MULTI-FILE BATCH (OPTIONAL):
+   - Enter a folder (all .txt/.csv files) or a glob pattern such as
+     C:\data\channel_*.txt in "Or Batch Folder / Pattern"
+   - Choose a "Batch Output Folder"; each data file gets its own
+     <file name>_windows workbook or store in the chosen output format
+   - Click "EXTRACT ALL FILES IN BATCH"; files are processed in parallel by
+     the chosen number of workers and the report lists per-file timing and
+     the overall rows per second
+
 PRO TIPS:
 - Use Excel templates when you need to replicate complex multi-sheet structures
 - Text templates are ideal for simple range-based extractions
@@ -500,7 +771,8 @@ PURPOSE:
 STEP-BY-STEP GUIDE:
 
 1. LOAD EXCEL FILE:
-   - Select an Excel file containing data sheets to plot
+   - Select an Excel file containing data sheets to plot, or a Parquet
+     store (pick its windows.json) or HDF5 file written by Tab 1 or Tab 2
    - Click "Load Excel Sheets" to populate the sheet list
 
 2. SHEET SELECTION:
@@ -515,6 +787,11 @@ STEP-BY-STEP GUIDE:
    - Plot Style: Select from various matplotlib styles for different aesthetics
    - X-Axis Label: Customize the x-axis label text
    - Y-Axis Label: Customize the y-axis label text
+   - Parallel Rendering: Renders sheets in several worker processes at once;
+     "Worker Processes" sets how many
+   - Channels: For multi-channel windows, the channels to draw (comma
+     separated, empty for all). "Overlay Channels" draws them on one figure;
+     unchecked, each channel is saved as its own <sheet>_<channel> figure
 
 4. OUTPUT CONFIGURATION:
    - Specify the folder where plots will be saved
@@ -524,6 +801,7 @@ STEP-BY-STEP GUIDE:
    - "PLOT SELECTED SHEETS": Processes only the chosen sheets
    - "PLOT ALL SHEETS": Processes every sheet in the Excel file
    - Monitor progress through the progress bar and status updates
+   - "Cancel" stops the batch after the current plot
 
 PRO TIPS:
 - Use higher DPI (300-600) for publication-quality figures
@@ -536,19 +814,24 @@ BEST PRACTICES & TROUBLESHOOTING
 ================================================================================
 
 DATA FORMAT REQUIREMENTS:
-- Sensor files: Semicolon-separated, two columns (Index, Value), no header
+- Sensor files: Semicolon-separated, Index plus one value column or several channel columns, optional header line
 - Excel templates: Must contain 'Index' column in each sheet
 - Text templates: Simple "start,end" format on each line
 
 COMMON ISSUES:
 - "No data found in range": Check that the range values exist in your data
 - Excel export errors: Ensure you've created a new Excel file first
-- Plotting failures: Verify that sheets contain 'Index' and 'Value' columns
+- Plotting failures: Verify that sheets contain an 'Index' column and the selected channel columns
 
 PERFORMANCE OPTIMIZATION:
 - For large datasets, use specific ranges rather than plotting all data
+- "Plot Decimation" draws long recordings at screen resolution ("minmax" keeps
+  every peak, "lttb" keeps the overall shape); zoom in with the toolbar to see
+  full detail. Select "off" to draw every sample
 - Close other applications when processing very large files
 - Use text templates for faster batch processing of simple ranges
+- The parse cache is stored in ~/.sensor_data_extractor/cache and is trimmed
+  automatically, least recently used files first
 
 ================================================================================
 SUPPORT
@@ -683,23 +966,60 @@ and sensor data analysis at Amirkabir University of Technology.
         except Exception as e:
             raise ValueError(f"Invalid expression: {expression}")
     
+    def loader_settings(self):
+        """Read the shared loader options (must be called on the Tk thread)"""
+        try:
+            parse_workers = max(1, int(self.parse_workers.get()))
+        except ValueError:
+            parse_workers = 1
+        return {
+            'value_dtype': 'float32' if self.compact_values.get() else 'float64',
+            'use_parse_cache': self.use_parse_cache.get(),
+            'use_memory_map': self.use_memory_map.get(),
+            'parse_workers': parse_workers,
+        }
+    
+    def load_sensor_data(self, file_path, value_dtype='float64', use_parse_cache=True, use_memory_map=False,
+                         parse_workers=None):
+        """Load a sensor data file with explicit loader options (safe to call from a worker thread)"""
+        from sensor_cache import SensorFileCache, load_sensor_data
+        if self.sensor_cache is None:
+            self.sensor_cache = SensorFileCache()
+        return load_sensor_data(file_path, value_dtype=value_dtype, use_parse_cache=use_parse_cache,
+                                use_memory_map=use_memory_map, cache=self.sensor_cache, parse_workers=parse_workers)
+    
+    def read_sensor_file(self, file_path):
+        """Load a sensor data file with the shared loader settings (used by Tab 1 and Tab 2)"""
+        return self.load_sensor_data(file_path, **self.loader_settings())
+    
+    def data_filetypes(self):
+        """File dialog types for sensor data files, plain or compressed"""
+        # sensor_compression.COMPRESSION_EXTENSIONS, spelled out so the dialog needs no imports
+        return [("Sensor data files", "*.txt *.csv *.gz *.xz *.zst *.bz2"), ("Text files", "*.txt"),
+                ("CSV files", "*.csv"), ("Compressed files", "*.gz *.xz *.zst *.bz2"), ("All files", "*.*")]
+    
     def browse_file(self):
         filename = filedialog.askopenfilename(
             title="Select Sensor Data File",
-            filetypes=[("Text files", "*.txt"), ("CSV files", "*.csv"), ("All files", "*.*")]
+            filetypes=self.data_filetypes()
         )
         if filename:
             self.file_path.set(filename)
             self.load_data()
     
     def load_data(self):
+        if self.follower is not None:
+            self.stop_follow()
         try:
-            # Read semicolon separated data with no header
-            self.data = pd.read_csv(self.file_path.get(), sep=';', header=None, names=['Index', 'Value'])
+            from sensor_windows import WindowIndex
+            
+            # Read semicolon separated data with no header straight into numeric columns
+            self.data = self.read_sensor_file(self.file_path.get())
+            
+            # Build the window lookup once per file
+            self.data_index = WindowIndex(self.data)
             
-            # Convert to numeric types to ensure proper plotting
-            self.data['Index'] = pd.to_numeric(self.data['Index'])
-            self.data['Value'] = pd.to_numeric(self.data['Value'])
+            self._update_channel_choices()
             
             self.status_var.set(f"Data loaded successfully! Shape: {self.data.shape}")
             
@@ -714,19 +1034,201 @@ and sensor data analysis at Amirkabir University of Technology.
             messagebox.showerror("Error", f"Failed to load data: {str(e)}")
             self.status_var.set("Error loading data file")
     
+    def _update_channel_choices(self):
+        """Offer the loaded file's channels, keeping the selection when the new file has it too"""
+        from sensor_io import value_columns
+        channels = value_columns(self.data)
+        self.channel_combo['values'] = channels
+        if self.plot_channel.get() not in channels:
+            self.plot_channel.set(channels[0])
+    
+    def toggle_follow(self):
+        """Start or stop following the Tab 1 data file"""
+        if self.follow_file.get():
+            self.start_follow()
+        else:
+            self.stop_follow()
+    
+    def start_follow(self):
+        """Parse the data file and keep appending the rows written to it on a timer"""
+        from sensor_follow import LiveWindowExtractor, SensorFileFollower
+        
+        file_path = self.file_path.get()
+        if not file_path:
+            messagebox.showwarning("Warning", "Please select a data file to follow!")
+            self.follow_file.set(False)
+            return
+        
+        try:
+            interval = float(self.follow_interval.get())
+            if interval <= 0:
+                raise ValueError("Refresh interval must be positive")
+            
+            live_extractor = None
+            if self.follow_extract.get():
+                # Windows come from the Batch Extract tab's template and go to its output file
+                self.build_tab(self.tab2)
+                if not self.template_sheets or not self.output_file_path.get():
+                    messagebox.showwarning("Warning", "To extract windows live, load a template and select an output file "
+                                                      "in the 'Batch Extract from Template' tab first!")
+                    self.follow_file.set(False)
+                    return
+                live_extractor = LiveWindowExtractor(self.template_sheets, self.output_file_path.get(),
+                                                     self.output_format.get())
+            
+            self.follower = SensorFileFollower(file_path, value_dtype=self.loader_settings()['value_dtype'])
+            self.live_extractor = live_extractor
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to follow data file: {str(e)}")
+            self.follow_file.set(False)
+            return
+        
+        self.follow_interval_ms = int(interval * 1000)
+        self.data = None
+        self.plot_shows_all = True
+        
+        # The first poll parses everything written so far, so it runs off the Tk thread
+        follower = self.follower
+        self.status_var.set(f"Loading {os.path.basename(file_path)} to follow it...")
+        self.follow_job = BackgroundJob(lambda job: self._read_follow_rows(follower)).start()
+        self.follow_after_id = self.root.after(100, self._poll_follow_job)
+    
+    def stop_follow(self):
+        """Stop following the data file (rows parsed so far stay loaded, completed windows are written)"""
+        if self.follow_after_id is not None:
+            self.root.after_cancel(self.follow_after_id)
+            self.follow_after_id = None
+        # A running initial load finishes on its own; its rows are dropped
+        self.follow_job = None
+        if self.live_extractor is not None and self.live_extractor.waiting:
+            try:
+                self._report_live_windows(self.live_extractor.flush())
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to write the completed windows: {str(e)}")
+        if self.follower is not None:
+            self.status_var.set(f"Stopped following: {self.follower.rows:,} rows loaded")
+        self.follower = None
+        self.live_extractor = None
+        self.follow_file.set(False)
+    
+    @staticmethod
+    def _read_follow_rows(follower):
+        """Parse the rows appended to a followed file; returns (new_rows, data, data_index)"""
+        from sensor_windows import WindowIndex
+        
+        new_rows = follower.poll()
+        if not new_rows:
+            return 0, None, None
+        data = follower.data()
+        # Sortedness is tracked by the follower, so the index never rescans the recording
+        return new_rows, data, WindowIndex(data)
+    
+    def _poll_follow_job(self):
+        """Wait for the initial load of a followed file (runs on the Tk thread)"""
+        self.follow_after_id = None
+        for kind, payload in self.follow_job.events():
+            if kind == 'done':
+                self.follow_job = None
+                self._show_follow_rows(*payload)
+                return
+            elif kind == 'error':
+                self.stop_follow()
+                messagebox.showerror("Error", f"Follow mode stopped: {str(payload)}")
+                return
+        
+        self.follow_after_id = self.root.after(100, self._poll_follow_job)
+    
+    def _follow_tick(self):
+        """Parse the rows appended since the last poll (runs on the Tk thread, so only the new tail is read)"""
+        self.follow_after_id = None
+        try:
+            rows = self._read_follow_rows(self.follower)
+        except Exception as e:
+            self.stop_follow()
+            messagebox.showerror("Error", f"Follow mode stopped: {str(e)}")
+            return
+        self._show_follow_rows(*rows)
+    
+    def _show_follow_rows(self, new_rows, data, data_index):
+        """Refresh the plot, extract completed windows and schedule the next poll"""
+        follower = self.follower
+        try:
+            if new_rows:
+                first_rows = self.data is None
+                self.data = data
+                self.data_index = data_index
+                if first_rows:
+                    self._update_channel_choices()
+                self._refresh_follow_plot()
+                
+                if self.live_extractor is not None:
+                    self._report_live_windows(self.live_extractor.update(self.data_index, follower.last_index))
+            
+            status = f"Following {os.path.basename(follower.file_path)}: {follower.rows:,} rows (+{new_rows:,})"
+            if follower.last_index is not None:
+                status += f", last Index {follower.last_index}"
+            if self.live_extractor is not None:
+                summary = self.live_extractor.summary
+                status += f", {summary['successful']}/{summary['total']} windows extracted"
+                if summary['failed']:
+                    status += f" ({summary['failed']} without data)"
+                if self.live_extractor.waiting:
+                    status += f", {self.live_extractor.waiting} waiting to be written"
+            self.status_var.set(status)
+        except Exception as e:
+            self.stop_follow()
+            messagebox.showerror("Error", f"Follow mode stopped: {str(e)}")
+            return
+        
+        self.follow_after_id = self.root.after(self.follow_interval_ms, self._follow_tick)
+    
+    def _report_live_windows(self, written):
+        """Show which windows the live extraction just wrote"""
+        if written:
+            self.excel_status_var.set(f"Live extraction: {', '.join(written)} written to "
+                                      f"{os.path.basename(self.live_extractor.output_path)}")
+    
+    def _refresh_follow_plot(self):
+        """Grow the full-data plot with the new rows (a plotted window is left alone)"""
+        if not self.plot_shows_all:
+            return
+        channel = self.plot_channel.get()
+        if self.plotted_line is None or self.plotted_channel != channel:
+            self.plot_all_data()
+            return
+        # Only the appended samples are decimated; the view follows them unless the user zoomed in
+        self.plotted_line.extend(self.data['Index'].to_numpy(), self.data[channel].to_numpy(),
+                                 assume_sorted=self.data_index.is_sorted)
+        self.canvas.draw_idle()
+    
+    def _plot_series(self, data, assume_sorted=None, **plot_kwargs):
+        """Clear the Tab 1 axes and draw Index against the selected channel through the decimation layer"""
+        from sensor_decimation import DecimatedLine
+        
+        self.ensure_plot_canvas()
+        if self.plotted_line is not None:
+            self.plotted_line.disconnect()
+        self.ax.clear()
+        
+        channel = self.plot_channel.get()
+        self.plotted_line = DecimatedLine(self.ax, data['Index'].to_numpy(), data[channel].to_numpy(),
+                                          method=self.decimation_method.get(), assume_sorted=assume_sorted,
+                                          **plot_kwargs)
+        self.plotted_channel = channel
+        self.ax.set_ylabel("Sensor Value" if channel == 'Value' else channel)
+    
     def plot_all_data(self):
         if self.data is None:
             messagebox.showwarning("Warning", "Please load data first!")
             return
             
-        self.ax.clear()
-        
         # Plot the data using Index as x-axis and Value as y-axis
-        self.ax.plot(self.data['Index'], self.data['Value'], label='Sensor Data', color='blue', linewidth=1)
+        self._plot_series(self.data, assume_sorted=self.data_index.is_sorted,
+                          label='Sensor Data', color='blue', linewidth=1)
+        self.plot_shows_all = True
         
         self.ax.set_title("All Sensor Data")
         self.ax.set_xlabel("Index")
-        self.ax.set_ylabel("Sensor Value")
         self.ax.legend()
         self.ax.grid(True, alpha=0.3)
         
@@ -752,27 +1254,23 @@ and sensor data analysis at Amirkabir University of Technology.
             self.end_range.delete(0, tk.END)
             self.end_range.insert(0, str(end))
             
-            # Find the actual row indices for the given index values
-            start_mask = self.data['Index'] >= start
-            end_mask = self.data['Index'] <= end
-            window_mask = start_mask & end_mask
+            # Find the rows for the given index values
+            window_data = self.data_index.window(start, end)
             
-            if not window_mask.any():
+            if window_data.empty:
                 messagebox.showerror("Error", "No data found in the specified range!")
                 return
                 
             # Extract window data
-            self.current_window_data = self.data[window_mask].copy()
+            self.current_window_data = window_data
             
             # Plot the window
-            self.ax.clear()
-            
-            self.ax.plot(self.current_window_data['Index'], self.current_window_data['Value'], 
-                       label=f'Window {start}-{end}', color='red', linewidth=2)
+            self._plot_series(self.current_window_data, assume_sorted=self.data_index.is_sorted,
+                              label=f'Window {start}-{end}', color='red', linewidth=2)
+            self.plot_shows_all = False
             
             self.ax.set_title(f"Sensor Data Window ({start} to {end})")
             self.ax.set_xlabel("Index")
-            self.ax.set_ylabel("Sensor Value")
             self.ax.legend()
             self.ax.grid(True, alpha=0.3)
             
@@ -846,20 +1344,25 @@ and sensor data analysis at Amirkabir University of Technology.
             return
             
         try:
-            for i, (start, end) in enumerate(self.window_ranges):
-                # Extract window data
-                start_mask = self.data['Index'] >= start
-                end_mask = self.data['Index'] <= end
-                window_mask = start_mask & end_mask
-                
-                if window_mask.any():
-                    window_data = self.data[window_mask].copy()
-                    
-                    # Save to Excel
-                    sheet_name = f"Window_{i+1}"
+            from sensor_export import open_window_writer
+            from sensor_stats import window_summary
+            
+            windows = [(f"Window_{i+1}", start, end) for i, (start, end) in enumerate(self.window_ranges)]
+            written = []
+            # Keep one workbook (or window store) open for all windows and save it once at the end
+            with open_window_writer(self.excel_filename, mode='standard', append=True) as writer:
+                for i, (sheet_name, start, end) in enumerate(windows):
+                    # Extract window data
+                    window_data = self.data_index.window(start, end)
                     
-                    with pd.ExcelWriter(self.excel_filename, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
-                        window_data.to_excel(writer, sheet_name=sheet_name, index=False)
+                    if not window_data.empty:
+                        # Save to Excel
+                        writer.write_window(sheet_name, window_data, bounds=(start, end))
+                        written.append(i)
+                
+                # Min/max/mean/RMS/peak-to-peak/std of every saved window in one vectorized pass
+                if written:
+                    writer.write_summary(window_summary(self.data_index, windows, written))
             
             self.status_var.set(f"Saved {len(self.window_ranges)} windows to Excel")
             messagebox.showinfo("Success", f"All {len(self.window_ranges)} windows saved successfully!")
@@ -876,17 +1379,23 @@ and sensor data analysis at Amirkabir University of Technology.
                 except:
                     pass
                 
+            default_extension, filetypes = self.output_filetypes()
             self.excel_filename = filedialog.asksaveasfilename(
                 title="Create New Excel File",
-                defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
+                defaultextension=default_extension,
+                filetypes=filetypes
             )
             
             if self.excel_filename:
-                # Create a new Excel file with openpyxl
-                from openpyxl import Workbook
-                wb = Workbook()
-                wb.save(self.excel_filename)
+                if self.output_format.get() != 'xlsx':
+                    # Create an empty Parquet/HDF5 window store
+                    from sensor_export import open_window_writer
+                    open_window_writer(self.excel_filename, self.output_format.get()).close()
+                else:
+                    # Create a new Excel file with openpyxl
+                    from openpyxl import Workbook
+                    wb = Workbook()
+                    wb.save(self.excel_filename)
                 
                 self.excel_status_var.set(f"Excel file ready: {os.path.basename(self.excel_filename)}")
                 self.status_var.set(f"New Excel file created: {self.excel_filename}")
@@ -914,6 +1423,12 @@ and sensor data analysis at Amirkabir University of Technology.
                 messagebox.showerror("Error", "Excel file not found! Please create a new Excel file.")
                 return
             
+            from sensor_store import detect_output_format
+            if detect_output_format(self.excel_filename) != 'xlsx':
+                if self._save_window_to_store(sheet_name):
+                    self._window_saved(sheet_name)
+                return
+            
             # Check if sheet already exists
             from openpyxl import load_workbook
             try:
@@ -934,9 +1449,10 @@ and sensor data analysis at Amirkabir University of Technology.
             
             # Save the data to Excel
             try:
-                # Use mode='a' to append to existing file
-                with pd.ExcelWriter(self.excel_filename, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
-                    self.current_window_data.to_excel(writer, sheet_name=sheet_name, index=False)
+                # Append to the existing file; windows past Excel's row limit continue on <sheet>_p2, ...
+                from sensor_export import BatchExcelWriter
+                with BatchExcelWriter(self.excel_filename, append=True) as writer:
+                    writer.write_window(sheet_name, self.current_window_data)
             except Exception as e:
                 # If the above fails, try the manual method
                 try:
@@ -946,14 +1462,15 @@ and sensor data analysis at Amirkabir University of Technology.
                     wb.create_sheet(sheet_name)
                     ws = wb[sheet_name]
                     
-                    # Write headers
-                    ws.cell(row=1, column=1, value="Index")
-                    ws.cell(row=1, column=2, value="Value")
+                    # Write headers (Index plus every channel)
+                    columns = list(self.current_window_data.columns)
+                    for column, name in enumerate(columns, start=1):
+                        ws.cell(row=1, column=column, value=name)
                     
                     # Write data
                     for i, (idx, row) in enumerate(self.current_window_data.iterrows(), start=2):
-                        ws.cell(row=i, column=1, value=row['Index'])
-                        ws.cell(row=i, column=2, value=row['Value'])
+                        for column, name in enumerate(columns, start=1):
+                            ws.cell(row=i, column=column, value=row[name])
                     
                     wb.save(self.excel_filename)
                     wb.close()
@@ -961,22 +1478,44 @@ and sensor data analysis at Amirkabir University of Technology.
                     messagebox.showerror("Error", f"Failed to save to Excel: {str(e2)}")
                     return
             
-            # Update sheet name for next window
-            if '_' in self.sheet_name.get():
-                try:
-                    current_sheet_num = int(self.sheet_name.get().split('_')[-1])
-                    next_sheet_num = current_sheet_num + 1
-                    self.sheet_name.delete(0, tk.END)
-                    self.sheet_name.insert(0, f"Window_{next_sheet_num}")
-                except ValueError:
-                    # If the pattern doesn't match, just keep the current name
-                    pass
-            
-            self.status_var.set(f"Window saved to sheet '{sheet_name}' in {os.path.basename(self.excel_filename)}")
-            messagebox.showinfo("Success", f"Data successfully saved to sheet '{sheet_name}'!")
+            self._window_saved(sheet_name)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save to Excel: {str(e)}")
+    
+    def _save_window_to_store(self, sheet_name):
+        """Write the current window into a Parquet/HDF5 window store; returns False if the user declines"""
+        from sensor_export import open_window_writer
+        from sensor_store import WindowStoreFile
+        
+        store = WindowStoreFile(self.excel_filename)
+        exists = sheet_name in store.sheet_names
+        store.close()
+        if exists and not messagebox.askyesno(
+                "Sheet Exists", 
+                f"Sheet '{sheet_name}' already exists. Do you want to overwrite it?"):
+            return False
+        
+        index_values = self.current_window_data['Index']
+        with open_window_writer(self.excel_filename, append=True) as writer:
+            writer.write_window(sheet_name, self.current_window_data, bounds=(index_values.min().item(), index_values.max().item()))
+        return True
+    
+    def _window_saved(self, sheet_name):
+        """Suggest the next sheet name and report a saved window"""
+        # Update sheet name for next window
+        if '_' in self.sheet_name.get():
+            try:
+                current_sheet_num = int(self.sheet_name.get().split('_')[-1])
+                next_sheet_num = current_sheet_num + 1
+                self.sheet_name.delete(0, tk.END)
+                self.sheet_name.insert(0, f"Window_{next_sheet_num}")
+            except ValueError:
+                # If the pattern doesn't match, just keep the current name
+                pass
+        
+        self.status_var.set(f"Window saved to sheet '{sheet_name}' in {os.path.basename(self.excel_filename)}")
+        messagebox.showinfo("Success", f"Data successfully saved to sheet '{sheet_name}'!")
 
     # ===== TAB 2 METHODS (BATCH EXTRACTION) =====
     
@@ -999,18 +1538,34 @@ and sensor data analysis at Amirkabir University of Technology.
         """Browse for new sensor data file"""
         filename = filedialog.askopenfilename(
             title="Select New Sensor Data File",
-            filetypes=[("Text files", "*.txt"), ("CSV files", "*.csv"), ("All files", "*.*")]
+            filetypes=self.data_filetypes()
         )
         if filename:
             self.new_data_file_path.set(filename)
             self.tab2_status_var.set("New data file loaded.")
     
+    def browse_batch_data_folder(self):
+        """Browse for a folder of sensor data files to extract in one batch"""
+        folder = filedialog.askdirectory(title="Select Folder of Sensor Data Files")
+        if folder:
+            from sensor_batch import expand_data_files
+            self.batch_data_source.set(folder)
+            self.tab2_status_var.set(f"Batch folder selected: {len(expand_data_files(folder))} data files found.")
+    
+    def browse_batch_output_folder(self):
+        """Browse for the folder that receives one workbook per batch data file"""
+        folder = filedialog.askdirectory(title="Select Batch Output Folder")
+        if folder:
+            self.batch_output_folder.set(folder)
+            self.tab2_status_var.set("Batch output folder selected.")
+    
     def browse_output_file(self):
         """Browse for output Excel file"""
+        default_extension, filetypes = self.output_filetypes()
         filename = filedialog.asksaveasfilename(
             title="Select Output Excel File",
-            defaultextension=".xlsx",
-            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
+            defaultextension=default_extension,
+            filetypes=filetypes
         )
         if filename:
             self.output_file_path.set(filename)
@@ -1027,13 +1582,22 @@ and sensor data analysis at Amirkabir University of Technology.
             self.template_sheets = []
             template_file = self.template_file_path.get()
             
-            # Build info text
-            info_text = "Template Analysis Results:\n\n"
-            
-            if self.template_type.get() == "excel":
-                info_text = self._load_excel_template(template_file, info_text)
+            # Reuse the previous scan if this exact template version was already loaded
+            from sensor_templates import template_signature
+            cache_key = (self.template_type.get(),) + template_signature(template_file)
+            if cache_key in self.template_cache:
+                template_sheets, info_text = self.template_cache[cache_key]
+                self.template_sheets = list(template_sheets)
             else:
-                info_text = self._load_text_template(template_file, info_text)
+                # Build info text
+                info_text = "Template Analysis Results:\n\n"
+                
+                if self.template_type.get() == "excel":
+                    info_text = self._load_excel_template(template_file, info_text)
+                else:
+                    info_text = self._load_text_template(template_file, info_text)
+                
+                self.template_cache[cache_key] = (tuple(self.template_sheets), info_text)
             
             # Display the template info
             self.template_info_text.config(state='normal')
@@ -1049,42 +1613,27 @@ and sensor data analysis at Amirkabir University of Technology.
     def _load_excel_template(self, template_file, info_text):
         """Load template from Excel file"""
         try:
-            # Read the Excel file
-            excel_file = pd.ExcelFile(template_file)
-            sheet_names = excel_file.sheet_names
+            # Scan only the Index column of each sheet (the workbook is opened once, read-only)
+            from sensor_templates import scan_excel_template
+            sheet_names, results = scan_excel_template(template_file)
             
             info_text += f"Excel File: {os.path.basename(template_file)}\n"
             info_text += f"Total Sheets: {len(sheet_names)}\n\n"
             
             valid_sheets = 0
-            for sheet_name in sheet_names:
-                # Skip default empty sheets
-                if sheet_name == 'Sheet' and len(sheet_names) > 1:
-                    continue
+            for sheet_name, window, error in results:
+                if window is not None:
+                    _, start_index, end_index, data_points = window
                     
-                try:
-                    # Read sheet data
-                    sheet_data = pd.read_excel(template_file, sheet_name=sheet_name)
+                    self.template_sheets.append(window)
+                    valid_sheets += 1
                     
-                    # Check if sheet has the required columns
-                    if 'Index' in sheet_data.columns and not sheet_data.empty:
-                        start_index = int(sheet_data['Index'].min())
-                        end_index = int(sheet_data['Index'].max())
-                        data_points = len(sheet_data)
-                        
-                        self.template_sheets.append((sheet_name, start_index, end_index, data_points))
-                        valid_sheets += 1
-                        
-                        info_text += f"? Sheet: {sheet_name}\n"
-                        info_text += f"  Range: {start_index} to {end_index}\n"
-                        info_text += f"  Data Points: {data_points}\n"
-                        info_text += "-" * 50 + "\n"
-                    else:
-                        info_text += f"? Sheet: {sheet_name} - No valid data (missing 'Index' column or empty)\n"
-                        info_text += "-" * 50 + "\n"
-                        
-                except Exception as e:
-                    info_text += f"? Sheet: {sheet_name} - Error reading: {str(e)}\n"
+                    info_text += f"? Sheet: {sheet_name}\n"
+                    info_text += f"  Range: {start_index} to {end_index}\n"
+                    info_text += f"  Data Points: {data_points}\n"
+                    info_text += "-" * 50 + "\n"
+                else:
+                    info_text += f"? Sheet: {sheet_name} - {error}\n"
                     info_text += "-" * 50 + "\n"
             
             if valid_sheets == 0:
@@ -1101,43 +1650,25 @@ and sensor data analysis at Amirkabir University of Technology.
     def _load_text_template(self, template_file, info_text):
         """Load template from Text file"""
         try:
-            with open(template_file, 'r') as f:
-                lines = f.readlines()
+            from sensor_templates import parse_text_template
+            line_count, results = parse_text_template(template_file)
             
             info_text += f"Text File: {os.path.basename(template_file)}\n"
-            info_text += f"Total Lines: {len(lines)}\n\n"
+            info_text += f"Total Lines: {line_count}\n\n"
             
             valid_windows = 0
-            for i, line in enumerate(lines):
-                line = line.strip()
-                if not line:  # Skip empty lines
-                    continue
+            for label, window, error in results:
+                if window is not None:
+                    sheet_name, start_index, end_index, _ = window
+                    self.template_sheets.append(window)
+                    valid_windows += 1
                     
-                try:
-                    # Parse "start,end" format
-                    if ',' in line:
-                        parts = line.split(',')
-                        if len(parts) >= 2:
-                            start_index = int(parts[0].strip())
-                            end_index = int(parts[1].strip())
-                            
-                            sheet_name = f"Window_{i+1}"
-                            self.template_sheets.append((sheet_name, start_index, end_index, "Will be extracted"))
-                            valid_windows += 1
-                            
-                            info_text += f"? Window: {sheet_name}\n"
-                            info_text += f"  Range: {start_index} to {end_index}\n"
-                            info_text += f"  Data Points: Will be extracted from new data\n"
-                            info_text += "-" * 50 + "\n"
-                        else:
-                            info_text += f"? Line {i+1}: Invalid format - {line}\n"
-                            info_text += "-" * 50 + "\n"
-                    else:
-                        info_text += f"? Line {i+1}: Missing comma - {line}\n"
-                        info_text += "-" * 50 + "\n"
-                        
-                except ValueError as e:
-                    info_text += f"? Line {i+1}: Invalid numbers - {line}\n"
+                    info_text += f"? Window: {sheet_name}\n"
+                    info_text += f"  Range: {start_index} to {end_index}\n"
+                    info_text += f"  Data Points: Will be extracted from new data\n"
+                    info_text += "-" * 50 + "\n"
+                else:
+                    info_text += f"? {label}: {error}\n"
                     info_text += "-" * 50 + "\n"
             
             if valid_windows == 0:
@@ -1170,91 +1701,252 @@ and sensor data analysis at Amirkabir University of Technology.
             messagebox.showerror("Error", "Please select an output Excel file!")
             return
         
+        if self.extraction_job is not None and self.extraction_job.is_alive():
+            messagebox.showwarning("Warning", "An extraction is already running!")
+            return
+        
+        # Capture every setting on the Tk thread; the worker thread must not touch Tk
+        data_file = self.new_data_file_path.get()
+        output_file = self.output_file_path.get()
+        export_mode = self.export_mode.get()
+        loader_settings = self.loader_settings()
+        stream = self.stream_extraction.get()
+        incremental = self.incremental_extraction.get()
+        seek = self.seek_extraction.get()
+        output_format = self.output_format.get()
+        windows = list(self.template_sheets)
+        
+        if stream and incremental:
+            messagebox.showerror("Error", "Incremental extraction needs the loaded data file; "
+                                          "untick 'Stream data file in chunks' to use it.")
+            return
+        
+        if seek and (stream or incremental):
+            messagebox.showerror("Error", "Seeking with a byte-offset index cannot be combined with "
+                                          "streaming or incremental extraction.")
+            return
+        
+        from sensor_compression import file_compression
+        if seek and file_compression(data_file) is not None:
+            messagebox.showerror("Error", "Seeking with a byte-offset index needs an uncompressed data file; "
+                                          "untick the seek option for compressed files.")
+            return
+        
+        def load_new_data():
+            self.new_sensor_data = self.load_sensor_data(data_file, **loader_settings)
+            return self.new_sensor_data
+        
+        def run_extraction(job):
+            from sensor_export import extract_windows, extract_windows_streaming
+            if stream:
+                job.report(0, message="Streaming new sensor data...")
+                return extract_windows_streaming(data_file, windows, output_file,
+                                                 value_dtype=loader_settings['value_dtype'],
+                                                 progress=job.report, should_stop=lambda: job.cancelled,
+                                                 output_format=output_format)
+            if seek:
+                from sensor_offsets import extract_windows_seeking
+                return extract_windows_seeking(data_file, windows, output_file,
+                                               value_dtype=loader_settings['value_dtype'],
+                                               output_format=output_format,
+                                               progress=job.report, should_stop=lambda: job.cancelled)
+            if incremental:
+                from sensor_incremental import extract_windows_incremental
+                job.report(0, message="Comparing template with the last extraction...")
+                return extract_windows_incremental(data_file, windows, output_file, load_new_data,
+                                                   value_dtype=loader_settings['value_dtype'],
+                                                   output_format=output_format,
+                                                   progress=job.report, should_stop=lambda: job.cancelled)
+            job.report(0, message="Loading new sensor data...")
+            load_new_data()
+            if job.cancelled:
+                return {'total': len(windows), 'successful': 0, 'failed': 0, 'failures': [], 'rows': 0, 'cancelled': True}
+            return extract_windows(self.new_sensor_data, windows, output_file, mode=export_mode,
+                                   progress=job.report, should_stop=lambda: job.cancelled,
+                                   output_format=output_format)
+        
+        # Start progress bar and timing
+        self.progress_bar.configure(mode='determinate', maximum=max(len(windows), 1), value=0)
+        self.extraction_start_time = time.time()
+        self.start_time_var.set(f"Start Time: {datetime.now().strftime('%H:%M:%S')}")
+        self.end_time_var.set("End Time: --:--:--")
+        self.duration_var.set("Duration: --")
+        self.eta_var.set("ETA: --")
+        self.throughput_var.set("Throughput: --")
+        self.tab2_status_var.set("Starting extraction process...")
+        self.cancel_extraction_button.state(['!disabled'])
+        
+        self.extraction_unit = "windows"
+        self.extraction_job = BackgroundJob(run_extraction, total=len(windows)).start()
+        self.root.after(100, self._poll_extraction_job)
+    
+    def extract_batch_files(self):
+        """Extract the template windows from every data file of a folder or glob pattern in parallel"""
+        if not self.template_sheets:
+            messagebox.showerror("Error", "Please load template info first!")
+            return
+        
+        if not self.batch_data_source.get():
+            messagebox.showerror("Error", "Please select a batch folder or enter a file pattern!")
+            return
+        
+        if not self.batch_output_folder.get():
+            messagebox.showerror("Error", "Please select a batch output folder!")
+            return
+        
+        if self.extraction_job is not None and self.extraction_job.is_alive():
+            messagebox.showwarning("Warning", "An extraction is already running!")
+            return
+        
+        from sensor_batch import batch_output_paths, expand_data_files, extract_files_parallel
+        data_files = expand_data_files(self.batch_data_source.get())
+        if not data_files:
+            messagebox.showerror("Error", f"No data files found for: {self.batch_data_source.get()}")
+            return
         try:
-            # Start progress bar and timing
-            self.progress_bar.start()
-            start_time = time.time()
-            self.start_time_var.set(f"Start Time: {datetime.now().strftime('%H:%M:%S')}")
-            self.end_time_var.set("End Time: --:--:--")
-            self.duration_var.set("Duration: --")
-            self.tab2_status_var.set("Starting extraction process...")
-            self.root.update()
-            
-            # Load new sensor data
-            self.tab2_status_var.set("Loading new sensor data...")
-            self.new_sensor_data = pd.read_csv(self.new_data_file_path.get(), sep=';', header=None, names=['Index', 'Value'])
-            self.new_sensor_data['Index'] = pd.to_numeric(self.new_sensor_data['Index'])
-            self.new_sensor_data['Value'] = pd.to_numeric(self.new_sensor_data['Value'])
-            
-            # Create output Excel file
-            from openpyxl import Workbook
-            wb = Workbook()
-            # Remove default sheet if it exists
-            if 'Sheet' in wb.sheetnames:
-                del wb['Sheet']
-            wb.save(self.output_file_path.get())
-            
-            # Process each sheet from template
-            successful_extractions = 0
-            failed_extractions = 0
-            total_sheets = len(self.template_sheets)
-            
-            for i, (sheet_name, start_index, end_index, _) in enumerate(self.template_sheets):
-                try:
-                    # Update progress
-                    progress_percent = int((i + 1) / total_sheets * 100)
-                    self.tab2_status_var.set(f"Processing {i+1}/{total_sheets} ({progress_percent}%): {sheet_name}...")
-                    self.root.update()
-                    
-                    # Extract window data from new sensor data
-                    start_mask = self.new_sensor_data['Index'] >= start_index
-                    end_mask = self.new_sensor_data['Index'] <= end_index
-                    window_mask = start_mask & end_mask
-                    
-                    if window_mask.any():
-                        window_data = self.new_sensor_data[window_mask].copy()
-                        
-                        # Save to output Excel file
-                        with pd.ExcelWriter(self.output_file_path.get(), engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
-                            window_data.to_excel(writer, sheet_name=sheet_name, index=False)
-                        
-                        successful_extractions += 1
-                    else:
-                        failed_extractions += 1
-                        self.tab2_status_var.set(f"Warning: No data found for range {start_index}-{end_index} in sheet {sheet_name}")
-                        
-                except Exception as e:
-                    failed_extractions += 1
-                    self.tab2_status_var.set(f"Error processing sheet {sheet_name}: {str(e)}")
-            
-            # Stop progress bar and update timing
-            end_time = time.time()
-            duration = end_time - start_time
-            self.progress_bar.stop()
-            self.end_time_var.set(f"End Time: {datetime.now().strftime('%H:%M:%S')}")
-            
-            # Format duration nicely
-            if duration < 60:
-                self.duration_var.set(f"Duration: {duration:.2f} seconds")
-            else:
-                minutes = int(duration // 60)
-                seconds = duration % 60
-                self.duration_var.set(f"Duration: {minutes}m {seconds:.2f}s")
-            
-            # Show completion message
-            self.tab2_status_var.set(f"Extraction complete: {successful_extractions} successful, {failed_extractions} failed")
-            messagebox.showinfo("Success", 
-                              f"Data extraction completed!\n\n"
-                              f"Successful extractions: {successful_extractions}\n"
-                              f"Failed extractions: {failed_extractions}\n"
-                              f"Time taken: {duration:.2f} seconds\n\n"
-                              f"Output saved to: {self.output_file_path.get()}")
-            
-        except Exception as e:
-            # Stop progress bar on error
-            self.progress_bar.stop()
-            messagebox.showerror("Error", f"Failed to extract data: {str(e)}")
+            batch_output_paths(data_files, self.batch_output_folder.get(), self.output_format.get())
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        
+        try:
+            workers = max(1, int(self.batch_workers.get()))
+        except ValueError:
+            messagebox.showerror("Error", "Workers must be a whole number!")
+            return
+        
+        # Capture every setting on the Tk thread; the worker thread must not touch Tk
+        output_folder = self.batch_output_folder.get()
+        export_mode = self.export_mode.get()
+        output_format = self.output_format.get()
+        loader_settings = self.loader_settings()
+        windows = list(self.template_sheets)
+        
+        def run_batch(job):
+            job.report(0, message=f"Extracting {len(data_files)} files with {workers} workers...")
+            return extract_files_parallel(data_files, windows, output_folder, mode=export_mode,
+                                          output_format=output_format, loader_settings=loader_settings, workers=workers,
+                                          progress=job.report, should_stop=lambda: job.cancelled)
+        
+        self.progress_bar.configure(mode='determinate', maximum=len(data_files), value=0)
+        self.extraction_start_time = time.time()
+        self.start_time_var.set(f"Start Time: {datetime.now().strftime('%H:%M:%S')}")
+        self.end_time_var.set("End Time: --:--:--")
+        self.duration_var.set("Duration: --")
+        self.eta_var.set("ETA: --")
+        self.throughput_var.set("Throughput: --")
+        self.tab2_status_var.set(f"Starting batch extraction of {len(data_files)} files...")
+        self.cancel_extraction_button.state(['!disabled'])
+        
+        self.extraction_unit = "files"
+        self.extraction_job = BackgroundJob(run_batch, total=len(data_files)).start()
+        self.root.after(100, self._poll_extraction_job)
+    
+    def cancel_extraction(self):
+        """Stop the running extraction after the current window"""
+        if self.extraction_job is not None and self.extraction_job.is_alive():
+            self.extraction_job.cancel()
+            self.cancel_extraction_button.state(['disabled'])
+            self.tab2_status_var.set("Cancelling after the current window...")
+    
+    def _poll_extraction_job(self):
+        """Apply queued progress from the extraction worker (runs on the Tk thread)"""
+        for kind, payload in self.extraction_job.events():
+            if kind == 'progress':
+                self.progress_bar['value'] = payload['done']
+                self.tab2_status_var.set(f"{payload['message']} ({payload['percent']}%)")
+                if payload['done']:
+                    self.eta_var.set(f"ETA: {format_duration(payload['eta'])}")
+                    self.throughput_var.set(f"Throughput: {payload['items_per_second']:.1f} {self.extraction_unit}/s, "
+                                            f"{payload['rows_per_second']:,.0f} rows/s")
+            elif kind == 'done':
+                self._finish_extraction(payload)
+                return
+            elif kind == 'error':
+                self._finish_extraction(None, payload)
+                return
+        
+        self.root.after(100, self._poll_extraction_job)
+    
+    def _finish_extraction(self, summary, error=None):
+        """Update timing and report the result of a finished extraction"""
+        duration = time.time() - self.extraction_start_time
+        self.cancel_extraction_button.state(['disabled'])
+        self.end_time_var.set(f"End Time: {datetime.now().strftime('%H:%M:%S')}")
+        self.duration_var.set(f"Duration: {format_duration(duration)}")
+        self.eta_var.set("ETA: --")
+        
+        if error is not None:
+            messagebox.showerror("Error", f"Failed to extract data: {str(error)}")
             self.tab2_status_var.set("Extraction failed")
+            return
+        
+        if 'files' in summary:
+            self._finish_batch_extraction(summary)
+            return
+        
+        from sensor_stats import SUMMARY_SHEET
+        
+        # List the first few failed windows so empty ranges are easy to spot
+        failure_lines = "".join(f"  {name}: {reason}\n" for name, reason in summary['failures'][:10])
+        if len(summary['failures']) > 10:
+            failure_lines += f"  ... and {len(summary['failures']) - 10} more\n"
+        
+        if summary['cancelled']:
+            self.tab2_status_var.set(f"Extraction cancelled: {summary['successful']} of {summary['total']} windows saved")
+            messagebox.showinfo("Cancelled", 
+                              f"Data extraction was cancelled.\n\n"
+                              f"Windows saved before cancelling: {summary['successful']}\n"
+                              f"Output saved to: {self.output_file_path.get()}")
+            return
+        
+        # Incremental runs report what they left alone
+        incremental_lines = ""
+        if 'unchanged' in summary:
+            if summary['full_reason'] is not None:
+                incremental_lines = f"Full extraction ({summary['full_reason']})\n"
+            else:
+                incremental_lines = (f"Unchanged windows kept: {summary['unchanged']}\n"
+                                     f"Removed windows: {summary['removed']}\n")
+        
+        # Show completion message
+        self.tab2_status_var.set(f"Extraction complete: {summary['successful']} successful, {summary['failed']} failed")
+        messagebox.showinfo("Success", 
+                          f"Data extraction completed!\n\n"
+                          f"Successful extractions: {summary['successful']}\n"
+                          f"Failed extractions: {summary['failed']}\n"
+                          f"{incremental_lines}"
+                          f"{failure_lines}"
+                          f"Time taken: {duration:.2f} seconds\n"
+                          f"Per-window statistics: '{SUMMARY_SHEET}' sheet\n\n"
+                          f"Output saved to: {self.output_file_path.get()}")
+
+    def _finish_batch_extraction(self, summary):
+        """Report per-file timing and aggregate throughput of a finished batch"""
+        self.throughput_var.set(f"Throughput: {summary['rows_per_second']:,.0f} rows/s over {summary['workers']} workers")
+        
+        # Slowest files first, so stragglers are easy to spot
+        files = sorted(summary['files'], key=lambda result: result['seconds'], reverse=True)
+        timing_lines = "".join(f"  {os.path.basename(result['file'])}: {result['seconds']:.2f}s "
+                               f"(load {result['load_seconds']:.2f}s), {result['rows']:,} rows\n"
+                               for result in files[:10])
+        if len(files) > 10:
+            timing_lines += f"  ... and {len(files) - 10} more\n"
+        failure_lines = "".join(f"  {name}: {reason}\n" for name, reason in summary['failures'][:10])
+        
+        status = "cancelled" if summary['cancelled'] else "complete"
+        self.tab2_status_var.set(f"Batch extraction {status}: {summary['successful']} files successful, "
+                                 f"{summary['failed']} failed")
+        messagebox.showinfo("Batch Extraction", 
+                          f"Batch extraction {status}!\n\n"
+                          f"Files processed: {len(summary['files'])} of {summary['total']}\n"
+                          f"Successful files: {summary['successful']}\n"
+                          f"Failed files: {summary['failed']}\n"
+                          f"{failure_lines}"
+                          f"Rows written: {summary['rows']:,} ({summary['rows_per_second']:,.0f} rows/s)\n"
+                          f"Time taken: {summary['seconds']:.2f} seconds\n\n"
+                          f"Per-file timing:\n{timing_lines}\n"
+                          f"Output saved to: {self.batch_output_folder.get()}")
 
     # ===== TAB 3 METHODS (PROFESSIONAL PLOTTING) =====
     
@@ -1262,9 +1954,13 @@ and sensor data analysis at Amirkabir University of Technology.
         """Browse for Excel file for plotting"""
         filename = filedialog.askopenfilename(
             title="Select Excel File for Plotting",
-            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
+            filetypes=[("Excel files", "*.xlsx"), ("Parquet window store", "windows.json"),
+                       ("HDF5 files", "*.h5 *.hdf5"), ("All files", "*.*")]
         )
         if filename:
+            # A Parquet store is picked through its windows.json manifest
+            if os.path.basename(filename) == "windows.json":
+                filename = os.path.dirname(filename)
             self.plot_excel_path.set(filename)
             self.tab3_status_var.set("Excel file loaded. Click 'Load Excel Sheets' to continue.")
     
@@ -1282,9 +1978,10 @@ and sensor data analysis at Amirkabir University of Technology.
             return
         
         try:
-            # Read Excel file
-            excel_file = pd.ExcelFile(self.plot_excel_path.get())
-            self.excel_sheets = [sheet for sheet in excel_file.sheet_names if sheet != 'Sheet']
+            # Read Excel file (the handle stays open in the sheet cache for preview and plotting)
+            from sensor_stats import SUMMARY_SHEET
+            sheet_names = self.sheet_cache.sheet_names(self.plot_excel_path.get())
+            self.excel_sheets = [sheet for sheet in sheet_names if sheet not in ('Sheet', SUMMARY_SHEET)]
             
             # Update listbox
             self.sheets_listbox.delete(0, tk.END)
@@ -1304,6 +2001,11 @@ and sensor data analysis at Amirkabir University of Technology.
         """Clear all selections in the listbox"""
         self.sheets_listbox.selection_clear(0, tk.END)
     
+    def selected_plot_channels(self):
+        """Channel names typed in the Tab 3 channel box (None means all channels)"""
+        channels = [channel.strip() for channel in self.plot_channels.get().split(',') if channel.strip()]
+        return channels or None
+    
     def preview_selected_sheet(self):
         """Preview selected sheet in a new window"""
         selected_indices = self.sheets_listbox.curselection()
@@ -1321,11 +2023,17 @@ and sensor data analysis at Amirkabir University of Technology.
     def _preview_sheet(self, sheet_name):
         """Preview a single sheet in a new window"""
         try:
+            import matplotlib.pyplot as plt
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+            from sensor_decimation import DecimatedLine
+            from sensor_plotting import plot_channels
+            
             # Read sheet data
-            sheet_data = pd.read_excel(self.plot_excel_path.get(), sheet_name=sheet_name)
+            sheet_data = self.sheet_cache.read(self.plot_excel_path.get(), sheet_name)
             
-            if 'Index' not in sheet_data.columns or 'Value' not in sheet_data.columns:
-                messagebox.showerror("Error", f"Sheet '{sheet_name}' does not contain required 'Index' and 'Value' columns!")
+            channels = plot_channels(sheet_data, self.selected_plot_channels())
+            if not channels:
+                messagebox.showerror("Error", f"Sheet '{sheet_name}' does not contain an 'Index' column and the selected channels!")
                 return
             
             # Create preview window
@@ -1338,9 +2046,20 @@ and sensor data analysis at Amirkabir University of Technology.
             # Create figure for preview
             fig, ax = plt.subplots(figsize=(10, 6))
             
-            # Plot data with integer formatting
-            ax.plot(sheet_data['Index'], sheet_data['Value'], 
-                   linewidth=2, color='#2E86AB', alpha=0.8)
+            # Plot data with integer formatting (decimated to screen resolution, refined on zoom)
+            index_values = sheet_data['Index'].to_numpy()
+            if len(channels) == 1:
+                preview_window.preview_lines = [DecimatedLine(ax, index_values, sheet_data[channels[0]].to_numpy(),
+                                                              method=self.decimation_method.get(), label=channels[0],
+                                                              linewidth=2, color='#2E86AB', alpha=0.8)]
+            else:
+                # Channels are overlaid in the preview whatever the overlay setting
+                preview_window.preview_lines = [DecimatedLine(ax, index_values, sheet_data[channel].to_numpy(),
+                                                              method=self.decimation_method.get(), label=channel,
+                                                              linewidth=1.5, alpha=0.8)
+                                                for channel in channels]
+            if channels != ['Value']:
+                ax.legend()
             
             # Professional styling with integer formatting
             ax.set_xlabel(self.x_axis_label.get(), fontsize=12, fontweight='bold')
@@ -1363,6 +2082,7 @@ and sensor data analysis at Amirkabir University of Technology.
             # Embed plot in preview window
             canvas = FigureCanvasTkAgg(fig, master=preview_window)
             canvas.draw()
+            NavigationToolbar2Tk(canvas, preview_window).update()
             canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
             
             # Add close button
@@ -1400,7 +2120,11 @@ and sensor data analysis at Amirkabir University of Technology.
         self._plot_sheets(self.excel_sheets)
     
     def _plot_sheets(self, sheets_to_plot):
-        """Internal method to plot sheets with professional styling"""
+        """Internal method to plot sheets with professional styling on a worker thread"""
+        if self.plot_job is not None and self.plot_job.is_alive():
+            messagebox.showwarning("Warning", "Plotting is already running!")
+            return
+        
         try:
             # Set up progress bar
             total_sheets = len(sheets_to_plot)
@@ -1409,80 +2133,97 @@ and sensor data analysis at Amirkabir University of Technology.
             
             # Parse figure size
             width, height = map(int, self.figure_size.get().split('x'))
-            dpi = int(self.dpi_value.get())
-            file_format = self.file_format.get()
-            
-            # Apply plot style
+            plot_options = {
+                'width': width,
+                'height': height,
+                'dpi': int(self.dpi_value.get()),
+                'file_format': self.file_format.get(),
+                'x_label': self.x_axis_label.get(),
+                'y_label': self.y_axis_label.get(),
+                'style': self.plot_style.get(),
+                'channels': self.selected_plot_channels(),
+                'overlay': self.overlay_channels.get(),
+            }
+            parallel = self.parallel_plotting.get()
+            workers = int(self.plot_workers.get())
+            
+            # Apply plot style (global matplotlib state, so it is set here on the Tk thread)
+            import matplotlib.pyplot as plt
             plt.style.use(self.plot_style.get())
             
-            successful_plots = 0
-            failed_plots = 0
-            
-            for i, sheet_name in enumerate(sheets_to_plot):
-                try:
-                    # Update progress
-                    self.plot_progress_bar['value'] = i + 1
-                    self.plot_progress_var.set(f"Plotting {i+1}/{total_sheets}: {sheet_name}")
-                    self.tab3_status_var.set(f"Creating plot for: {sheet_name}")
-                    self.root.update()
-                    
-                    # Read sheet data
-                    sheet_data = pd.read_excel(self.plot_excel_path.get(), sheet_name=sheet_name)
-                    
-                    # Create professional plot
-                    fig, ax = plt.subplots(figsize=(width, height), dpi=dpi)
-                    
-                    # Plot data with integer formatting
-                    if 'Index' in sheet_data.columns and 'Value' in sheet_data.columns:
-                        ax.plot(sheet_data['Index'], sheet_data['Value'], 
-                               linewidth=2, color='#2E86AB', alpha=0.8)
-                        
-                        # Professional styling with integer formatting
-                        ax.set_xlabel(self.x_axis_label.get(), fontsize=12, fontweight='bold')
-                        ax.set_ylabel(self.y_axis_label.get(), fontsize=12, fontweight='bold')
-                        ax.set_title(f'Sensor Data - {sheet_name}', fontsize=14, fontweight='bold', pad=20)
-                        
-                        # Set integer formatting for both axes - NO scientific notation
-                        ax.ticklabel_format(style='plain', axis='both')
-                        ax.xaxis.set_major_formatter(plt.FormatStrFormatter('%d'))
-                        ax.yaxis.set_major_formatter(plt.FormatStrFormatter('%d'))
-                        
-                        # Grid and aesthetics
-                        ax.grid(True, alpha=0.3, linestyle='--')
-                        ax.spines['top'].set_visible(False)
-                        ax.spines['right'].set_visible(False)
-                        
-                        # Tight layout
-                        plt.tight_layout()
-                        
-                        # Save plot
-                        output_path = os.path.join(self.plot_output_folder.get(), f"{sheet_name}.{file_format}")
-                        plt.savefig(output_path, dpi=dpi, bbox_inches='tight', 
-                                  facecolor='white', edgecolor='none')
-                        plt.close(fig)
-                        
-                        successful_plots += 1
-                    else:
-                        failed_plots += 1
-                        self.tab3_status_var.set(f"Missing columns in sheet: {sheet_name}")
-                        
-                except Exception as e:
-                    failed_plots += 1
-                    self.tab3_status_var.set(f"Error plotting {sheet_name}: {str(e)}")
-            
-            # Completion message
-            self.plot_progress_var.set(f"Completed: {successful_plots} successful, {failed_plots} failed")
-            self.tab3_status_var.set(f"Plotting finished: {successful_plots} plots saved")
-            
-            messagebox.showinfo("Success", 
-                              f"Plotting completed!\n\n"
-                              f"Successful plots: {successful_plots}\n"
-                              f"Failed plots: {failed_plots}\n\n"
-                              f"Plots saved to: {self.plot_output_folder.get()}")
-            
         except Exception as e:
             messagebox.showerror("Error", f"Failed to create plots: {str(e)}")
             self.tab3_status_var.set("Plotting failed")
+            return
+        
+        excel_path = self.plot_excel_path.get()
+        output_folder = self.plot_output_folder.get()
+        
+        def run_plotting(job):
+            from sensor_plotting import plot_workbook_sheets, plot_workbook_sheets_parallel
+            if parallel:
+                return plot_workbook_sheets_parallel(excel_path, sheets_to_plot, output_folder, plot_options,
+                                                     workers=workers, progress=job.report,
+                                                     should_stop=lambda: job.cancelled)
+            return plot_workbook_sheets(excel_path, sheets_to_plot, output_folder, plot_options,
+                                        progress=job.report, should_stop=lambda: job.cancelled,
+                                        sheet_cache=self.sheet_cache)
+        
+        self.cancel_plot_button.state(['!disabled'])
+        self.plot_job = BackgroundJob(run_plotting, total=total_sheets).start()
+        self.root.after(100, self._poll_plot_job)
+    
+    def cancel_plotting(self):
+        """Stop the running plot batch after the current sheet"""
+        if self.plot_job is not None and self.plot_job.is_alive():
+            self.plot_job.cancel()
+            self.cancel_plot_button.state(['disabled'])
+            self.tab3_status_var.set("Cancelling after the current plot...")
+    
+    def _poll_plot_job(self):
+        """Apply queued progress from the plotting worker (runs on the Tk thread)"""
+        for kind, payload in self.plot_job.events():
+            if kind == 'progress':
+                self.plot_progress_bar['value'] = payload['done']
+                eta = f" - ETA {format_duration(payload['eta'])}" if payload['done'] else ""
+                self.plot_progress_var.set(f"{payload['message']}{eta}")
+                if payload['done']:
+                    self.tab3_status_var.set(f"Throughput: {payload['items_per_second']:.2f} plots/s, "
+                                             f"{payload['rows_per_second']:,.0f} rows/s")
+            elif kind == 'done':
+                self._finish_plotting(payload)
+                return
+            elif kind == 'error':
+                self.cancel_plot_button.state(['disabled'])
+                messagebox.showerror("Error", f"Failed to create plots: {str(payload)}")
+                self.tab3_status_var.set("Plotting failed")
+                return
+        
+        self.root.after(100, self._poll_plot_job)
+    
+    def _finish_plotting(self, summary):
+        """Report the result of a finished plot batch"""
+        self.cancel_plot_button.state(['disabled'])
+        
+        # Completion message
+        self.plot_progress_var.set(f"Completed: {summary['successful']} successful, {summary['failed']} failed")
+        if summary['cancelled']:
+            self.tab3_status_var.set(f"Plotting cancelled: {summary['successful']} plots saved")
+        else:
+            self.tab3_status_var.set(f"Plotting finished: {summary['successful']} plots saved")
+        
+        timing = f"Time taken: {format_duration(summary['seconds'])}\n"
+        if 'workers' in summary:
+            timing += f"Workers: {summary['workers']}\n"
+        
+        title = "Cancelled" if summary['cancelled'] else "Success"
+        heading = "Plotting was cancelled." if summary['cancelled'] else "Plotting completed!"
+        messagebox.showinfo(title, 
+                          f"{heading}\n\n"
+                          f"Successful plots: {summary['successful']}\n"
+                          f"Failed plots: {summary['failed']}\n"
+                          f"{timing}\n"
+                          f"Plots saved to: {self.plot_output_folder.get()}")
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,130 @@
+"""Multi-file batch extraction.
+
+Applies one template's windows to many sensor data files. Each file is
+loaded and extracted by its own process-pool task and written to its own
+workbook or window store (<data file name>_windows.xlsx, .parquet or .h5)
+in the output folder, so files never contend for a writer and a failing
+file does not stop the others. The full file name is used, so rec.txt,
+rec.csv and rec.txt.gz get outputs of their own; files of the same name
+from different folders are refused before any work starts.
+"""
+import glob
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from sensor_cache import DEFAULT_CACHE_DIR, SensorFileCache, load_sensor_data
+from sensor_compression import COMPRESSION_EXTENSIONS
+from sensor_export import extract_windows
+from sensor_jobs import default_worker_count
+from sensor_store import OUTPUT_EXTENSIONS
+
+# Data file patterns used when a folder is given instead of a glob (plain or compressed)
+DATA_FILE_PATTERNS = tuple(pattern + extension for pattern in ('*.txt', '*.csv')
+                           for extension in ('',) + tuple(COMPRESSION_EXTENSIONS))
+
+
+def expand_data_files(source):
+    """Return the sorted data files named by a folder, a glob pattern or a single file"""
+    if os.path.isdir(source):
+        files = []
+        for pattern in DATA_FILE_PATTERNS:
+            files.extend(glob.glob(os.path.join(source, pattern)))
+    else:
+        files = glob.glob(source)
+    return sorted(path for path in set(files) if os.path.isfile(path))
+
+
+def batch_output_path(data_file, output_folder, output_format='xlsx'):
+    """Workbook or window store written for one data file, named after its full file name"""
+    return os.path.join(output_folder, f"{os.path.basename(data_file)}_windows{OUTPUT_EXTENSIONS[output_format]}")
+
+
+def batch_output_paths(data_files, output_folder, output_format='xlsx'):
+    """Output path of each data file, raising ValueError if two files would write the same output"""
+    claimed = {}
+    for data_file in data_files:
+        output_path = batch_output_path(data_file, output_folder, output_format)
+        key = os.path.normcase(os.path.abspath(output_path))
+        if key in claimed:
+            raise ValueError(f"{claimed[key]} and {data_file} would both be written to "
+                             f"{os.path.basename(output_path)}; extract them into separate output folders")
+        claimed[key] = data_file
+    return [batch_output_path(data_file, output_folder, output_format) for data_file in data_files]
+
+
+def _extract_file_task(data_file, windows, output_path, mode, output_format, loader_settings, cache_dir):
+    """Process-pool task: load one data file and write its windows to output_path"""
+    result = {'file': data_file, 'output': output_path, 'rows': 0, 'successful': 0, 'failed': 0,
+              'failures': [], 'load_seconds': 0.0, 'seconds': 0.0, 'error': None}
+    start_time = time.perf_counter()
+    try:
+        data = load_sensor_data(data_file, cache=SensorFileCache(cache_dir=cache_dir), **loader_settings)
+        result['load_seconds'] = time.perf_counter() - start_time
+        summary = extract_windows(data, windows, output_path, mode=mode, output_format=output_format)
+        result.update(rows=summary['rows'], successful=summary['successful'], failed=summary['failed'],
+                      failures=summary['failures'])
+    except Exception as e:
+        result['error'] = str(e)
+    result['seconds'] = time.perf_counter() - start_time
+    return result
+
+
+def extract_files_parallel(data_files, windows, output_folder, mode='standard', output_format='xlsx',
+                           loader_settings=None, workers=None, cache_dir=DEFAULT_CACHE_DIR, progress=None,
+                           should_stop=None):
+    """Extract the same template windows from every data file in a process pool.
+
+    loader_settings are the load_sensor_data keyword arguments (value_dtype,
+    use_parse_cache, use_memory_map); each file is parsed by a single process
+    since the files themselves are spread over the pool. progress(done, rows, message) is called
+    as each file finishes and should_stop() is checked after each one; files
+    not yet started are then cancelled. Raises ValueError before starting
+    if two data files would write the same output. Returns a summary dict
+    with per-file counts (a file fails if it cannot be loaded or any of its windows fail),
+    a 'files' list of per-file results with load and total seconds, and the
+    aggregate rows per second.
+    """
+    output_paths = batch_output_paths(data_files, output_folder, output_format)
+    loader_settings = dict(loader_settings or {}, parse_workers=None)
+    workers = workers or default_worker_count()
+    summary = {'total': len(data_files), 'successful': 0, 'failed': 0, 'failures': [], 'rows': 0, 'cancelled': False,
+               'workers': workers, 'files': []}
+    os.makedirs(output_folder, exist_ok=True)
+    start_time = time.perf_counter()
+
+    # spawn keeps workers independent of the parent's threads and Tk state
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = [executor.submit(_extract_file_task, data_file, windows, output_path, mode, output_format,
+                                   loader_settings, cache_dir)
+                   for data_file, output_path in zip(data_files, output_paths)]
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            summary['files'].append(result)
+            summary['rows'] += result['rows']
+            file_name = os.path.basename(result['file'])
+            if result['error'] is not None:
+                summary['failed'] += 1
+                summary['failures'].append((file_name, result['error']))
+            elif result['failed']:
+                summary['failed'] += 1
+                summary['failures'].append((file_name, f"{result['failed']} of {len(windows)} windows failed"))
+            else:
+                summary['successful'] += 1
+
+            if progress is not None:
+                progress(done, summary['rows'],
+                         f"Extracted {done}/{len(data_files)}: {file_name} in {result['seconds']:.2f}s")
+
+            if should_stop is not None and should_stop():
+                summary['cancelled'] = True
+                for pending in futures:
+                    pending.cancel()
+                break
+
+    summary['seconds'] = time.perf_counter() - start_time
+    summary['rows_per_second'] = summary['rows'] / summary['seconds'] if summary['seconds'] > 0 else 0.0
+    return summary
@@ -0,0 +1,281 @@
+"""Persistent parse cache for sensor data files.
+
+Parsing a multi-GB semicolon text file is by far the slowest part of opening a
+recording. SensorFileCache stores the parsed Index and channel columns as one
+.npy file per column (which numpy can memory-map) and reuses them for as long as the source file's
+path, size and modification time are unchanged.
+
+Entries live in a cache directory (one sub-folder per entry) or, when no cache
+directory is given, in a hidden '.sensor_cache' folder next to each source
+file. The cache root is trimmed to max_bytes by evicting the least recently
+used entries.
+
+open_mapped() returns a DataFrame whose columns are read-only memory maps of
+the cached arrays, so only the pages of the windows actually touched become
+resident. On a miss the entry is built chunk by chunk and the full recording
+is never held in RAM.
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from sensor_io import DEFAULT_CHUNKSIZE, IndexDtypeError, iter_sensor_chunks, load_sensor_file, sensor_layout
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.sensor_data_extractor', 'cache')
+DEFAULT_CACHE_MAX_BYTES = 8 * 1024 ** 3
+SIDECAR_DIR_NAME = '.sensor_cache'
+META_FILE = 'meta.json'
+
+
+def _column_file(folder, position, extension='.npy'):
+    """Path of a cached column (by position: channel names from a header need not be valid file names)"""
+    return os.path.join(folder, f"column_{position}{extension}")
+
+
+def _raw_to_npy(raw_path, npy_path, dtype, rows):
+    """Wrap a raw little-endian column dump into a .npy file"""
+    with open(npy_path, 'wb') as out:
+        header = {'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)), 'fortran_order': False, 'shape': (rows,)}
+        np.lib.format.write_array_header_1_0(out, header)
+        with open(raw_path, 'rb') as raw:
+            shutil.copyfileobj(raw, out, 16 * 1024 * 1024)
+    os.remove(raw_path)
+
+
+class SensorFileCache:
+    """Cache of parsed sensor files keyed by path, size and mtime"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def _root(self, file_path):
+        if self.cache_dir:
+            return self.cache_dir
+        return os.path.join(os.path.dirname(os.path.abspath(file_path)), SIDECAR_DIR_NAME)
+
+    def _entry_dir(self, file_path, index_dtype, value_dtype):
+        key_source = f"{os.path.abspath(file_path)}|{index_dtype}|{value_dtype}"
+        key = hashlib.sha1(key_source.encode('utf-8')).hexdigest()
+        return os.path.join(self._root(file_path), key)
+
+    @staticmethod
+    def _source_signature(file_path):
+        stat = os.stat(file_path)
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def get(self, file_path, index_dtype='int64', value_dtype='float64', mmap_mode=None):
+        """Return the cached columns as a {name: array} dict in file order, or None on a miss"""
+        entry_dir = self._entry_dir(file_path, index_dtype, value_dtype)
+        meta_path = os.path.join(entry_dir, META_FILE)
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if meta.get('source') != self._source_signature(file_path) or 'columns' not in meta:
+            # Source file changed since it was cached (or the entry predates multi-channel files)
+            return None
+
+        try:
+            columns = {name: np.load(_column_file(entry_dir, position), mmap_mode=mmap_mode)
+                       for position, name in enumerate(meta['columns'])}
+        except (OSError, ValueError):
+            return None
+
+        # The meta file's mtime doubles as the LRU access time
+        try:
+            os.utime(meta_path)
+        except OSError:
+            pass
+        return columns
+
+    def index_sorted(self, file_path, index_dtype='int64', value_dtype='float64'):
+        """Return the recorded sortedness of a cached Index column (None if unknown)"""
+        meta_path = os.path.join(self._entry_dir(file_path, index_dtype, value_dtype), META_FILE)
+        try:
+            with open(meta_path, 'r') as f:
+                return json.load(f).get('index_sorted')
+        except (OSError, ValueError):
+            return None
+
+    def _commit(self, file_path, index_dtype, value_dtype, write_columns):
+        """Create a cache entry; write_columns(folder) writes the .npy files and returns (columns, rows, index_sorted)"""
+        entry_dir = self._entry_dir(file_path, index_dtype, value_dtype)
+        root = os.path.dirname(entry_dir)
+        os.makedirs(root, exist_ok=True)
+
+        # Write into a temporary folder and rename it so readers never see partial entries
+        temp_dir = os.path.join(root, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(temp_dir)
+        try:
+            source = self._source_signature(file_path)
+            columns, rows, index_sorted = write_columns(temp_dir)
+            meta = {
+                'path': os.path.abspath(file_path),
+                'source': source,
+                'columns': columns,
+                'rows': rows,
+                'index_sorted': index_sorted,
+                'created': time.time(),
+            }
+            with open(os.path.join(temp_dir, META_FILE), 'w') as f:
+                json.dump(meta, f)
+
+            if os.path.exists(entry_dir):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(temp_dir, entry_dir)
+        except Exception:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+
+        self.evict(root, keep=entry_dir)
+
+    def store(self, file_path, data, index_dtype='int64', value_dtype='float64'):
+        """Write a parsed sensor DataFrame to the cache"""
+        def write_columns(folder):
+            columns = list(data.columns)
+            for position, name in enumerate(columns):
+                np.save(_column_file(folder, position), data[name].to_numpy())
+            return columns, len(data), bool(data['Index'].is_monotonic_increasing)
+
+        self._commit(file_path, index_dtype, value_dtype, write_columns)
+
+    def build(self, file_path, index_dtype='int64', value_dtype='float64', chunksize=DEFAULT_CHUNKSIZE):
+        """Parse a sensor file chunk by chunk straight into a cache entry.
+
+        Only one chunk is in memory at a time, so this works for recordings
+        larger than RAM. Index values that are not whole numbers are stored as
+        float64, as in load_sensor_file.
+        """
+        def write_columns(folder, parse_index_dtype):
+            columns, _ = sensor_layout(file_path)
+            rows = 0
+            index_sorted = True
+            last_index = None
+            chunk_index_dtype = parse_index_dtype
+            raw_files = [open(_column_file(folder, position, '.raw'), 'wb') for position in range(len(columns))]
+            try:
+                for chunk in iter_sensor_chunks(file_path, chunksize, parse_index_dtype, value_dtype):
+                    index = chunk['Index'].to_numpy()
+                    if len(index):
+                        # Sorted overall means every chunk is sorted and chunks do not step back
+                        if index_sorted:
+                            index_sorted = bool(np.all(index[1:] >= index[:-1]) and (last_index is None or index[0] >= last_index))
+                        last_index = index[-1]
+                    chunk_index_dtype = index.dtype
+                    for raw_file, name in zip(raw_files, columns):
+                        raw_file.write(np.ascontiguousarray(chunk[name].to_numpy()).tobytes())
+                    rows += len(index)
+            finally:
+                for raw_file in raw_files:
+                    raw_file.close()
+
+            for position, name in enumerate(columns):
+                _raw_to_npy(_column_file(folder, position, '.raw'), _column_file(folder, position),
+                            chunk_index_dtype if name == 'Index' else value_dtype, rows)
+            return columns, rows, index_sorted
+
+        try:
+            self._commit(file_path, index_dtype, value_dtype, lambda folder: write_columns(folder, index_dtype))
+        except IndexDtypeError:
+            # Fractional Index values cannot be parsed as integers
+            self._commit(file_path, index_dtype, value_dtype, lambda folder: write_columns(folder, 'float64'))
+
+    def open_mapped(self, file_path, index_dtype='int64', value_dtype='float64', chunksize=DEFAULT_CHUNKSIZE):
+        """Return a sensor DataFrame backed by read-only memory maps of the cache entry"""
+        cached = self.get(file_path, index_dtype, value_dtype, mmap_mode='r')
+        if cached is None:
+            self.build(file_path, index_dtype, value_dtype, chunksize)
+            cached = self.get(file_path, index_dtype, value_dtype, mmap_mode='r')
+            if cached is None:
+                raise OSError(f"Could not create a memory-mapped cache entry for {file_path}")
+
+        # copy=False keeps the memory maps as the column storage
+        data = pd.DataFrame(cached, copy=False)
+        data.attrs['index_sorted'] = self.index_sorted(file_path, index_dtype, value_dtype)
+        return data
+
+    def load(self, file_path, index_dtype='int64', value_dtype='float64', mmap_mode=None, **loader_kwargs):
+        """Load a sensor file through the cache, parsing and storing it on a miss"""
+        cached = self.get(file_path, index_dtype, value_dtype, mmap_mode=mmap_mode)
+        if cached is not None:
+            return pd.DataFrame(cached, copy=False)
+
+        data = load_sensor_file(file_path, index_dtype=index_dtype, value_dtype=value_dtype, **loader_kwargs)
+        try:
+            self.store(file_path, data, index_dtype, value_dtype)
+        except OSError:
+            # A read-only or full cache location must never break loading
+            pass
+        return data
+
+    @staticmethod
+    def _entries(root):
+        """List (entry_dir, size_bytes, last_access) for every entry under root"""
+        entries = []
+        try:
+            names = os.listdir(root)
+        except OSError:
+            return entries
+
+        for name in names:
+            entry_dir = os.path.join(root, name)
+            meta_path = os.path.join(entry_dir, META_FILE)
+            if name.startswith('.') or not os.path.isfile(meta_path):
+                continue
+            try:
+                size = 0
+                for file_name in os.listdir(entry_dir):
+                    size += os.path.getsize(os.path.join(entry_dir, file_name))
+                entries.append((entry_dir, size, os.path.getmtime(meta_path)))
+            except OSError:
+                # Evicted by another process (batch workers share the cache) while listing
+                continue
+        return entries
+
+    def evict(self, root=None, keep=None):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        root = root or self.cache_dir
+        if not root or self.max_bytes is None:
+            return
+
+        entries = sorted(self._entries(root), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for entry_dir, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if entry_dir == keep:
+                continue
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+
+    def clear(self, root=None):
+        """Remove every entry under the cache root"""
+        root = root or self.cache_dir
+        for entry_dir, _, _ in self._entries(root):
+            shutil.rmtree(entry_dir, ignore_errors=True)
+
+
+def load_sensor_data(file_path, value_dtype='float64', use_parse_cache=True, use_memory_map=False, cache=None,
+                     parse_workers=None):
+    """Load a sensor file the way the GUI and CLI do: memory-mapped, through the cache, or parsed directly.
+
+    parse_workers > 1 parses large text files in that many processes; a
+    memory-mapped cache entry is always built chunk by chunk.
+    """
+    if use_memory_map or use_parse_cache:
+        cache = cache or SensorFileCache()
+    if use_memory_map:
+        # Memory mapping works on the binary cache entry, which is built chunk by chunk if missing
+        return cache.open_mapped(file_path, value_dtype=value_dtype)
+    if use_parse_cache:
+        return cache.load(file_path, value_dtype=value_dtype, workers=parse_workers)
+    return load_sensor_file(file_path, value_dtype=value_dtype, workers=parse_workers)
@@ -0,0 +1,278 @@
+"""Headless command line interface for the Sensor Data Extractor.
+
+Runs the same template scanning, window extraction and plotting code as the
+GUI without importing tkinter, so batch jobs can run on compute nodes and in
+scheduled jobs without a display.
+
+Examples:
+    python sensor_cli.py scan-template template.xlsx
+    python sensor_cli.py extract --template template.xlsx --data sensor.txt --output windows.xlsx
+    python sensor_cli.py batch-extract --template template.txt --data "recordings/*.txt" --output-folder out
+    python sensor_cli.py plot windows.xlsx --output-folder plots --dpi 300 --workers 8
+"""
+import argparse
+import os
+import sys
+import time
+
+from sensor_batch import batch_output_paths, expand_data_files, extract_files_parallel
+from sensor_cache import DEFAULT_CACHE_DIR, SensorFileCache, load_sensor_data
+from sensor_compression import file_compression
+from sensor_export import EXPORT_MODES, extract_windows, extract_windows_streaming
+from sensor_incremental import extract_windows_incremental
+from sensor_io import DEFAULT_CHUNKSIZE
+from sensor_jobs import default_worker_count, format_duration
+from sensor_offsets import DEFAULT_INDEX_EVERY, DEFAULT_OFFSET_INDEX_DIR, extract_windows_seeking
+from sensor_stats import SUMMARY_SHEET
+from sensor_store import OUTPUT_FORMATS
+from sensor_templates import TEMPLATE_TYPES, load_template, scan_template
+from sensor_windows import WindowRouter
+
+
+def _print_progress(done, rows, message):
+    print(f"  {message}", file=sys.stderr)
+
+
+def _print_failures(summary):
+    for sheet_name, reason in summary['failures']:
+        print(f"  FAILED {sheet_name}: {reason}", file=sys.stderr)
+
+
+def cmd_scan_template(args):
+    """Print the windows a template defines"""
+    results = scan_template(args.template, args.type)
+    windows = [window for _, window, _ in results if window is not None]
+    if args.covering is not None:
+        # Only the windows that contain one Index value
+        router = WindowRouter(windows)
+        windows = [windows[position] for position in router.covering(args.covering)]
+        results = [(window[0], window, None) for window in windows]
+
+    for label, window, error in results:
+        if window is not None:
+            _, start_index, end_index, data_points = window
+            print(f"{label}\t{start_index}\t{end_index}\t{data_points}")
+        else:
+            print(f"{label}\tSKIPPED\t{error}", file=sys.stderr)
+
+    print(f"{len(windows)} windows in {os.path.basename(args.template)}", file=sys.stderr)
+    return 0 if windows else 1
+
+
+def cmd_extract(args):
+    """Extract every template window from a sensor data file into one workbook"""
+    windows = load_template(args.template, args.type)
+    if not windows:
+        print(f"No valid windows found in {args.template}", file=sys.stderr)
+        return 1
+
+    if args.stream and args.incremental:
+        print("--incremental needs the loaded data file and cannot be combined with --stream", file=sys.stderr)
+        return 2
+    if args.seek and (args.stream or args.incremental):
+        print("--seek reads only the windows and cannot be combined with --stream or --incremental", file=sys.stderr)
+        return 2
+    if args.seek and file_compression(args.data) is not None:
+        print(f"--seek needs an uncompressed data file; {args.data} is {file_compression(args.data)} compressed",
+              file=sys.stderr)
+        return 2
+
+    start_time = time.perf_counter()
+    value_dtype = 'float32' if args.float32 else 'float64'
+    progress = None if args.quiet else _print_progress
+    if args.stream:
+        summary = extract_windows_streaming(args.data, windows, args.output, value_dtype=value_dtype,
+                                            chunksize=args.chunksize, progress=progress,
+                                            output_format=args.output_format)
+    elif args.seek:
+        summary = extract_windows_seeking(args.data, windows, args.output, value_dtype=value_dtype,
+                                          output_format=args.output_format, every=args.index_every,
+                                          index_dir=args.index_dir, progress=progress)
+    elif args.incremental:
+        summary = extract_windows_incremental(args.data, windows, args.output, lambda: _load(args, value_dtype),
+                                              value_dtype=value_dtype, output_format=args.output_format,
+                                              progress=progress)
+        if summary['full_reason'] is not None:
+            print(f"Full extraction: {summary['full_reason']}", file=sys.stderr)
+        else:
+            print(f"Incremental: {summary['unchanged']} windows unchanged, {summary['removed']} removed",
+                  file=sys.stderr)
+    else:
+        data = _load(args, value_dtype)
+        summary = extract_windows(data, windows, args.output, mode=args.writer, progress=progress,
+                                  output_format=args.output_format)
+    _print_failures(summary)
+
+    duration = time.perf_counter() - start_time
+    print(f"Extraction complete: {summary['successful']} successful, {summary['failed']} failed, "
+          f"{summary['rows']:,} rows in {format_duration(duration)} -> {args.output}", file=sys.stderr)
+    return 0 if summary['failed'] == 0 else 1
+
+
+def _load(args, value_dtype):
+    """Load the whole data file (through the parse cache)"""
+    start_time = time.perf_counter()
+    cache = SensorFileCache(cache_dir=args.cache_dir)
+    data = load_sensor_data(args.data, value_dtype=value_dtype, use_parse_cache=not args.no_cache,
+                            use_memory_map=args.memory_map, cache=cache, parse_workers=args.parse_workers)
+    load_seconds = time.perf_counter() - start_time
+    print(f"Loaded {len(data):,} rows from {args.data} in {format_duration(load_seconds)}", file=sys.stderr)
+    return data
+
+
+def cmd_batch_extract(args):
+    """Extract the template windows from every data file of a folder or glob pattern"""
+    windows = load_template(args.template, args.type)
+    if not windows:
+        print(f"No valid windows found in {args.template}", file=sys.stderr)
+        return 1
+    data_files = expand_data_files(args.data)
+    if not data_files:
+        print(f"No data files found for {args.data}", file=sys.stderr)
+        return 1
+    try:
+        batch_output_paths(data_files, args.output_folder, args.output_format)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    loader_settings = {
+        'value_dtype': 'float32' if args.float32 else 'float64',
+        'use_parse_cache': not args.no_cache,
+        'use_memory_map': args.memory_map,
+    }
+    summary = extract_files_parallel(data_files, windows, args.output_folder, mode=args.writer,
+                                     output_format=args.output_format,
+                                     loader_settings=loader_settings, workers=args.workers, cache_dir=args.cache_dir,
+                                     progress=None if args.quiet else _print_progress)
+    _print_failures(summary)
+
+    for result in sorted(summary['files'], key=lambda result: result['file']):
+        print(f"{result['file']}\t{result['rows']}\t{result['load_seconds']:.3f}\t{result['seconds']:.3f}")
+    print(f"Batch complete: {summary['successful']} files successful, {summary['failed']} failed, "
+          f"{summary['rows']:,} rows in {format_duration(summary['seconds'])} "
+          f"({summary['rows_per_second']:,.0f} rows/s, {summary['workers']} workers)", file=sys.stderr)
+    return 0 if summary['failed'] == 0 else 1
+
+
+def cmd_plot(args):
+    """Render workbook sheets to image files"""
+    from sensor_plotting import apply_plot_style, plot_workbook_sheets, plot_workbook_sheets_parallel
+    from sensor_workbook import WorkbookSheetCache
+
+    sheet_cache = WorkbookSheetCache(max_rows=0)
+    sheets = args.sheets or [sheet for sheet in sheet_cache.sheet_names(args.workbook)
+                             if sheet not in ('Sheet', SUMMARY_SHEET)]
+    width, height = map(int, args.size.split('x'))
+    options = {
+        'width': width,
+        'height': height,
+        'dpi': args.dpi,
+        'file_format': args.format,
+        'style': args.style,
+        'x_label': args.x_label,
+        'y_label': args.y_label,
+        'channels': args.channels,
+        'overlay': not args.separate_channels,
+    }
+    os.makedirs(args.output_folder, exist_ok=True)
+
+    progress = None if args.quiet else _print_progress
+    if args.workers > 1:
+        summary = plot_workbook_sheets_parallel(args.workbook, sheets, args.output_folder, options,
+                                                workers=args.workers, progress=progress)
+    else:
+        apply_plot_style(args.style)
+        summary = plot_workbook_sheets(args.workbook, sheets, args.output_folder, options,
+                                       progress=progress, sheet_cache=sheet_cache)
+    _print_failures(summary)
+
+    message = (f"Plotting complete: {summary['successful']} successful, {summary['failed']} failed "
+               f"in {format_duration(summary['seconds'])}")
+    if 'workers' in summary:
+        message += f" with {summary['workers']} workers"
+    print(message, file=sys.stderr)
+    return 0 if summary['failed'] == 0 else 1
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='sensor_cli', description="Headless Sensor Data Extractor")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    scan_parser = subparsers.add_parser('scan-template', help="list the windows defined by a template")
+    scan_parser.add_argument('template', help="Excel or text template file")
+    scan_parser.add_argument('--type', choices=TEMPLATE_TYPES, help="template type (default: from extension)")
+    scan_parser.add_argument('--covering', type=float, metavar='INDEX', help="only list windows that contain INDEX")
+    scan_parser.set_defaults(func=cmd_scan_template)
+
+    extract_parser = subparsers.add_parser('extract', help="extract template windows from a sensor data file")
+    extract_parser.add_argument('--template', required=True, help="Excel or text template file")
+    extract_parser.add_argument('--type', choices=TEMPLATE_TYPES, help="template type (default: from extension)")
+    extract_parser.add_argument('--data', required=True,
+                                help="semicolon separated Index;Value sensor file (may be .gz/.xz/.zst/.bz2)")
+    extract_parser.add_argument('--output', required=True, help="output workbook, .parquet folder or .h5 file")
+    extract_parser.add_argument('--output-format', choices=OUTPUT_FORMATS, help="default: from the --output extension")
+    extract_parser.add_argument('--writer', choices=EXPORT_MODES, default='standard', help="Excel writer mode")
+    extract_parser.add_argument('--stream', action='store_true',
+                                help="read the data file in chunks instead of loading it (streaming writer)")
+    extract_parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help="rows per chunk with --stream")
+    extract_parser.add_argument('--incremental', action='store_true',
+                                help="only write new or changed windows and drop removed ones (uses a manifest "
+                                     "saved with the output)")
+    extract_parser.add_argument('--seek', action='store_true',
+                                help="seek to each window through a byte-offset index instead of loading the file "
+                                     "(text files sorted by Index)")
+    extract_parser.add_argument('--index-every', type=int, default=DEFAULT_INDEX_EVERY, metavar='K',
+                                help="lines between byte-offset index entries with --seek")
+    extract_parser.add_argument('--index-dir', default=DEFAULT_OFFSET_INDEX_DIR, help="byte-offset index directory")
+    extract_parser.add_argument('--float32', action='store_true', help="load values as float32")
+    extract_parser.add_argument('--no-cache', action='store_true', help="do not use the parse cache")
+    extract_parser.add_argument('--memory-map', action='store_true', help="memory-map the cached columns")
+    extract_parser.add_argument('--parse-workers', type=int, default=default_worker_count(),
+                                help="processes parsing a large data file in parallel (1: parse serially)")
+    extract_parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help="parse cache directory")
+    extract_parser.add_argument('--quiet', action='store_true', help="only print the final summary")
+    extract_parser.set_defaults(func=cmd_extract)
+
+    batch_parser = subparsers.add_parser('batch-extract', help="extract template windows from many data files")
+    batch_parser.add_argument('--template', required=True, help="Excel or text template file")
+    batch_parser.add_argument('--type', choices=TEMPLATE_TYPES, help="template type (default: from extension)")
+    batch_parser.add_argument('--data', required=True, help="folder of data files or a quoted glob pattern")
+    batch_parser.add_argument('--output-folder', required=True, help="folder for one workbook per data file")
+    batch_parser.add_argument('--output-format', choices=OUTPUT_FORMATS, default='xlsx', help="per-file output format")
+    batch_parser.add_argument('--writer', choices=EXPORT_MODES, default='standard', help="Excel writer mode")
+    batch_parser.add_argument('--workers', type=int, default=None, help="process pool size (default: cores - 1)")
+    batch_parser.add_argument('--float32', action='store_true', help="load values as float32")
+    batch_parser.add_argument('--no-cache', action='store_true', help="do not use the parse cache")
+    batch_parser.add_argument('--memory-map', action='store_true', help="memory-map the cached columns")
+    batch_parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help="parse cache directory")
+    batch_parser.add_argument('--quiet', action='store_true', help="only print the final summary")
+    batch_parser.set_defaults(func=cmd_batch_extract)
+
+    plot_parser = subparsers.add_parser('plot', help="render workbook sheets to image files")
+    plot_parser.add_argument('workbook', help="Excel workbook or Parquet/HDF5 window store with Index/channel data")
+    plot_parser.add_argument('--output-folder', required=True, help="folder for the image files")
+    plot_parser.add_argument('--sheets', nargs='+', help="sheets to plot (default: all)")
+    plot_parser.add_argument('--size', default='12x8', help="figure size in inches, WIDTHxHEIGHT")
+    plot_parser.add_argument('--dpi', type=int, default=300)
+    plot_parser.add_argument('--format', default='png', choices=('png', 'pdf', 'svg', 'jpg'))
+    plot_parser.add_argument('--style', default='seaborn-v0_8-whitegrid', help="matplotlib style")
+    plot_parser.add_argument('--x-label', default='Index')
+    plot_parser.add_argument('--y-label', default='Sensor Value')
+    plot_parser.add_argument('--channels', nargs='+', help="channel columns to draw (default: all)")
+    plot_parser.add_argument('--separate-channels', action='store_true',
+                             help="one figure per channel (<sheet>_<channel>) instead of overlaying them")
+    plot_parser.add_argument('--workers', type=int, default=1, help="render in a process pool of this size")
+    plot_parser.add_argument('--quiet', action='store_true', help="only print the final summary")
+    plot_parser.set_defaults(func=cmd_plot)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
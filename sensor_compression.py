@@ -0,0 +1,166 @@
+"""Compressed sensor recordings (.gz, .bz2, .xz, .zst).
+
+Archived recordings are often stored compressed. open_sensor_stream opens
+such a file as a stream of its decompressed text, so the parsers read it
+directly without a decompressed copy on disk. Decompression runs on a
+readahead thread a few blocks ahead of the parser: zlib, bz2, lzma and
+zstd all release the GIL while they work, so decompressing and parsing
+use two cores.
+
+zstd needs the zstandard package or a pyarrow build with the zstd codec.
+Both are optional. Compressed files cannot be seeked into by byte offset,
+so the parallel parser, the byte-offset index and follow mode need the
+uncompressed file.
+"""
+import bz2
+import gzip
+import importlib.util
+import io
+import lzma
+import os
+import queue
+import threading
+
+COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz', '.zst': 'zstd'}
+# Decompressed bytes handed to the parser per block, and blocks decompressed ahead of it
+READAHEAD_BLOCK_BYTES = 4 * 1024 * 1024
+READAHEAD_BLOCKS = 4
+
+
+def file_compression(file_path):
+    """Compression of a sensor file from its extension ('gzip', 'bz2', 'xz', 'zstd'), or None"""
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(file_path)[1].lower())
+
+
+def strip_compression_extension(file_path):
+    """'recording.txt.gz' -> 'recording.txt'; other paths are returned unchanged"""
+    if file_compression(file_path) is not None:
+        return os.path.splitext(file_path)[0]
+    return file_path
+
+
+def zstandard_available():
+    """Return True if the zstandard package can be used for .zst files"""
+    return importlib.util.find_spec('zstandard') is not None
+
+
+def _open_zstd(source, file_path):
+    if zstandard_available():
+        import zstandard
+        if isinstance(source, str):
+            source = open(source, 'rb')
+        return zstandard.ZstdDecompressor().stream_reader(source, closefd=True)
+
+    if importlib.util.find_spec('pyarrow') is not None:
+        import pyarrow as pa
+        if pa.Codec.is_available('zstd'):
+            return pa.input_stream(source, compression='zstd')
+    raise ValueError(f"Reading {os.path.basename(file_path)} needs the zstandard package (pip install zstandard)")
+
+
+def _open_decompressor(source, compression, file_path):
+    """Decompressing reader over source, a file path or an open binary file"""
+    if compression == 'zstd':
+        return _open_zstd(source, file_path)
+    opener = {'gzip': gzip.open, 'bz2': bz2.open, 'xz': lzma.open}[compression]
+    return opener(source, 'rb')
+
+
+class ReadaheadReader(io.RawIOBase):
+    """Read a stream on a background thread, up to READAHEAD_BLOCKS blocks ahead of the consumer.
+
+    source is the file the stream decompresses, if any; it is closed with
+    the reader and its position tells how far through the file it is.
+    """
+
+    def __init__(self, stream, block_size=READAHEAD_BLOCK_BYTES, blocks=READAHEAD_BLOCKS, source=None):
+        super().__init__()
+        self._stream = stream
+        self.source = source
+        self._blocks = queue.Queue(maxsize=blocks)
+        self._block = b''
+        self._position = 0
+        self._eof = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._fill, args=(block_size,), daemon=True)
+        self._thread.start()
+
+    def _fill(self, block_size):
+        try:
+            while not self._stop.is_set():
+                block = self._stream.read(block_size)
+                self._put(block)
+                if not block:
+                    return
+        except Exception as e:
+            # Handed to the reading thread, which raises it
+            self._put(e)
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._blocks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self._position >= len(self._block):
+            if self._eof:
+                return 0
+            block = self._blocks.get()
+            if isinstance(block, Exception):
+                raise block
+            if not block:
+                self._eof = True
+                return 0
+            self._block, self._position = block, 0
+
+        count = min(len(buffer), len(self._block) - self._position)
+        buffer[:count] = self._block[self._position:self._position + count]
+        self._position += count
+        return count
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            self._stream.close()
+            if self.source is not None:
+                self.source.close()
+        super().close()
+
+
+def open_sensor_stream(file_path, readahead=True):
+    """Binary stream of a sensor file's text, decompressed on a readahead thread if the file is compressed"""
+    compression = file_compression(file_path)
+    if compression is None:
+        return open(file_path, 'rb')
+    if not readahead:
+        return _open_decompressor(file_path, compression, file_path)
+    source = open(file_path, 'rb')
+    try:
+        stream = _open_decompressor(source, compression, file_path)
+    except Exception:
+        source.close()
+        raise
+    return io.BufferedReader(ReadaheadReader(stream, source=source), buffer_size=READAHEAD_BLOCK_BYTES)
+
+
+def stream_position(stream):
+    """Bytes of the file on disk read so far through a stream from open_sensor_stream"""
+    source = getattr(getattr(stream, 'raw', None), 'source', None)
+    if source is not None:
+        # Compressed: the position in the compressed file, a few readahead blocks ahead of the parser
+        return source.tell()
+    return stream.tell()
+
+
+def require_uncompressed(file_path, purpose):
+    """Raise ValueError if file_path is compressed, naming what needs random access to it"""
+    if file_compression(file_path) is not None:
+        raise ValueError(f"{purpose} needs an uncompressed data file; "
+                         f"{os.path.basename(file_path)} is {file_compression(file_path)} compressed")
@@ -0,0 +1,224 @@
+"""Screen-resolution decimation for the interactive plots.
+
+Interactive plots (Tab 1 and sheet previews) go through DecimatedLine, which
+draws at most a couple of points per horizontal pixel and re-decimates the
+visible range whenever the x-limits change, so full detail appears only
+where the user zooms in. Only numpy is needed here; the matplotlib Axes is
+passed in by the caller.
+
+A line following a growing recording (Tab 1 follow mode) is extended in
+place: StreamingMinMax keeps the min/max buckets of the whole series and
+only buckets the appended samples, so a refresh does not re-scan the data
+already drawn.
+"""
+import numpy as np
+
+DECIMATION_METHODS = ('minmax', 'lttb', 'off')
+
+
+def minmax_decimate(x, y, n_buckets):
+    """Keep the minimum and maximum sample of each of n_buckets equal-count buckets.
+
+    Peaks survive decimation, so the line looks the same at pixel resolution.
+    The first and last samples are always kept. Returns (x, y) arrays.
+    """
+    n = len(y)
+    if n_buckets < 1 or n <= 2 * n_buckets:
+        return x, y
+
+    bucket_size = n // n_buckets
+    usable = bucket_size * n_buckets
+    buckets = y[:usable].reshape(n_buckets, bucket_size)
+    bucket_start = np.arange(n_buckets) * bucket_size
+    lowest = buckets.argmin(axis=1) + bucket_start
+    highest = buckets.argmax(axis=1) + bucket_start
+
+    keep = [np.array([0, n - 1]), lowest, highest]
+    if usable < n:
+        # Leftover samples that did not fill a whole bucket
+        tail = y[usable:]
+        keep.append(np.array([usable + tail.argmin(), usable + tail.argmax()]))
+
+    # np.unique also puts the samples back in their original order
+    keep = np.unique(np.concatenate(keep))
+    return x[keep], y[keep]
+
+
+class StreamingMinMax:
+    """Min-max decimation of a series that only grows at the end.
+
+    Holds the positions of the minimum and maximum of equal-count buckets.
+    Appended samples fill new buckets; whenever there would be more than
+    twice n_buckets, neighbouring buckets are merged and the bucket size
+    doubles, so an update costs O(new samples + n_buckets).
+    """
+
+    def __init__(self, n_buckets):
+        self.n_buckets = max(n_buckets, 1)
+        self.bucket_size = 1
+        self.covered = 0  # samples in complete buckets
+        self.lowest = np.empty(0, dtype=np.intp)
+        self.highest = np.empty(0, dtype=np.intp)
+
+    def _merge(self, y):
+        """Merge neighbouring buckets pairwise, doubling the bucket size"""
+        if len(self.lowest) % 2:
+            # The odd bucket out is bucketed again at the new size
+            self.lowest, self.highest = self.lowest[:-1], self.highest[:-1]
+            self.covered -= self.bucket_size
+        lowest = self.lowest.reshape(-1, 2)
+        highest = self.highest.reshape(-1, 2)
+        self.lowest = np.where(y[lowest[:, 1]] < y[lowest[:, 0]], lowest[:, 1], lowest[:, 0])
+        self.highest = np.where(y[highest[:, 1]] > y[highest[:, 0]], highest[:, 1], highest[:, 0])
+        self.bucket_size *= 2
+
+    def update(self, y):
+        """Cover the samples appended to y since the last update"""
+        while len(self.lowest) + (len(y) - self.covered) // self.bucket_size > 2 * self.n_buckets:
+            self._merge(y)
+        count = (len(y) - self.covered) // self.bucket_size
+        if not count:
+            return
+        stop = self.covered + count * self.bucket_size
+        buckets = y[self.covered:stop].reshape(count, self.bucket_size)
+        bucket_start = self.covered + np.arange(count) * self.bucket_size
+        self.lowest = np.concatenate([self.lowest, buckets.argmin(axis=1) + bucket_start])
+        self.highest = np.concatenate([self.highest, buckets.argmax(axis=1) + bucket_start])
+        self.covered = stop
+
+    def decimated(self, x, y):
+        """Return the decimated (x, y) of the whole series"""
+        n = len(y)
+        if not n:
+            return x, y
+        keep = [np.array([0, n - 1]), self.lowest, self.highest]
+        if self.covered < n:
+            # Samples that do not fill a whole bucket yet
+            tail = y[self.covered:]
+            keep.append(np.array([self.covered + tail.argmin(), self.covered + tail.argmax()]))
+        keep = np.unique(np.concatenate(keep))
+        return x[keep], y[keep]
+
+
+def lttb_decimate(x, y, n_out):
+    """Largest-Triangle-Three-Buckets downsampling to n_out points.
+
+    Picks, per bucket, the sample forming the largest triangle with the
+    previously selected point and the average of the next bucket, which keeps
+    the visual shape of the curve. Returns (x, y) arrays.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    every = (n - 2) / (n_out - 2)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+
+        if end < next_end:
+            avg_x = float(np.mean(x[end:next_end]))
+            avg_y = float(np.mean(y[end:next_end]))
+        else:
+            avg_x, avg_y = float(x[n - 1]), float(y[n - 1])
+
+        bucket_x = np.asarray(x[start:end], dtype=float)
+        bucket_y = np.asarray(y[start:end], dtype=float)
+        ax, ay = float(x[a]), float(y[a])
+        area = np.abs((ax - avg_x) * (bucket_y - ay) - (ax - bucket_x) * (avg_y - ay))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+
+    return x[selected], y[selected]
+
+
+def decimate(x, y, n_points, method='minmax'):
+    """Reduce (x, y) to roughly n_points samples with the given method"""
+    if method == 'minmax':
+        return minmax_decimate(x, y, max(n_points // 2, 1))
+    if method == 'lttb':
+        return lttb_decimate(x, y, n_points)
+    return x, y
+
+
+class DecimatedLine:
+    """A line on a matplotlib Axes that only ever draws about two points per pixel.
+
+    The full x/y arrays are kept (they may be memory-mapped); on every
+    'xlim_changed' event the visible range is cut out with a binary search
+    and decimated to the axes' current width in pixels.
+    """
+
+    def __init__(self, ax, x, y, method='minmax', assume_sorted=None, **plot_kwargs):
+        self.ax = ax
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        self.method = method
+        if assume_sorted is None:
+            assume_sorted = bool(np.all(self.x[1:] >= self.x[:-1]))
+        self.sorted = assume_sorted
+        self._streaming = None  # StreamingMinMax of the whole series, once the line is extended
+
+        line_x, line_y = self._decimated(0, len(self.x))
+        self.line, = ax.plot(line_x, line_y, **plot_kwargs)
+        self._callback_id = ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+
+    def _target_points(self):
+        """Two points per horizontal pixel of the axes"""
+        width = self.ax.get_window_extent().width
+        return max(int(width) * 2, 400)
+
+    def _decimated(self, first, stop):
+        if self._streaming is not None and first == 0 and stop == len(self.x):
+            return self._streaming.decimated(self.x, self.y)
+        return decimate(self.x[first:stop], self.y[first:stop], self._target_points(), self.method)
+
+    def extend(self, x, y, assume_sorted=None):
+        """Follow x/y arrays that grew at the end (the samples drawn so far must be their prefix).
+
+        While the x axis autoscales the view grows with the data; after the
+        user zoomed in, the view is left where it is.
+        """
+        drawn = len(self.x)
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        if assume_sorted is None:
+            new = self.x[max(drawn - 1, 0):]
+            assume_sorted = bool(np.all(new[1:] >= new[:-1]))
+        self.sorted = self.sorted and assume_sorted
+
+        if self.method == 'minmax':
+            if self._streaming is None:
+                self._streaming = StreamingMinMax(self._target_points() // 2)
+            self._streaming.update(self.y)
+        if self.ax.get_autoscalex_on():
+            self.line.set_data(*self._decimated(0, len(self.x)))
+            self.ax.relim()
+            self.ax.autoscale_view()
+
+    def _on_xlim_changed(self, ax):
+        if not self.sorted or self.method == 'off':
+            return
+        x_min, x_max = sorted(ax.get_xlim())
+        # One extra sample on each side so the line runs to the plot edges
+        first = max(self._position(x_min, 'left') - 1, 0)
+        stop = min(self._position(x_max, 'right') + 1, len(self.x))
+        self.line.set_data(*self._decimated(first, stop))
+
+    def _position(self, limit, side):
+        """np.searchsorted of an axis limit in the x data"""
+        if np.issubdtype(self.x.dtype, np.integer):
+            # A float limit would make searchsorted convert the whole integer column first
+            info = np.iinfo(self.x.dtype)
+            limit = np.ceil(limit) if side == 'left' else np.floor(limit)
+            limit = self.x.dtype.type(min(max(limit, info.min), info.max))
+        return int(np.searchsorted(self.x, limit, side=side))
+
+    def disconnect(self):
+        """Stop following the axes limits"""
+        self.ax.callbacks.disconnect(self._callback_id)
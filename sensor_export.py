@@ -0,0 +1,393 @@
+"""Excel export engine for the Sensor Data Extractor.
+
+Opening a new ``pd.ExcelWriter(mode='a')`` for every window re-parses and
+re-serializes the whole workbook each time, so a batch of N windows costs
+O(N^2) in workbook size. ``BatchExcelWriter`` keeps one workbook open for the
+whole batch and saves it exactly once when the batch is closed.
+
+``extract_windows_streaming`` never holds the whole data file: it parses it
+in chunks and appends each chunk's rows to every window the chunk overlaps,
+so memory stays bounded by the chunk size however long the recording is.
+
+Both extraction functions can also write a Parquet or HDF5 window store
+(see sensor_store) instead of a workbook; open_window_writer picks the
+writer from the output format.
+
+Every extraction also writes a Summary sheet (or store table) with the
+per-window statistics computed by sensor_stats in one vectorized pass.
+
+An Excel sheet holds at most 1,048,576 rows. Longer windows are split into
+continuation sheets named <window>_p2, <window>_p3, ...; group_sheet_parts
+maps a workbook's sheets back to whole windows for the readers.
+"""
+import os
+
+import pandas as pd
+
+from sensor_io import DEFAULT_CHUNKSIZE, IndexDtypeError, iter_sensor_chunks
+from sensor_stats import SUMMARY_SHEET, WindowStatistics, window_summary
+from sensor_store import detect_output_format, open_store_writer
+from sensor_windows import WindowIndex, WindowRouter
+
+# Export modes offered by the batch writer
+EXPORT_MODES = ('standard', 'streaming')
+
+# Data rows that fit on one sheet below the header row
+EXCEL_MAX_DATA_ROWS = 1_048_575
+
+
+def continuation_sheet_name(sheet_name, part):
+    """Sheet holding part (1-based) of a window that spans several sheets"""
+    return sheet_name if part == 1 else f"{sheet_name}_p{part}"
+
+
+def group_sheet_parts(sheet_names):
+    """Map each window to the sheets holding it, in workbook order.
+
+    A sheet <name>_p<n> is a continuation of <name> when <name> and all its
+    earlier parts are also present; every other sheet is a window of its own.
+    """
+    present = set(sheet_names)
+    groups = {}
+    continuations = set()
+    for sheet_name in sheet_names:
+        if sheet_name in continuations:
+            continue
+        parts = [sheet_name]
+        while continuation_sheet_name(sheet_name, len(parts) + 1) in present:
+            parts.append(continuation_sheet_name(sheet_name, len(parts) + 1))
+        continuations.update(parts[1:])
+        groups[sheet_name] = parts
+    # A continuation listed before its window still belongs to that window
+    return {name: parts for name, parts in groups.items() if name not in continuations}
+
+
+class BatchExcelWriter:
+    """Write many window sheets into one workbook with a single save.
+
+    mode='standard' uses the pandas/openpyxl writer and can append to an
+    existing workbook (existing sheets with the same name are replaced).
+    mode='streaming' uses an openpyxl write-only workbook: rows are serialized
+    as they are appended, so memory stays flat for very large batches, but
+    the output file is always created from scratch.
+
+    A window longer than max_sheet_rows continues on <name>_p2, <name>_p3, ...
+    In streaming mode each part is a write-only sheet filled as rows arrive;
+    sheet_names lists every sheet written, continuations included.
+    """
+
+    def __init__(self, filename, mode='standard', append=False, max_sheet_rows=EXCEL_MAX_DATA_ROWS):
+        if mode not in EXPORT_MODES:
+            raise ValueError(f"Unknown export mode: {mode}")
+        if mode == 'streaming' and append:
+            raise ValueError("Streaming mode cannot append to an existing workbook")
+
+        self.filename = filename
+        self.mode = mode
+        self.max_sheet_rows = max_sheet_rows
+        self.sheet_names = []
+        self._open_sheets = {}  # window name -> [worksheet, part, data rows] of streaming sheets still receiving rows
+        self._closed = False
+
+        if mode == 'standard':
+            if append and os.path.exists(filename):
+                self._writer = pd.ExcelWriter(filename, engine='openpyxl', mode='a', if_sheet_exists='replace')
+            else:
+                self._writer = pd.ExcelWriter(filename, engine='openpyxl', mode='w')
+        else:
+            from openpyxl import Workbook
+            self._workbook = Workbook(write_only=True)
+
+    def write_window(self, sheet_name, window_data, bounds=None):
+        """Write one window DataFrame to its own sheet (bounds is only recorded by window stores)"""
+        if self._closed:
+            raise ValueError("Cannot write to a closed BatchExcelWriter")
+
+        if self.mode == 'standard':
+            parts = max(1, -(-len(window_data) // self.max_sheet_rows))
+            for part in range(1, parts + 1):
+                part_name = continuation_sheet_name(sheet_name, part)
+                part_rows = window_data.iloc[(part - 1) * self.max_sheet_rows:part * self.max_sheet_rows]
+                part_rows.to_excel(self._writer, sheet_name=part_name, index=False)
+                self.sheet_names.append(part_name)
+            self._remove_stale_parts(sheet_name, parts)
+        else:
+            self.append_rows(sheet_name, window_data)
+            self.finish_sheet(sheet_name)
+
+    def write_summary(self, summary):
+        """Write the per-window statistics table to the Summary sheet, kept as the last sheet"""
+        self.write_window(SUMMARY_SHEET, summary)
+        if self.mode == 'standard':
+            # A replaced sheet keeps its place, so windows appended since would follow the Summary
+            book = self._writer.book
+            book.move_sheet(SUMMARY_SHEET, len(book.sheetnames) - 1 - book.sheetnames.index(SUMMARY_SHEET))
+
+    def remove_window(self, sheet_name):
+        """Delete a window's sheet and its continuation sheets from an appended workbook (standard mode only)"""
+        if self.mode != 'standard':
+            raise ValueError("Windows can only be removed in standard mode")
+        if sheet_name in self._writer.book.sheetnames:
+            del self._writer.book[sheet_name]
+        self._remove_stale_parts(sheet_name, 1)
+
+    def _remove_stale_parts(self, sheet_name, parts):
+        """Drop continuation sheets left in an appended workbook by a longer earlier version of a window"""
+        book = self._writer.book
+        part = parts + 1
+        while continuation_sheet_name(sheet_name, part) in book.sheetnames:
+            del book[continuation_sheet_name(sheet_name, part)]
+            part += 1
+
+    def append_rows(self, sheet_name, rows, bounds=None):
+        """Append rows to a sheet, creating it with a header row on first use (streaming mode only)"""
+        if self.mode != 'streaming':
+            raise ValueError("Rows can only be appended in streaming mode")
+        if self._closed:
+            raise ValueError("Cannot write to a closed BatchExcelWriter")
+
+        sheet = self._open_sheets.get(sheet_name)
+        if sheet is None:
+            sheet = self._open_sheets[sheet_name] = [self._new_sheet(sheet_name, 1, rows.columns), 1, 0]
+
+        # tolist() hands openpyxl native Python scalars instead of numpy ones
+        columns = [rows[column].tolist() for column in rows.columns]
+        offset = 0
+        while offset < len(rows):
+            worksheet, part, sheet_rows = sheet
+            if sheet_rows == self.max_sheet_rows:
+                # This sheet is full: continue the window on the next part
+                worksheet.close()
+                sheet[:] = [self._new_sheet(sheet_name, part + 1, rows.columns), part + 1, 0]
+                continue
+            take = min(self.max_sheet_rows - sheet_rows, len(rows) - offset)
+            for row in zip(*[values[offset:offset + take] for values in columns]):
+                worksheet.append(row)
+            sheet[2] += take
+            offset += take
+
+    def _new_sheet(self, sheet_name, part, columns):
+        """Create a write-only sheet for one part of a window, with its header row"""
+        part_name = continuation_sheet_name(sheet_name, part)
+        worksheet = self._workbook.create_sheet(title=part_name)
+        worksheet.append([str(column) for column in columns])
+        self.sheet_names.append(part_name)
+        return worksheet
+
+    def finish_sheet(self, sheet_name):
+        """Close a streaming sheet that will get no more rows, releasing its temporary file"""
+        sheet = self._open_sheets.pop(sheet_name, None)
+        if sheet is not None:
+            sheet[0].close()
+
+    def close(self):
+        """Flush the workbook to disk (only once per batch)"""
+        if self._closed:
+            return
+        self._closed = True
+
+        if self.mode == 'standard':
+            if not self._writer.book.sheetnames:
+                # openpyxl refuses to save a workbook without any sheet
+                self._writer.book.create_sheet('Sheet')
+            self._writer.close()
+        else:
+            if not self.sheet_names:
+                self._workbook.create_sheet('Sheet')
+            self._workbook.save(self.filename)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+def open_window_writer(output_path, output_format=None, mode='standard', append=False):
+    """Return a BatchExcelWriter or a Parquet/HDF5 store writer for output_path.
+
+    output_format defaults to the one implied by the path (.parquet folder,
+    .h5 file, otherwise xlsx); mode only applies to Excel output.
+    """
+    output_format = output_format or detect_output_format(output_path)
+    if output_format == 'xlsx':
+        return BatchExcelWriter(output_path, mode=mode, append=append)
+    return open_store_writer(output_path, output_format, append=append)
+
+
+def extract_windows(data, windows, output_path, mode='standard', progress=None, should_stop=None, output_format=None):
+    """Write every template window of data to its own sheet of output_path.
+
+    windows holds (sheet_name, start_index, end_index, ...) tuples as built
+    by the template loaders. progress(done, rows, message) is called after
+    each window and should_stop() is checked before each one; when it returns
+    True the sheets written so far are saved and the batch ends. Returns a
+    summary dict with successful/failed counts, a list of (sheet_name, reason)
+    failures and the number of rows written. output_format selects an Excel
+    workbook or a Parquet/HDF5 window store (default: from output_path).
+    The statistics of the written windows go to a final Summary sheet.
+    """
+    data_index = WindowIndex(data)
+    summary = {'total': len(windows), 'successful': 0, 'failed': 0, 'failures': [], 'rows': 0, 'cancelled': False}
+
+    with open_window_writer(output_path, output_format, mode=mode) as writer:
+        written = write_windows(writer, data_index, windows, range(len(windows)), summary, progress, should_stop)
+        if written:
+            writer.write_summary(window_summary(data_index, windows, written))
+
+    return summary
+
+
+def write_windows(writer, data_index, windows, positions, summary, progress=None, should_stop=None, done=0):
+    """Slice the windows at positions out of data_index and write each one with writer.
+
+    Updates the counts, failures and rows of summary (and sets 'cancelled'
+    when should_stop() returns True). progress counts from done, the number
+    of windows already accounted for. Returns the positions written.
+    """
+    written = []
+    for position in positions:
+        if should_stop is not None and should_stop():
+            summary['cancelled'] = True
+            break
+
+        sheet_name, start_index, end_index = windows[position][:3]
+        try:
+            # Extract window data from the sensor data
+            window_data = data_index.window(start_index, end_index)
+
+            if not window_data.empty:
+                writer.write_window(sheet_name, window_data, bounds=(start_index, end_index))
+                written.append(position)
+                summary['successful'] += 1
+                summary['rows'] += len(window_data)
+            else:
+                summary['failed'] += 1
+                summary['failures'].append((sheet_name, f"No data found for range {start_index}-{end_index}"))
+
+        except Exception as e:
+            summary['failed'] += 1
+            summary['failures'].append((sheet_name, str(e)))
+
+        done += 1
+        if progress is not None:
+            progress(done, summary['rows'], f"Processed {done}/{len(windows)}: {sheet_name}")
+
+    return written
+
+
+class _SteppedBack(Exception):
+    """The Index stepped back after a window sheet was finished, so that sheet could get more rows"""
+
+
+def _stream_windows(data_file, windows, output_path, output_format, index_dtype, value_dtype, chunksize, progress,
+                    should_stop, finish_early=True):
+    router = WindowRouter(windows)
+    statistics = WindowStatistics(windows)
+    summary = {'total': len(windows), 'successful': 0, 'failed': 0, 'failures': [], 'rows': 0, 'cancelled': False}
+    window_rows = [0] * len(windows)
+    closed = 0  # windows (in end order) whose sheets are finished
+    failed = set()
+    previous_last = None
+    data_sorted = True
+
+    with open_window_writer(output_path, output_format, mode='streaming') as writer:
+        chunks = iter_sensor_chunks(data_file, chunksize, index_dtype, value_dtype, with_position=True)
+        for chunk_number, (chunk, file_fraction) in enumerate(chunks, start=1):
+            if should_stop is not None and should_stop():
+                summary['cancelled'] = True
+                break
+            if chunk.empty:
+                continue
+
+            chunk_index = WindowIndex(chunk)
+            index_values = chunk['Index'].to_numpy()
+            low, high = index_values.min(), index_values.max()
+            data_sorted = data_sorted and chunk_index.is_sorted and (previous_last is None or index_values[0] >= previous_last)
+            previous_last = index_values[-1]
+            if not data_sorted and closed:
+                # A finished sheet cannot be reopened without splitting its window
+                raise _SteppedBack()
+
+            overlapping = router.overlapping(low, high)
+            statistics.add(chunk_index, overlapping)
+            for position in overlapping:
+                if position in failed:
+                    continue
+                sheet_name, start_index, end_index = windows[position][:3]
+                rows = chunk_index.window(start_index, end_index)
+                if rows.empty:
+                    continue
+                try:
+                    writer.append_rows(sheet_name, rows, bounds=(start_index, end_index))
+                    window_rows[position] += len(rows)
+                    summary['rows'] += len(rows)
+                except Exception as e:
+                    failed.add(position)
+                    summary['failures'].append((sheet_name, str(e)))
+
+            if data_sorted and finish_early:
+                # Later chunks cannot reach windows that end before this chunk's last Index
+                ended = router.ended_before(previous_last)
+                for position in ended[closed:]:
+                    writer.finish_sheet(windows[position][0])
+                closed = len(ended)
+
+            if progress is not None:
+                # Unsorted data finishes no window before the end, so count the part of the file read instead
+                done = closed if data_sorted else max(closed, int(file_fraction * len(windows)))
+                progress(done, summary['rows'], f"Streamed chunk {chunk_number} ({file_fraction:.0%} of file): "
+                                                f"{summary['rows']:,} window rows written")
+
+        written = [position for position in range(len(windows)) if window_rows[position] and position not in failed]
+        if written:
+            writer.write_summary(statistics.table(written))
+
+    for position, window in enumerate(windows):
+        sheet_name, start_index, end_index = window[:3]
+        if position in failed:
+            summary['failed'] += 1
+        elif window_rows[position]:
+            summary['successful'] += 1
+        elif not summary['cancelled']:
+            summary['failed'] += 1
+            summary['failures'].append((sheet_name, f"No data found for range {start_index}-{end_index}"))
+
+    if progress is not None and not summary['cancelled']:
+        progress(len(windows), summary['rows'], f"Processed {len(windows)}/{len(windows)} windows")
+    return summary
+
+
+def extract_windows_streaming(data_file, windows, output_path, value_dtype='float64', chunksize=DEFAULT_CHUNKSIZE,
+                              progress=None, should_stop=None, output_format=None):
+    """Extract template windows straight from a data file without loading it.
+
+    The file is parsed chunksize rows at a time; a WindowRouter finds the
+    windows each chunk overlaps and their rows are appended to the window
+    sheets of a streaming (write-only) workbook. On sorted recordings a sheet
+    is closed as soon as the data has moved past its window. Sheets appear in
+    the order their first rows are found, followed by the Summary sheet whose
+    statistics are accumulated chunk by chunk. Takes the same progress and
+    should_stop callbacks as extract_windows (progress counts finished
+    windows, or on unsorted data the share of the file read) and returns
+    the same summary dict. If the Index steps back after a sheet was
+    finished, the extraction starts over and keeps every sheet open to the
+    end of the file. Excel output always uses the streaming writer;
+    Parquet/HDF5 stores append each chunk as a row group.
+    """
+    index_dtype = 'int64'
+    finish_early = True
+    while True:
+        try:
+            return _stream_windows(data_file, windows, output_path, output_format, index_dtype, value_dtype, chunksize,
+                                   progress, should_stop, finish_early)
+        except IndexDtypeError:
+            if index_dtype == 'float64':
+                raise
+            # Non-integer Index values: start over with a float Index, as load_sensor_file does
+            index_dtype = 'float64'
+        except _SteppedBack:
+            finish_early = False
+            if progress is not None:
+                progress(0, 0, "Data is not sorted by Index: streaming again with every window kept open")
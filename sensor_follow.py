@@ -0,0 +1,216 @@
+"""Follow mode for sensor recordings that are still being written.
+
+During a long test the data file keeps growing. SensorFileFollower
+remembers the byte offset just past the last complete line it parsed;
+every poll() reads only the bytes appended since then, parses the complete
+lines among them and appends the rows to growable in-memory column arrays
+(capacity doubles, so appends are amortized O(new rows)). A partially
+written last line is left for the next poll. data() returns a DataFrame
+over views of those arrays and records the Index sortedness, tracked
+block by block, in data.attrs['index_sorted'] so a WindowIndex over it
+never rescans the whole recording.
+
+LiveWindowExtractor writes each template window to the output once the
+followed data has reached the window's end index, and keeps the Summary
+sheet up to date with the windows written so far. Appending to an Excel
+workbook rewrites the whole file, so completed windows are written in
+batches at most every LIVE_XLSX_FLUSH_SECONDS.
+"""
+import io
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from sensor_compression import require_uncompressed
+from sensor_export import open_window_writer, write_windows
+from sensor_io import INDEX_DTYPES, VALUE_DTYPES, IndexDtypeError, line_layout, pyarrow_available, read_sensor_rows
+from sensor_stats import window_summary
+from sensor_store import detect_output_format
+
+# Bytes parsed per read_csv call, so catching up with a large file never holds all of it as text
+FOLLOW_BLOCK_BYTES = 64 * 1024 * 1024
+# Blocks at least this large go through the multi-threaded pyarrow parser when it is installed
+PYARROW_MIN_BYTES = 4 * 1024 * 1024
+MIN_CAPACITY = 1024
+# Shortest time between two rewrites of a live Excel output
+LIVE_XLSX_FLUSH_SECONDS = 30
+
+
+class SensorFileFollower:
+    """Incrementally parse the rows appended to a growing sensor file"""
+
+    def __init__(self, file_path, index_dtype='int64', value_dtype='float64'):
+        if index_dtype not in INDEX_DTYPES:
+            raise ValueError(f"Unsupported index dtype: {index_dtype}")
+        if value_dtype not in VALUE_DTYPES:
+            raise ValueError(f"Unsupported value dtype: {value_dtype}")
+        require_uncompressed(file_path, "Follow mode")
+        self.file_path = file_path
+        self.index_dtype = index_dtype
+        self.value_dtype = value_dtype
+        self.offset = 0  # byte offset just past the last complete line parsed
+        self.rows = 0
+        self.columns = None
+        self.index_sorted = True
+        self.last_index = None  # largest Index value seen so far
+        self._arrays = {}
+
+    def poll(self):
+        """Parse the complete lines appended since the last poll; return the number of new rows"""
+        size = os.path.getsize(self.file_path)
+        if size < self.offset:
+            raise ValueError(f"{os.path.basename(self.file_path)} was truncated or replaced while it was followed")
+
+        new_rows = 0
+        with open(self.file_path, 'rb') as f:
+            f.seek(self.offset)
+            while self.offset < size:
+                block = f.read(min(FOLLOW_BLOCK_BYTES, size - self.offset))
+                end = block.rfind(b'\n') + 1
+                if end == 0:
+                    if len(block) < FOLLOW_BLOCK_BYTES:
+                        break  # the last line is still being written
+                    raise ValueError(f"Line longer than {FOLLOW_BLOCK_BYTES:,} bytes at byte {self.offset:,}")
+                new_rows += self._parse(block[:end])
+                self.offset += end
+                f.seek(self.offset)
+        return new_rows
+
+    def _parse(self, block):
+        header_rows = 0
+        if self.columns is None:
+            first_line = block[:block.find(b'\n')].decode('utf-8', errors='replace')
+            self.columns, header_rows = line_layout(first_line)
+
+        engine = 'pyarrow' if len(block) >= PYARROW_MIN_BYTES and pyarrow_available() else 'c'
+        try:
+            chunk = self._read_block(block, engine, header_rows)
+        except IndexDtypeError:
+            # Fractional Index values cannot be parsed as integers, as in load_sensor_file
+            self._float_index()
+            chunk = self._read_block(block, engine, header_rows)
+        if chunk['Index'].dtype.kind == 'f' and self.index_dtype != 'float64':
+            # The pyarrow engine returns fractional Index values as float64 instead of raising
+            self._float_index()
+        if chunk.empty:
+            return 0
+
+        index = chunk['Index'].to_numpy()
+        # Sorted overall means every block is sorted and blocks do not step back
+        if self.index_sorted:
+            self.index_sorted = bool(np.all(index[1:] >= index[:-1])
+                                     and (self.rows == 0 or index[0] >= self._arrays['Index'][self.rows - 1]))
+        block_last = index.max()
+        self.last_index = block_last if self.last_index is None else max(self.last_index, block_last)
+
+        for name in self.columns:
+            self._append(name, chunk[name].to_numpy())
+        self.rows += len(chunk)
+        return len(chunk)
+
+    def _float_index(self):
+        self.index_dtype = 'float64'
+        if 'Index' in self._arrays:
+            self._arrays['Index'] = self._arrays['Index'].astype('float64')
+
+    def _read_block(self, block, engine, header_rows):
+        return read_sensor_rows(io.BytesIO(block), self.columns, header_rows, self.index_dtype, self.value_dtype, engine)
+
+    def _append(self, name, values):
+        array = self._arrays.get(name)
+        needed = self.rows + len(values)
+        if array is None or len(array) < needed:
+            capacity = max(needed, 2 * (len(array) if array is not None else 0), MIN_CAPACITY)
+            grown = np.empty(capacity, dtype=values.dtype)
+            if array is not None:
+                grown[:self.rows] = array[:self.rows]
+            self._arrays[name] = array = grown
+        array[self.rows:needed] = values
+
+    def data(self):
+        """DataFrame of every row parsed so far (views of the follower's arrays, valid until they grow)"""
+        if self.columns is None:
+            return pd.DataFrame({'Index': np.array([], dtype=self.index_dtype), 'Value': np.array([], dtype=self.value_dtype)})
+        data = pd.DataFrame({name: self._arrays[name][:self.rows] for name in self.columns}, copy=False)
+        data.attrs['index_sorted'] = self.index_sorted
+        return data
+
+
+class LiveWindowExtractor:
+    """Write template windows to an output as soon as the followed data has reached their end index.
+
+    The first write replaces the output; later writes append to it. For
+    data that is not sorted by Index, "reached" means the largest Index seen
+    so far is at or beyond the window's end. Completed windows are written
+    at most every flush_seconds (default: LIVE_XLSX_FLUSH_SECONDS for Excel
+    output, immediately for window stores); call flush() when following
+    stops to write the ones still waiting.
+    """
+
+    def __init__(self, windows, output_path, output_format=None, flush_seconds=None):
+        self.windows = list(windows)
+        self.output_path = output_path
+        self.output_format = output_format or detect_output_format(output_path)
+        if flush_seconds is None:
+            flush_seconds = LIVE_XLSX_FLUSH_SECONDS if self.output_format == 'xlsx' else 0
+        self.flush_seconds = flush_seconds
+        # Windows in the order the data reaches their end index
+        self._pending = sorted(range(len(self.windows)), key=lambda position: self.windows[position][2])
+        self._next = 0
+        self._ready = []  # completed windows waiting for the next write
+        self._data_index = None
+        self._last_write = None
+        self._tables = []
+        self._started = False
+        self.summary = {'total': len(self.windows), 'successful': 0, 'failed': 0, 'failures': [], 'rows': 0,
+                        'cancelled': False}
+
+    @property
+    def finished(self):
+        return self._next == len(self._pending) and not self._ready
+
+    @property
+    def waiting(self):
+        """Number of completed windows not written yet"""
+        return len(self._ready)
+
+    def update(self, data_index, last_index):
+        """Queue every pending window whose end index is at most last_index and write the queue when it is due.
+
+        Returns the names written by this call.
+        """
+        while self._next < len(self._pending) and self.windows[self._pending[self._next]][2] <= last_index:
+            self._ready.append(self._pending[self._next])
+            self._next += 1
+        self._data_index = data_index
+        if not self._ready:
+            return []
+        if (self._next < len(self._pending) and self._last_write is not None
+                and time.monotonic() - self._last_write < self.flush_seconds):
+            return []
+        return self.flush()
+
+    def flush(self):
+        """Write the completed windows still waiting; returns the names written"""
+        if not self._ready:
+            return []
+        ready = sorted(self._ready)
+        self._ready = []
+        self._last_write = time.monotonic()
+        data_index = self._data_index
+        done = self.summary['successful'] + self.summary['failed']
+        with open_window_writer(self.output_path, self.output_format, mode='standard',
+                                append=self._started) as writer:
+            self._started = True
+            written = write_windows(writer, data_index, self.windows, ready, self.summary, None, None, done=done)
+            if written:
+                self._tables.append(window_summary(data_index, self.windows, written))
+            if self._tables:
+                # Summary rows in template order, whatever order the windows completed in
+                order = {window[0]: position for position, window in enumerate(self.windows)}
+                table = pd.concat(self._tables, ignore_index=True)
+                writer.write_summary(table.iloc[table['Window'].map(order).argsort(kind='stable')]
+                                     .reset_index(drop=True))
+        return [self.windows[position][0] for position in written]
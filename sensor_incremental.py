@@ -0,0 +1,197 @@
+"""Incremental re-extraction of an edited template.
+
+extract_windows rewrites the whole output every run. When only a few
+windows of a template were added, moved or deleted, extract_windows_incremental
+compares the template with a manifest saved next to the output and touches
+just those windows:
+
+* new windows and windows whose start/end changed are (re)written,
+* windows no longer in the template are deleted,
+* everything else is left as it is, and the Summary sheet is rebuilt from
+  the statistics kept in the manifest plus those of the rewritten windows.
+
+The manifest records the data file (path, size, mtime and a fingerprint of
+its first and last MiB), the value dtype, the output format and a
+signature of the output written with it. If any of those no longer match,
+or there is no manifest, the run falls back to a full extraction. The data
+file is only loaded when some window has to be written.
+"""
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from sensor_export import open_window_writer, write_windows
+from sensor_stats import window_summary
+from sensor_store import MANIFEST_FILE, detect_output_format, store_path
+from sensor_windows import WindowIndex
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = '.manifest.json'
+STORE_MANIFEST_FILE = 'extraction.json'
+FINGERPRINT_BYTES = 1024 * 1024
+
+
+def manifest_path(output_path):
+    """Manifest file of an output: inside a Parquet store, next to a workbook or HDF5 file"""
+    output_path = store_path(output_path)
+    if detect_output_format(output_path) == 'parquet':
+        return os.path.join(output_path, STORE_MANIFEST_FILE)
+    return output_path + MANIFEST_SUFFIX
+
+
+def data_file_signature(data_file):
+    """Path, size, mtime and a hash of the first and last MiB of a data file"""
+    stat = os.stat(data_file)
+    digest = hashlib.sha1(str(stat.st_size).encode('ascii'))
+    with open(data_file, 'rb') as f:
+        digest.update(f.read(FINGERPRINT_BYTES))
+        if stat.st_size > FINGERPRINT_BYTES:
+            f.seek(max(FINGERPRINT_BYTES, stat.st_size - FINGERPRINT_BYTES))
+            digest.update(f.read(FINGERPRINT_BYTES))
+    return {'path': os.path.abspath(data_file), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+            'fingerprint': digest.hexdigest()}
+
+
+def output_signature(output_path, output_format):
+    """Size and mtime of what was last written to an output (a Parquet store's windows.json)"""
+    output_path = store_path(output_path)
+    if output_format == 'parquet':
+        output_path = os.path.join(output_path, MANIFEST_FILE)
+    try:
+        stat = os.stat(output_path)
+    except OSError:
+        return None
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def read_manifest(output_path):
+    """Return the saved manifest of an output, or None"""
+    try:
+        with open(manifest_path(output_path), 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get('version') == MANIFEST_VERSION else None
+
+
+def _write_manifest(output_path, manifest):
+    path = manifest_path(output_path)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(temp_path, path)
+
+
+def full_extraction_reason(manifest, data_signature, output_path, output_format, value_dtype):
+    """Why the output must be rebuilt from scratch, or None if it can be updated in place"""
+    if manifest is None:
+        return "no extraction manifest"
+    if manifest['data_file'] != data_signature:
+        return "data file changed"
+    if manifest['value_dtype'] != value_dtype or manifest['output_format'] != output_format:
+        return "extraction settings changed"
+    if manifest['output'] != output_signature(output_path, output_format):
+        return "output was modified outside incremental extraction"
+    return None
+
+
+def plan_incremental(manifest, windows):
+    """Return (write, remove, unchanged): window positions to write, window names to delete, positions to keep"""
+    saved = manifest['windows']
+    names = {window[0] for window in windows}
+    write, unchanged = [], []
+    for position, window in enumerate(windows):
+        entry = saved.get(window[0])
+        if entry is not None and (entry['start'], entry['end']) == (window[1], window[2]):
+            unchanged.append(position)
+        else:
+            write.append(position)
+    remove = [name for name in saved if name not in names]
+    return write, remove, unchanged
+
+
+def _json_records(table):
+    """Summary rows as dicts of native Python values keyed by window name.
+
+    json.dump writes floats with full round-trip precision, unlike
+    DataFrame.to_json (10 significant digits by default), so statistics
+    restored from the manifest equal those of a full run.
+    """
+    return {record['Window']: record for record in table.to_dict(orient='records')}
+
+
+def extract_windows_incremental(data_file, windows, output_path, load_data, value_dtype='float64',
+                                output_format=None, progress=None, should_stop=None):
+    """Bring output_path up to date with windows, rewriting only what changed.
+
+    load_data() returns the loaded sensor DataFrame of data_file and is only
+    called when a window has to be written. Excel output is appended with the
+    standard writer. Returns the extract_windows summary dict plus
+    'unchanged' and 'removed' window counts and 'full_reason' (None for an
+    in-place update). Unchanged windows count as successful.
+    """
+    output_format = output_format or detect_output_format(output_path)
+    data_signature = data_file_signature(data_file)
+    manifest = read_manifest(output_path)
+    full_reason = full_extraction_reason(manifest, data_signature, output_path, output_format, value_dtype)
+
+    if full_reason is None:
+        write, remove, unchanged = plan_incremental(manifest, windows)
+        saved = manifest['windows']
+    else:
+        write, remove, unchanged = list(range(len(windows))), [], []
+        saved = {}
+
+    summary = {'total': len(windows), 'successful': len(unchanged), 'failed': 0, 'failures': [], 'rows': 0,
+               'cancelled': False, 'unchanged': len(unchanged), 'removed': len(remove), 'full_reason': full_reason}
+    if full_reason is None and not write and not remove:
+        if progress is not None:
+            progress(len(windows), 0, f"All {len(windows)} windows are up to date")
+        return summary
+
+    data_index = WindowIndex(load_data()) if write else None
+    if progress is not None and unchanged:
+        progress(len(unchanged), 0, f"{len(unchanged)} windows unchanged, writing {len(write)}")
+
+    entries = {windows[position][0]: saved[windows[position][0]] for position in unchanged}
+    with open_window_writer(output_path, output_format, mode='standard', append=full_reason is None) as writer:
+        for sheet_name in remove:
+            writer.remove_window(sheet_name)
+
+        written = []
+        if write:
+            written = write_windows(writer, data_index, windows, write, summary, progress, should_stop,
+                                    done=len(unchanged))
+        processed = write[:summary['successful'] - len(unchanged) + summary['failed']]
+        written_positions = set(written)
+        for position in processed:
+            name = windows[position][0]
+            if position not in written_positions and name in saved:
+                # The window's new range has no data: drop the sheet left from its old range
+                writer.remove_window(name)
+        for position in write[len(processed):]:
+            # Not reached before a cancel: keep the old sheet, its old range gets it rewritten next run
+            if windows[position][0] in saved:
+                entries[windows[position][0]] = saved[windows[position][0]]
+
+        if written:
+            for name, record in _json_records(window_summary(data_index, windows, written)).items():
+                entries[name] = {'start': record['Start'], 'end': record['End'], 'statistics': record}
+
+        # Summary rows in template order: kept statistics for unchanged windows, fresh ones for the rest
+        ordered = [entries[window[0]]['statistics'] for window in windows if window[0] in entries]
+        if ordered:
+            # Records keep the column order of the table they came from (plain or per-channel statistics)
+            writer.write_summary(pd.DataFrame(ordered, columns=list(ordered[0])).infer_objects())
+
+    _write_manifest(output_path, {
+        'version': MANIFEST_VERSION,
+        'data_file': data_signature,
+        'value_dtype': value_dtype,
+        'output_format': output_format,
+        'windows': entries,
+        'output': output_signature(output_path, output_format),
+    })
+    return summary
@@ -0,0 +1,203 @@
+"""Sensor file loading for the Sensor Data Extractor.
+
+Sensor recordings are semicolon separated text files with an Index column
+followed by one value column (Index;Value) or, from multi-channel
+acquisition systems, by any number of channel columns. The layout is read
+from the first line: a single value column is called 'Value', several are
+called Channel_1..Channel_N unless the first line is a header naming them.
+The loaders here parse them straight into compact numeric dtypes, so the
+columns never pass through object/float64 intermediates and never need a
+second pd.to_numeric pass. Compressed recordings (.gz, .bz2, .xz, .zst) are
+decompressed on the fly as they are parsed (see sensor_compression).
+"""
+import importlib.util
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from sensor_compression import file_compression, open_sensor_stream, stream_position
+
+SENSOR_COLUMNS = ['Index', 'Value']
+INDEX_DTYPES = ('int64', 'int32', 'float64')
+VALUE_DTYPES = ('float64', 'float32')
+LOADER_ENGINES = ('auto', 'pyarrow', 'c')
+
+# Rows per block in chunked mode
+DEFAULT_CHUNKSIZE = 1_000_000
+
+
+def pyarrow_available():
+    """Return True if the pyarrow CSV engine can be used"""
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+class IndexDtypeError(ValueError):
+    """The Index column holds values an integer index_dtype cannot represent (fractions, gaps or overflow)"""
+
+
+def channel_names(count):
+    """Default names of count value columns: 'Value' for one, Channel_1..Channel_N for several"""
+    if count == 1:
+        return ['Value']
+    return [f"Channel_{i}" for i in range(1, count + 1)]
+
+
+def value_columns(data):
+    """The channel columns of a sensor DataFrame (everything but Index)"""
+    return [column for column in data.columns if column != 'Index']
+
+
+def sensor_layout(file_path):
+    """Return (column names, header rows) of a sensor file from its first line"""
+    with io.TextIOWrapper(open_sensor_stream(file_path, readahead=False), errors='replace') as f:
+        return line_layout(f.readline())
+
+
+def line_layout(first_line):
+    """Return (column names, header rows) for a sensor file starting with first_line"""
+    fields = [field.strip() for field in first_line.split(';')]
+    if len(fields) < 2:
+        # Empty or malformed: let the parser report it against the two-column layout
+        return SENSOR_COLUMNS, 0
+
+    try:
+        float(fields[0])
+    except ValueError:
+        # A header line names the channels; the first column is always Index
+        names = [field or default for field, default in zip(fields[1:], channel_names(len(fields) - 1))]
+        if len(set(names)) == len(names) and 'Index' not in names:
+            return ['Index'] + names, 1
+        return ['Index'] + channel_names(len(fields) - 1), 1
+    return ['Index'] + channel_names(len(fields) - 1), 0
+
+
+def _read_options(index_dtype, value_dtype, columns=SENSOR_COLUMNS, header_rows=0):
+    """Keyword arguments shared by every pd.read_csv call on a sensor file"""
+    dtype = {column: value_dtype for column in columns}
+    # The C parser wraps values that overflow int32, so they are parsed as int64 and narrowed by _narrow_index
+    dtype['Index'] = 'int64' if index_dtype == 'int32' else index_dtype
+    return {
+        'sep': ';',
+        'header': None,
+        'names': columns,
+        'skiprows': header_rows,
+        'dtype': dtype,
+    }
+
+
+def read_sensor_rows(buffer, columns, header_rows=0, index_dtype='int64', value_dtype='float64', engine='c'):
+    """Parse sensor rows from a file-like object whose column layout is already known.
+
+    With an integer index_dtype the C parser raises ValueError on
+    fractional Index values. pyarrow would truncate them instead, so it
+    reads the Index column with its inferred type: whole numbers are
+    narrowed to index_dtype and fractional ones come back as float64.
+    """
+    options = _read_options(index_dtype, value_dtype, columns, header_rows)
+    if engine == 'pyarrow' and index_dtype != 'float64':
+        del options['dtype']['Index']
+    try:
+        return _narrow_index(pd.read_csv(buffer, engine=engine, **options), index_dtype)
+    except (ValueError, OverflowError) as e:
+        raise _index_error(e, index_dtype)
+
+
+def _index_error(error, index_dtype):
+    """IndexDtypeError for a C parser error raised by the integer Index column, otherwise error itself"""
+    if isinstance(error, IndexDtypeError) or index_dtype == 'float64':
+        return error
+    # Index is the only integer column and always column 0, which pandas names in its conversion errors
+    if isinstance(error, OverflowError) or str(error).endswith('in column 0'):
+        return IndexDtypeError(f"Index values are not {index_dtype} numbers ({error})")
+    return error
+
+
+def _narrow_index(data, index_dtype):
+    """Cast a parsed integer Index column to index_dtype, raising IndexDtypeError if its values do not fit"""
+    index = data['Index']
+    if index_dtype == 'float64' or index.dtype.kind == 'f' or index.dtype == index_dtype:
+        return data
+    if index.dtype.kind not in 'iu':
+        raise ValueError("Index column is not numeric")
+    limits = np.iinfo(index_dtype)
+    if len(index) and (index.min() < limits.min or index.max() > limits.max):
+        raise IndexDtypeError(f"Index values do not fit {index_dtype}")
+    data['Index'] = index.astype(index_dtype)
+    return data
+
+
+def iter_sensor_chunks(file_path, chunksize=DEFAULT_CHUNKSIZE, index_dtype='int64', value_dtype='float64',
+                       with_position=False):
+    """Yield a sensor file as DataFrames of at most chunksize rows.
+
+    Raises IndexDtypeError if an integer index_dtype cannot hold the Index
+    values. With with_position=True, yields (chunk, fraction of the file
+    read) pairs.
+    """
+    options = _read_options(index_dtype, value_dtype, *sensor_layout(file_path))
+    size = os.path.getsize(file_path)
+    # The pyarrow engine has no chunked reader, so chunks always use the C parser
+    with open_sensor_stream(file_path) as stream, \
+            pd.read_csv(stream, chunksize=chunksize, engine='c', **options) as reader:
+        try:
+            for chunk in reader:
+                chunk = _narrow_index(chunk, index_dtype)
+                if with_position:
+                    yield chunk, min(stream_position(stream) / size, 1.0) if size else 1.0
+                else:
+                    yield chunk
+        except (ValueError, OverflowError) as e:
+            raise _index_error(e, index_dtype)
+
+
+def _load(file_path, index_dtype, value_dtype, engine, chunksize, workers):
+    if workers and workers > 1 and not chunksize and file_compression(file_path) is None:
+        from sensor_parallel import PARALLEL_MIN_BYTES, load_sensor_file_parallel
+        if os.path.getsize(file_path) >= PARALLEL_MIN_BYTES:
+            return load_sensor_file_parallel(file_path, workers, index_dtype, value_dtype)
+
+    columns, header_rows = sensor_layout(file_path)
+    if chunksize:
+        parts = {column: [] for column in columns}
+        for chunk in iter_sensor_chunks(file_path, chunksize, index_dtype, value_dtype):
+            for column in columns:
+                parts[column].append(chunk[column].to_numpy())
+
+        if not parts['Index']:
+            return pd.DataFrame({column: np.array([], dtype=index_dtype if column == 'Index' else value_dtype)
+                                 for column in columns})
+        return pd.DataFrame({column: np.concatenate(column_parts) for column, column_parts in parts.items()})
+
+    if engine == 'auto':
+        engine = 'pyarrow' if pyarrow_available() else 'c'
+    with open_sensor_stream(file_path) as stream:
+        return read_sensor_rows(stream, columns, header_rows, index_dtype, value_dtype, engine)
+
+
+def load_sensor_file(file_path, index_dtype='int64', value_dtype='float64', engine='auto', chunksize=None,
+                     workers=None):
+    """Load a semicolon separated sensor file into an Index + channel columns DataFrame.
+
+    engine='auto' uses pyarrow's multi-threaded CSV reader when it is installed
+    and the pandas C parser otherwise. With chunksize set, the file is parsed
+    in blocks of that many rows which keeps parser buffers small on very large
+    files. With workers > 1, files of at least PARALLEL_MIN_BYTES are split
+    into line-aligned byte ranges parsed by that many processes (see
+    sensor_parallel). If the Index column does not hold whole numbers it is
+    loaded as float64 instead of failing. Compressed files are parsed from
+    a decompressing stream, never in parallel.
+    """
+    if index_dtype not in INDEX_DTYPES:
+        raise ValueError(f"Unsupported index dtype: {index_dtype}")
+    if value_dtype not in VALUE_DTYPES:
+        raise ValueError(f"Unsupported value dtype: {value_dtype}")
+    if engine not in LOADER_ENGINES:
+        raise ValueError(f"Unknown loader engine: {engine}")
+
+    try:
+        return _load(file_path, index_dtype, value_dtype, engine, chunksize, workers)
+    except IndexDtypeError:
+        # Fractional Index values cannot be parsed as integers; any other parse error is raised as it is
+        return _load(file_path, 'float64', value_dtype, engine, chunksize, workers)
@@ -0,0 +1,104 @@
+"""Background batch jobs for the Sensor Data Extractor GUI.
+
+Long batch operations (template extraction, plotting many sheets) run on a
+worker thread. The worker never touches Tk: it only posts progress events to
+a queue, and the GUI drains that queue from root.after() callbacks.
+"""
+import os
+import queue
+import threading
+import time
+
+
+def format_duration(seconds):
+    """Format a duration the way the Progress & Timing panel shows it"""
+    if seconds is None:
+        return "--"
+    if seconds < 60:
+        return f"{seconds:.2f} seconds"
+    minutes = int(seconds // 60)
+    return f"{minutes}m {seconds % 60:.2f}s"
+
+
+def default_worker_count():
+    """Leave one core free for the GUI"""
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+class ProgressTracker:
+    """Turn (done, rows) updates into elapsed time, throughput and ETA"""
+
+    def __init__(self, total):
+        self.total = total
+        self.start_time = time.perf_counter()
+
+    def update(self, done, rows=0):
+        elapsed = time.perf_counter() - self.start_time
+        items_per_second = done / elapsed if elapsed > 0 else 0.0
+        remaining = max(self.total - done, 0)
+        eta = remaining / items_per_second if items_per_second > 0 else None
+        return {
+            'done': done,
+            'total': self.total,
+            'percent': int(done / self.total * 100) if self.total else 100,
+            'elapsed': elapsed,
+            'items_per_second': items_per_second,
+            'rows_per_second': rows / elapsed if elapsed > 0 else 0.0,
+            'eta': eta,
+        }
+
+
+class BackgroundJob:
+    """Run target(job) on a daemon worker thread.
+
+    The target reports progress with job.report(done, rows, message) and should
+    check job.cancelled between items. Events are drained on the GUI thread
+    with job.events(), which returns ('progress', info), ('done', result) or
+    ('error', exception) tuples in order.
+    """
+
+    def __init__(self, target, total=0):
+        self._target = target
+        self._events = queue.Queue()
+        self._cancel_event = threading.Event()
+        self.tracker = ProgressTracker(total)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        try:
+            result = self._target(self)
+        except Exception as e:
+            self._events.put(('error', e))
+        else:
+            self._events.put(('done', result))
+
+    def start(self):
+        self.tracker = ProgressTracker(self.tracker.total)
+        self._thread.start()
+        return self
+
+    def report(self, done, rows=0, message=''):
+        """Post a progress update (called from the worker thread)"""
+        info = self.tracker.update(done, rows)
+        info['message'] = message
+        self._events.put(('progress', info))
+
+    def cancel(self):
+        """Ask the worker to stop after the item it is working on"""
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    def events(self):
+        """Return all queued events without blocking"""
+        pending = []
+        while True:
+            try:
+                pending.append(self._events.get_nowait())
+            except queue.Empty:
+                return pending
@@ -0,0 +1,248 @@
+"""Sparse byte-offset index for random-access window extraction.
+
+Extracting a handful of windows from a multi-GB text recording should not
+mean parsing every line of it. build_offset_index scans the file once for
+line breaks (numpy over large byte blocks, without parsing any values) and
+records the Index value and byte offset of every Kth line. A window is then
+read by seeking to the last sampled line before its start and parsing only
+the bytes up to the first sampled line after its end, roughly the window
+plus 2K lines.
+
+Seeking relies on a recording sorted by Index. The sampled lines are
+checked when the index is built, and every block read for a window is
+checked again, so unsorted lines between samples raise instead of silently
+dropping rows from the window. The index is persisted in a small
+.npz file per data file (under DEFAULT_OFFSET_INDEX_DIR) together with the
+file's size and mtime, so it is built again only when the file changes.
+"""
+import hashlib
+import io
+import json
+import os
+import time
+import uuid
+
+import numpy as np
+
+from sensor_compression import require_uncompressed
+from sensor_export import open_window_writer
+from sensor_io import VALUE_DTYPES, IndexDtypeError, read_sensor_rows, sensor_layout
+from sensor_stats import WindowStatistics
+from sensor_windows import WindowIndex
+
+DEFAULT_OFFSET_INDEX_DIR = os.path.join(os.path.expanduser('~'), '.sensor_data_extractor', 'offsets')
+DEFAULT_INDEX_EVERY = 4096
+OFFSET_INDEX_VERSION = 1
+SCAN_BLOCK_BYTES = 64 * 1024 * 1024
+# Bytes read at a sampled line to parse its Index value
+INDEX_FIELD_BYTES = 64
+
+
+def _source_signature(file_path):
+    stat = os.stat(file_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _parse_index_field(line):
+    """Index value at the start of a line (int when it is a whole number), or None"""
+    field = line.split(b';', 1)[0].strip()
+    try:
+        return int(field)
+    except ValueError:
+        try:
+            return float(field)
+        except ValueError:
+            return None
+
+
+class OffsetIndex:
+    """Every Kth Index value of a sorted sensor file and the byte offset of its line"""
+
+    def __init__(self, index_values, offsets, columns, header_rows, every, source):
+        self.index_values = index_values
+        self.offsets = offsets
+        self.columns = list(columns)
+        self.header_rows = header_rows
+        self.every = every
+        self.source = source
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def byte_range(self, start, end):
+        """Return the (first, stop) byte offsets holding every line with start <= Index <= end"""
+        # The last sample before start: lines equal to start may precede a sample equal to it
+        first = int(np.searchsorted(self.index_values, start, side='left')) - 1
+        stop = int(np.searchsorted(self.index_values, end, side='right'))
+        first_offset = int(self.offsets[max(first, 0)])
+        stop_offset = int(self.offsets[stop]) if stop < len(self.offsets) else self.source['size']
+        return first_offset, max(first_offset, stop_offset)
+
+    def read_window(self, file_path, start, end, index_dtype='int64', value_dtype='float64'):
+        """Parse only the lines of one inclusive (start, end) Index window.
+
+        Raises ValueError if the lines read are not sorted by Index.
+        """
+        first_offset, stop_offset = self.byte_range(start, end)
+        with open(file_path, 'rb') as f:
+            f.seek(first_offset)
+            block = f.read(stop_offset - first_offset)
+        try:
+            rows = read_sensor_rows(io.BytesIO(block), self.columns, 0, index_dtype, value_dtype)
+        except IndexDtypeError:
+            # Fractional Index values cannot be parsed as integers, as in load_sensor_file
+            rows = read_sensor_rows(io.BytesIO(block), self.columns, 0, 'float64', value_dtype)
+
+        if not rows['Index'].is_monotonic_increasing:
+            raise ValueError(f"{os.path.basename(file_path)} is not sorted by Index, so windows cannot be found by seeking")
+        index = rows['Index'].to_numpy()
+        first = int(np.searchsorted(index, start, side='left'))
+        stop = int(np.searchsorted(index, end, side='right'))
+        return rows.iloc[first:max(first, stop)].reset_index(drop=True)
+
+    def save(self, path):
+        """Write the index atomically to an .npz file"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        meta = {'version': OFFSET_INDEX_VERSION, 'columns': self.columns, 'header_rows': self.header_rows,
+                'every': self.every, 'source': self.source, 'created': time.time()}
+        temp_path = f"{path}.tmp-{uuid.uuid4().hex}.npz"
+        np.savez(temp_path, index_values=self.index_values, offsets=self.offsets, meta=np.array(json.dumps(meta)))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read an index written by save(), or return None if it is missing or unreadable"""
+        try:
+            with np.load(path) as saved:
+                meta = json.loads(str(saved['meta']))
+                if meta.get('version') != OFFSET_INDEX_VERSION:
+                    return None
+                return cls(saved['index_values'], saved['offsets'], meta['columns'], meta['header_rows'],
+                           meta['every'], meta['source'])
+        except (OSError, ValueError, KeyError):
+            return None
+
+
+def build_offset_index(file_path, every=DEFAULT_INDEX_EVERY):
+    """Scan a sensor file once and sample the Index value and byte offset of every Kth line.
+
+    Raises ValueError if the sampled Index values are not in ascending
+    order, since windows could then not be found by seeking.
+    """
+    if every < 1:
+        raise ValueError("The offset index needs every >= 1")
+    require_uncompressed(file_path, "Seeking with a byte-offset index")
+    source = _source_signature(file_path)
+    columns, header_rows = sensor_layout(file_path)
+
+    sample_offsets = []
+    with open(file_path, 'rb') as f:
+        for _ in range(header_rows):
+            f.readline()
+        data_start = f.tell()
+        if data_start < source['size']:
+            sample_offsets.append(np.array([data_start], dtype=np.int64))
+
+        # Data line n (0 = the first after the header) starts after the nth line break
+        lines_started = 1
+        position = data_start
+        while True:
+            block = f.read(SCAN_BLOCK_BYTES)
+            if not block:
+                break
+            breaks = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == ord('\n'))
+            line_numbers = lines_started + np.arange(len(breaks))
+            sample_offsets.append(position + breaks[line_numbers % every == 0].astype(np.int64) + 1)
+            lines_started += len(breaks)
+            position += len(block)
+
+        offsets = np.concatenate(sample_offsets) if sample_offsets else np.empty(0, dtype=np.int64)
+        offsets = offsets[offsets < source['size']]
+
+        # Only the sampled lines are parsed, and only their Index field
+        kept_offsets = []
+        values = []
+        for offset in offsets.tolist():
+            f.seek(offset)
+            value = _parse_index_field(f.read(INDEX_FIELD_BYTES))
+            if value is not None:
+                kept_offsets.append(offset)
+                values.append(value)
+
+    index_values = np.array(values) if values else np.empty(0, dtype=np.int64)
+    if len(index_values) > 1 and np.any(index_values[1:] < index_values[:-1]):
+        raise ValueError(f"{os.path.basename(file_path)} is not sorted by Index, so windows cannot be found by seeking")
+    return OffsetIndex(index_values, np.array(kept_offsets, dtype=np.int64), columns, header_rows, every, source)
+
+
+def offset_index_path(file_path, index_dir=DEFAULT_OFFSET_INDEX_DIR):
+    """Where the offset index of a data file is kept"""
+    key = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+    return os.path.join(index_dir, f"{key}.npz")
+
+
+def load_offset_index(file_path, every=DEFAULT_INDEX_EVERY, index_dir=DEFAULT_OFFSET_INDEX_DIR):
+    """Return the saved offset index of a data file, building (and saving) it if it is missing or stale"""
+    path = offset_index_path(file_path, index_dir)
+    offset_index = OffsetIndex.load(path)
+    if offset_index is not None and offset_index.source == _source_signature(file_path) and offset_index.every == every:
+        return offset_index
+
+    offset_index = build_offset_index(file_path, every)
+    try:
+        offset_index.save(path)
+    except OSError:
+        # A read-only or full index location must never break extraction
+        pass
+    return offset_index
+
+
+def extract_windows_seeking(data_file, windows, output_path, value_dtype='float64', output_format=None,
+                            every=DEFAULT_INDEX_EVERY, index_dir=DEFAULT_OFFSET_INDEX_DIR, progress=None,
+                            should_stop=None):
+    """Extract template windows from a sorted text file by seeking through its offset index.
+
+    Only the lines of each window (plus up to every lines on each side)
+    are read and parsed, so a few windows cost milliseconds whatever the
+    file size. Returns the extract_windows summary dict; the statistics of
+    the written windows go to the Summary sheet as usual.
+    """
+    if value_dtype not in VALUE_DTYPES:
+        raise ValueError(f"Unsupported value dtype: {value_dtype}")
+    summary = {'total': len(windows), 'successful': 0, 'failed': 0, 'failures': [], 'rows': 0, 'cancelled': False}
+    if progress is not None:
+        progress(0, 0, "Loading byte-offset index...")
+    offset_index = load_offset_index(data_file, every, index_dir)
+    index_dtype = 'int64' if offset_index.index_values.dtype.kind in 'iu' else 'float64'
+
+    statistics = WindowStatistics(windows)
+    written = []
+    with open_window_writer(output_path, output_format, mode='standard') as writer:
+        for i, window in enumerate(windows):
+            if should_stop is not None and should_stop():
+                summary['cancelled'] = True
+                break
+
+            sheet_name, start_index, end_index = window[:3]
+            try:
+                window_data = offset_index.read_window(data_file, start_index, end_index, index_dtype, value_dtype)
+                if not window_data.empty:
+                    writer.write_window(sheet_name, window_data, bounds=(start_index, end_index))
+                    statistics.add(WindowIndex(window_data), [i])
+                    written.append(i)
+                    summary['successful'] += 1
+                    summary['rows'] += len(window_data)
+                else:
+                    summary['failed'] += 1
+                    summary['failures'].append((sheet_name, f"No data found for range {start_index}-{end_index}"))
+            except Exception as e:
+                summary['failed'] += 1
+                summary['failures'].append((sheet_name, str(e)))
+
+            if progress is not None:
+                progress(i + 1, summary['rows'], f"Processed {i+1}/{len(windows)}: {sheet_name}")
+
+        if written:
+            writer.write_summary(statistics.table(written))
+
+    return summary
@@ -0,0 +1,93 @@
+"""Multi-process parsing of one large sensor file.
+
+The text parse of a multi-GB recording is CPU bound. load_sensor_file_parallel
+splits the file into byte ranges that start and end on line boundaries, parses
+the ranges concurrently in a process pool (each task reads and parses only its
+own range with the C parser) and concatenates the parsed columns in file
+order, so the result is identical to a serial load.
+
+Files smaller than PARALLEL_MIN_BYTES are parsed serially: below that,
+starting the worker processes costs more than the parse itself.
+"""
+import io
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from sensor_compression import require_uncompressed
+from sensor_io import read_sensor_rows, sensor_layout
+
+# Largest byte range parsed by one task, so no task holds much more than this as text
+PARALLEL_RANGE_BYTES = 64 * 1024 * 1024
+PARALLEL_MIN_BYTES = 64 * 1024 * 1024
+
+
+def split_byte_ranges(file_path, parts, data_start=0):
+    """Split a file after data_start into at most parts (start, stop) ranges aligned on line starts"""
+    size = os.path.getsize(file_path)
+    if data_start >= size:
+        return []
+    step = max(1, (size - data_start) // max(parts, 1))
+    boundaries = [data_start]
+    with open(file_path, 'rb') as f:
+        for position in range(data_start + step, size, step):
+            if position <= boundaries[-1]:
+                continue
+            # Move each cut forward to the start of the next line
+            f.seek(position - 1)
+            f.readline()
+            boundary = f.tell()
+            if boundary >= size:
+                break
+            if boundary > boundaries[-1]:
+                boundaries.append(boundary)
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _parse_range_task(file_path, start, stop, columns, index_dtype, value_dtype):
+    """Process-pool task: parse the lines in one byte range into column arrays"""
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        block = f.read(stop - start)
+    try:
+        rows = read_sensor_rows(io.BytesIO(block), columns, 0, index_dtype, value_dtype)
+    except pd.errors.EmptyDataError:
+        # A range holding only blank lines
+        return {column: np.array([], dtype=index_dtype if column == 'Index' else value_dtype) for column in columns}
+    return {column: rows[column].to_numpy() for column in columns}
+
+
+def load_sensor_file_parallel(file_path, workers, index_dtype='int64', value_dtype='float64'):
+    """Parse a sensor file with workers processes and return the same DataFrame as load_sensor_file.
+
+    Raises IndexDtypeError, like the serial parser, when the Index column
+    does not hold values of index_dtype.
+    """
+    require_uncompressed(file_path, "Parallel parsing")
+    columns, header_rows = sensor_layout(file_path)
+    with open(file_path, 'rb') as f:
+        for _ in range(header_rows):
+            f.readline()
+        data_start = f.tell()
+
+    size = os.path.getsize(file_path)
+    parts = max(workers, math.ceil((size - data_start) / PARALLEL_RANGE_BYTES))
+    ranges = split_byte_ranges(file_path, parts, data_start)
+    if not ranges:
+        return pd.DataFrame({column: np.array([], dtype=index_dtype if column == 'Index' else value_dtype)
+                             for column in columns})
+
+    # spawn keeps workers independent of the parent's threads and Tk state
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges)), mp_context=context) as executor:
+        futures = [executor.submit(_parse_range_task, file_path, start, stop, columns, index_dtype, value_dtype)
+                   for start, stop in ranges]
+        # Collected in submission order, so the rows stay in file order whatever order the ranges finish in
+        parsed = [future.result() for future in futures]
+
+    return pd.DataFrame({column: np.concatenate([part[column] for part in parsed]) for column in columns}, copy=False)
@@ -0,0 +1,225 @@
+"""Figure rendering for the Professional Plotting tab.
+
+Figures are built with the object-oriented matplotlib API on an Agg canvas
+instead of the pyplot state machine, so they can be rendered off the Tk
+thread without touching the GUI backend, or in worker processes of a
+process pool (plot_workbook_sheets_parallel) where each worker reads its own
+sheet and writes its own file. Sheets are read through a WorkbookSheetCache,
+so every process opens a workbook only once however many sheets it plots.
+
+A matplotlib style lives in the process-wide rcParams, so it is never
+applied while a figure is rendered on a worker thread: callers set it with
+apply_plot_style() on their main thread, and pool workers, which render on
+their own main thread, apply options['style'] themselves.
+
+Windows of multi-channel recordings hold one column per channel. options
+may name the 'channels' to draw (default: all) and whether they are
+overlaid on one figure or rendered to one figure per channel ('overlay').
+"""
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib.style
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.ticker import FormatStrFormatter
+
+from sensor_io import value_columns
+from sensor_jobs import default_worker_count
+from sensor_workbook import WorkbookSheetCache
+
+# Per-process workbook handles for pool workers (sheets are rendered once, so none are kept)
+_worker_sheet_cache = None
+# Style last applied in this pool worker
+_worker_style = None
+
+MISSING_COLUMNS = "Missing 'Index' or channel columns"
+
+
+def plot_channels(sheet_data, channels=None):
+    """Channel columns of a sheet to draw: the requested ones it has, or all of them ([] without an Index)"""
+    if 'Index' not in sheet_data.columns:
+        return []
+    available = value_columns(sheet_data)
+    if channels:
+        return [channel for channel in channels if channel in available]
+    return available
+
+
+def sheet_figures(sheet_data, sheet_name, output_folder, options):
+    """Return (output_path, channels) for every figure a sheet is rendered to"""
+    channels = plot_channels(sheet_data, options.get('channels'))
+    extension = options['file_format']
+    if len(channels) <= 1 or options.get('overlay', True):
+        return [(os.path.join(output_folder, f"{sheet_name}.{extension}"), channels)] if channels else []
+    figures = []
+    for channel in channels:
+        # Header channel names may hold characters that are not allowed in file names
+        channel_name = re.sub(r'[^\w.-]', '_', str(channel))
+        figures.append((os.path.join(output_folder, f"{sheet_name}_{channel_name}.{extension}"), [channel]))
+    return figures
+
+
+def apply_plot_style(style):
+    """Make a matplotlib style the process-wide default (call it from the main thread only)"""
+    if style:
+        matplotlib.style.use(style)
+
+
+def render_sheet_plot(sheet_data, sheet_name, output_path, options, channels=None):
+    """Render one sheet's Index/channel data as a publication figure and save it.
+
+    options holds width, height, dpi, x_label and y_label. The figure takes
+    its style from the current rcParams (see apply_plot_style). Several
+    channels are overlaid on one axes (default: all channels of the sheet).
+    """
+    channels = channels or plot_channels(sheet_data, options.get('channels'))
+    fig = Figure(figsize=(options['width'], options['height']), dpi=options['dpi'])
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+
+    # Plot data with integer formatting
+    if len(channels) == 1:
+        ax.plot(sheet_data['Index'], sheet_data[channels[0]], label=channels[0],
+                linewidth=2, color='#2E86AB', alpha=0.8)
+    else:
+        # Overlaid channels take their colours from the style's cycle
+        for channel in channels:
+            ax.plot(sheet_data['Index'], sheet_data[channel], label=channel, linewidth=1.5, alpha=0.8)
+    if channels != ['Value']:
+        ax.legend()
+
+    # Professional styling with integer formatting
+    ax.set_xlabel(options['x_label'], fontsize=12, fontweight='bold')
+    ax.set_ylabel(options['y_label'], fontsize=12, fontweight='bold')
+    ax.set_title(f'Sensor Data - {sheet_name}', fontsize=14, fontweight='bold', pad=20)
+
+    # Set integer formatting for both axes - NO scientific notation
+    ax.ticklabel_format(style='plain', axis='both')
+    ax.xaxis.set_major_formatter(FormatStrFormatter('%d'))
+    ax.yaxis.set_major_formatter(FormatStrFormatter('%d'))
+
+    # Grid and aesthetics
+    ax.grid(True, alpha=0.3, linestyle='--')
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=options['dpi'], bbox_inches='tight',
+                facecolor='white', edgecolor='none')
+
+
+def _render_sheet_task(excel_path, sheet_name, output_folder, options):
+    """Process-pool task: read one sheet, render it and report (sheet_name, rows, error)"""
+    global _worker_sheet_cache, _worker_style
+    if _worker_sheet_cache is None:
+        _worker_sheet_cache = WorkbookSheetCache(max_rows=0)
+
+    try:
+        if options.get('style') != _worker_style:
+            apply_plot_style(options.get('style'))
+            _worker_style = options.get('style')
+        sheet_data = _worker_sheet_cache.read(excel_path, sheet_name)
+        figures = sheet_figures(sheet_data, sheet_name, output_folder, options)
+        if not figures:
+            return sheet_name, 0, MISSING_COLUMNS
+
+        for output_path, channels in figures:
+            render_sheet_plot(sheet_data, sheet_name, output_path, options, channels)
+        return sheet_name, len(sheet_data), None
+    except Exception as e:
+        return sheet_name, 0, str(e)
+
+
+def plot_workbook_sheets(excel_path, sheet_names, output_folder, options, progress=None, should_stop=None,
+                         sheet_cache=None):
+    """Plot every listed sheet of an Excel workbook into output_folder.
+
+    progress(done, rows, message) is called around each sheet and
+    should_stop() is checked before each one. Sheets are read through
+    sheet_cache (a private WorkbookSheetCache if none is given). Figures use
+    the current rcParams; options['style'] is not applied here, since this
+    may run on a worker thread. Returns a summary dict with
+    successful/failed counts and a list of (sheet_name, reason) failures.
+    """
+    if sheet_cache is None:
+        sheet_cache = WorkbookSheetCache(max_rows=0)
+    summary = {'total': len(sheet_names), 'successful': 0, 'failed': 0, 'failures': [], 'rows': 0, 'cancelled': False}
+    start_time = time.perf_counter()
+
+    for i, sheet_name in enumerate(sheet_names):
+        if should_stop is not None and should_stop():
+            summary['cancelled'] = True
+            break
+
+        if progress is not None:
+            progress(i, summary['rows'], f"Plotting {i+1}/{len(sheet_names)}: {sheet_name}")
+
+        try:
+            # Read sheet data
+            sheet_data = sheet_cache.read(excel_path, sheet_name)
+
+            figures = sheet_figures(sheet_data, sheet_name, output_folder, options)
+            if figures:
+                for output_path, channels in figures:
+                    render_sheet_plot(sheet_data, sheet_name, output_path, options, channels)
+                summary['successful'] += 1
+                summary['rows'] += len(sheet_data)
+            else:
+                summary['failed'] += 1
+                summary['failures'].append((sheet_name, MISSING_COLUMNS))
+
+        except Exception as e:
+            summary['failed'] += 1
+            summary['failures'].append((sheet_name, str(e)))
+
+        if progress is not None:
+            progress(i + 1, summary['rows'], f"Plotted {i+1}/{len(sheet_names)}: {sheet_name}")
+
+    summary['seconds'] = time.perf_counter() - start_time
+    return summary
+
+
+def plot_workbook_sheets_parallel(excel_path, sheet_names, output_folder, options, workers=None,
+                                  progress=None, should_stop=None):
+    """Plot workbook sheets in a process pool, one sheet per task.
+
+    Takes the same arguments as plot_workbook_sheets plus the worker count.
+    options must include the matplotlib style, since worker processes do not
+    share the parent's rcParams; each worker applies it before rendering.
+    The summary also reports the worker count and the wall time.
+    """
+    workers = workers or default_worker_count()
+    summary = {'total': len(sheet_names), 'successful': 0, 'failed': 0, 'failures': [], 'rows': 0, 'cancelled': False,
+               'workers': workers}
+    start_time = time.perf_counter()
+
+    # spawn keeps workers independent of the parent's threads and Tk state
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = [executor.submit(_render_sheet_task, excel_path, sheet_name, output_folder, options)
+                   for sheet_name in sheet_names]
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            sheet_name, rows, error = future.result()
+            if error is None:
+                summary['successful'] += 1
+                summary['rows'] += rows
+            else:
+                summary['failed'] += 1
+                summary['failures'].append((sheet_name, error))
+
+            if progress is not None:
+                progress(done, summary['rows'], f"Plotted {done}/{len(sheet_names)}: {sheet_name}")
+
+            if should_stop is not None and should_stop():
+                summary['cancelled'] = True
+                for pending in futures:
+                    pending.cancel()
+                break
+
+    summary['seconds'] = time.perf_counter() - start_time
+    return summary
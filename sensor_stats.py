@@ -0,0 +1,198 @@
+"""Per-window descriptive statistics for the extraction Summary sheet.
+
+Min, max, mean, RMS, peak-to-peak and standard deviation of every template
+window are computed together: the window bounds come from one vectorized
+binary search (WindowIndex.bounds_many) and each statistic from a single
+ufunc.reduceat over each channel column, so thousands of windows cost a few
+passes over the data instead of one slice per window. A single-channel
+recording gets the plain statistic columns (Min, Max, ...); a multi-channel
+one gets '<channel> <statistic>' columns, still one row per window.
+
+Only the rows the windows cover are read: a few short windows over a
+memory-mapped recording page in just those rows. Sums are accumulated
+around a fixed shift (the mean of the first rows added) so the variance of
+small signals on a large offset keeps its precision. WindowStatistics can
+be updated block by block, which lets chunked extraction build the same
+table without holding the file.
+"""
+import numpy as np
+import pandas as pd
+
+from sensor_io import value_columns
+
+SUMMARY_SHEET = 'Summary'
+WINDOW_COLUMNS = ['Window', 'Start', 'End', 'Rows', 'First Index', 'Last Index']
+STATISTICS = ['Min', 'Max', 'Mean', 'RMS', 'Peak-to-Peak', 'Std']
+SUMMARY_COLUMNS = WINDOW_COLUMNS + STATISTICS
+
+
+def summary_columns(channels):
+    """Summary table columns for the given channels"""
+    channels = list(channels)
+    if channels == ['Value']:
+        return SUMMARY_COLUMNS
+    return WINDOW_COLUMNS + [f"{channel} {statistic}" for channel in channels for statistic in STATISTICS]
+
+
+def _reduce_windows(ufunc, padded, firsts, stops):
+    """ufunc over padded[first:stop] for every window (padded has one spare element at the end)"""
+    if not len(firsts):
+        return np.empty(0, dtype=padded.dtype)
+    # reduceat over interleaved first/stop positions reduces each [first, stop) slice at the
+    # even slots; the spare element keeps stop == len(data) a valid position. The odd slots
+    # reduce the gaps between windows, so visiting windows by first position keeps those
+    # gaps from spanning the data again for every window.
+    order = np.argsort(firsts, kind='stable')
+    indices = np.empty(2 * len(firsts), dtype=np.intp)
+    indices[0::2] = firsts[order]
+    indices[1::2] = stops[order]
+    reduced = np.empty(len(firsts), dtype=padded.dtype)
+    reduced[order] = ufunc.reduceat(padded, indices)[0::2]
+    return reduced
+
+
+def _covered_rows(firsts, stops):
+    """Return (take, firsts, stops): the sorted-order rows the windows cover and their bounds within them.
+
+    take is one contiguous slice when the windows cover at least half of
+    the span from the first to the last window, and an array of the covered
+    positions otherwise, so sparse windows never read the rows between them.
+    """
+    order = np.argsort(firsts, kind='stable')
+    ordered_firsts, ordered_stops = firsts[order], stops[order]
+    # Overlapping and touching windows merge into disjoint segments
+    new_segment = np.ones(len(order), dtype=bool)
+    new_segment[1:] = ordered_firsts[1:] > np.maximum.accumulate(ordered_stops)[:-1]
+    segment_firsts = ordered_firsts[new_segment]
+    segment_stops = np.maximum.reduceat(ordered_stops, np.flatnonzero(new_segment))
+    lengths = segment_stops - segment_firsts
+    covered = int(lengths.sum())
+
+    if 2 * covered >= segment_stops[-1] - segment_firsts[0]:
+        span_first = segment_firsts[0]
+        return slice(span_first, segment_stops[-1]), firsts - span_first, stops - span_first
+
+    # Segment k starts at position offsets[k] of the gathered rows
+    offsets = np.cumsum(lengths) - lengths
+    segment_shift = segment_firsts - offsets
+    shift = np.empty(len(firsts), dtype=segment_shift.dtype)
+    shift[order] = segment_shift[np.cumsum(new_segment) - 1]
+    take = np.repeat(segment_shift, lengths) + np.arange(covered)
+    return take, firsts - shift, stops - shift
+
+
+class WindowStatistics:
+    """Running statistics for every window of a template.
+
+    channels defaults to every non-Index column of the first data added.
+    """
+
+    def __init__(self, windows, channels=None):
+        self.windows = list(windows)
+        count = len(self.windows)
+        self.starts = np.array([window[1] for window in self.windows])
+        self.ends = np.array([window[2] for window in self.windows])
+        self.shift = None
+        self.index_dtype = None
+        self.rows = np.zeros(count, dtype=np.int64)
+        self.first_index = np.full(count, np.nan)
+        self.last_index = np.full(count, np.nan)
+        self.channels = None
+        if channels:
+            self._set_channels(channels)
+
+    def _set_channels(self, channels):
+        """Size the per-channel accumulators (windows x channels)"""
+        self.channels = list(channels)
+        shape = (len(self.windows), len(self.channels))
+        self.sums = np.zeros(shape)
+        self.squares = np.zeros(shape)
+        self.minimum = np.full(shape, np.inf)
+        self.maximum = np.full(shape, -np.inf)
+
+    def add(self, data_index, positions=None):
+        """Add the rows of a WindowIndex to the windows at positions (default: all windows)"""
+        positions = np.arange(len(self.windows)) if positions is None else np.asarray(positions, dtype=np.intp)
+        if not len(positions) or not len(data_index):
+            return
+        if self.channels is None:
+            self._set_channels(value_columns(data_index.data))
+        firsts, stops = data_index.bounds_many(self.starts[positions], self.ends[positions])
+        rows = stops - firsts
+        hit = rows > 0
+        if not hit.any():
+            return
+        positions, firsts, stops, rows = positions[hit], firsts[hit], stops[hit], rows[hit]
+
+        index_values = data_index.sorted_column(data_index.column)
+        first_block = self.shift is None
+        if first_block:
+            self.shift = np.zeros(len(self.channels))
+            self.index_dtype = index_values.dtype
+        self.rows[positions] += rows
+        self.first_index[positions] = np.fmin(self.first_index[positions], index_values[firsts])
+        self.last_index[positions] = np.fmax(self.last_index[positions], index_values[stops - 1])
+
+        take, firsts, stops = _covered_rows(firsts, stops)
+        # One channel at a time keeps the working buffer at a single column of the covered rows
+        padded = None
+        for channel_position, channel in enumerate(self.channels):
+            values = data_index.sorted_take(channel, take)
+            if padded is None:
+                padded = np.empty(len(values) + 1)
+            padded[:-1] = values
+            padded[-1] = 0.0
+
+            # Window positions are unique, so plain fancy-index updates accumulate correctly
+            minimum = self.minimum[positions, channel_position]
+            self.minimum[positions, channel_position] = np.fmin(minimum, _reduce_windows(np.minimum, padded, firsts, stops))
+            maximum = self.maximum[positions, channel_position]
+            self.maximum[positions, channel_position] = np.fmax(maximum, _reduce_windows(np.maximum, padded, firsts, stops))
+
+            if first_block:
+                self.shift[channel_position] = float(np.nanmean(padded[:-1]))
+            padded[:-1] -= self.shift[channel_position]
+            self.sums[positions, channel_position] += _reduce_windows(np.add, padded, firsts, stops)
+            np.square(padded, out=padded)
+            self.squares[positions, channel_position] += _reduce_windows(np.add, padded, firsts, stops)
+
+    def table(self, positions=None):
+        """Summary DataFrame (one row per window with data, in template order)"""
+        positions = np.arange(len(self.windows)) if positions is None else np.asarray(positions, dtype=np.intp)
+        if self.channels is None:
+            # Nothing was added yet
+            return pd.DataFrame(columns=SUMMARY_COLUMNS)
+        positions = positions[self.rows[positions] > 0]
+        rows = self.rows[positions][:, np.newaxis]
+        channels = self.channels
+        shift = self.shift if self.shift is not None else np.zeros(len(channels))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            shifted_mean = self.sums[positions] / rows
+            mean_square = self.squares[positions] / rows
+            variance = (self.squares[positions] - self.sums[positions] * shifted_mean) / (rows - 1)
+            std = np.sqrt(np.where(rows > 1, np.maximum(variance, 0.0), np.nan))
+            rms = np.sqrt(np.maximum(mean_square + 2 * shift * shifted_mean + shift * shift, 0.0))
+
+        minimum, maximum = self.minimum[positions], self.maximum[positions]
+        index_dtype = self.index_dtype if self.index_dtype is not None else float
+        table = {
+            'Window': [self.windows[position][0] for position in positions],
+            'Start': self.starts[positions],
+            'End': self.ends[positions],
+            'Rows': rows[:, 0],
+            'First Index': self.first_index[positions].astype(index_dtype),
+            'Last Index': self.last_index[positions].astype(index_dtype),
+        }
+        statistics = [minimum, maximum, shifted_mean + shift, rms, maximum - minimum, std]
+        names = summary_columns(channels)[len(WINDOW_COLUMNS):]
+        for channel_position in range(len(channels)):
+            for offset, values in enumerate(statistics):
+                table[names[channel_position * len(STATISTICS) + offset]] = values[:, channel_position]
+        return pd.DataFrame(table, columns=summary_columns(channels))
+
+
+def window_summary(data_index, windows, positions=None, channels=None):
+    """Summary table of the windows at positions (default: all) over one loaded WindowIndex"""
+    statistics = WindowStatistics(windows, channels)
+    statistics.add(data_index, positions)
+    return statistics.table(positions)
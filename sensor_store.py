@@ -0,0 +1,359 @@
+"""Columnar window stores: Parquet and HDF5 alternatives to the Excel output.
+
+Excel is slow to write and read back and caps a sheet at 1,048,576 rows. The
+writers here take the same calls as BatchExcelWriter (write_window,
+append_rows, finish_sheet, close) but store each window as its own column
+table:
+
+* Parquet: a folder (conventionally named *.parquet) with one
+  <window>.parquet file per window plus a windows.json manifest.
+* HDF5: one .h5 file with a table per window under /windows and a /_windows
+  manifest table (needs the PyTables package). Window tables are named so
+  PyTables accepts them as natural names (w_ prefix where needed); each one
+  keeps its window name in a window_name attribute.
+
+Both record each window's template range, first/last Index and row count,
+and keep the per-window statistics table (see sensor_stats) as _summary.
+WindowStoreFile reads either format through the pd.ExcelFile calls
+(sheet_names, parse, close) the Professional Plotting tab already uses, so
+Tab 3 plots straight from a store.
+"""
+import importlib.util
+import json
+import keyword
+import os
+import re
+
+import pandas as pd
+
+from sensor_io import pyarrow_available
+
+OUTPUT_FORMATS = ('xlsx', 'parquet', 'hdf5')
+OUTPUT_EXTENSIONS = {'xlsx': '.xlsx', 'parquet': '.parquet', 'hdf5': '.h5'}
+
+MANIFEST_FILE = 'windows.json'
+HDF5_MANIFEST_KEY = '_windows'
+SUMMARY_KEY = '_summary'
+HDF5_EXTENSIONS = ('.h5', '.hdf5')
+
+
+def tables_available():
+    """Return True if PyTables is installed for HDF5 window stores"""
+    return importlib.util.find_spec('tables') is not None
+
+
+def detect_output_format(path):
+    """Return 'parquet', 'hdf5' or 'xlsx' for an existing or planned output path"""
+    if os.path.isfile(os.path.join(path, MANIFEST_FILE)) or path.lower().endswith('.parquet'):
+        return 'parquet'
+    if os.path.splitext(path)[1].lower() in HDF5_EXTENSIONS:
+        return 'hdf5'
+    return 'xlsx'
+
+
+def store_path(path):
+    """Map a path picked in a file dialog (e.g. a store's windows.json) to the store itself"""
+    if os.path.basename(path) == MANIFEST_FILE:
+        return os.path.dirname(path)
+    return path
+
+
+def _safe_name(name):
+    """File/key friendly version of a window name"""
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', str(name)) or 'window'
+
+
+def _natural_name(name):
+    """HDF5 node name for a window: a Python identifier not starting with '_', as PyTables expects"""
+    key = re.sub(r'[^A-Za-z0-9_]', '_', str(name))
+    if not key.isidentifier() or keyword.iskeyword(key) or key.startswith('_'):
+        key = f"w_{key}"
+    return key
+
+
+def _window_metadata(name, rows, bounds):
+    first_index = rows['Index'].iloc[0].item() if len(rows) else None
+    last_index = rows['Index'].iloc[-1].item() if len(rows) else None
+    start_index, end_index = bounds if bounds is not None else (None, None)
+    return {'name': name, 'rows': len(rows), 'start': start_index, 'end': end_index,
+            'first_index': first_index, 'last_index': last_index}
+
+
+class _WindowStoreWriter:
+    """Manifest bookkeeping shared by the Parquet and HDF5 writers"""
+
+    def __init__(self, path, append=False):
+        self.filename = path
+        self.sheet_names = []
+        self._manifest = {}  # window name -> metadata dict (insertion order is store order)
+        self._open = {}  # window name -> format specific incremental writer
+        self._summary = None
+        self._closed = False
+        if append:
+            self._manifest = {entry['name']: entry for entry in self._read_manifest()}
+
+    def write_window(self, sheet_name, window_data, bounds=None):
+        """Write (or replace) one window"""
+        self._check_open()
+        self._write(sheet_name, window_data)
+        self._record(sheet_name, window_data, bounds, replace=True)
+
+    def append_rows(self, sheet_name, rows, bounds=None):
+        """Append rows to a window, creating (or replacing) it on first use"""
+        self._check_open()
+        first_rows = sheet_name not in self._open
+        if first_rows:
+            self._open[sheet_name] = self._start(sheet_name, rows)
+        self._append(self._open[sheet_name], sheet_name, rows)
+        self._record(sheet_name, rows, bounds, replace=first_rows)
+
+    def finish_sheet(self, sheet_name):
+        """Finish a window that will get no more rows"""
+        writer = self._open.pop(sheet_name, None)
+        if writer is not None:
+            self._finish(writer)
+
+    def remove_window(self, sheet_name):
+        """Delete a window from an appended store"""
+        self._check_open()
+        entry = self._manifest.pop(sheet_name, None)
+        if entry is not None:
+            self._remove(entry['key'])
+        if sheet_name in self.sheet_names:
+            self.sheet_names.remove(sheet_name)
+
+    def write_summary(self, summary):
+        """Store the per-window statistics table (written when the store is closed)"""
+        self._check_open()
+        self._summary = summary
+
+    def _record(self, sheet_name, rows, bounds, replace):
+        """Add or replace a window's manifest entry, or extend it with appended rows"""
+        if replace:
+            # Replacing keeps the window's key and its place in the store order
+            key = self._key(sheet_name)
+            self._manifest[sheet_name] = dict(_window_metadata(sheet_name, rows, bounds), key=key)
+            if sheet_name not in self.sheet_names:
+                self.sheet_names.append(sheet_name)
+            return
+
+        entry = self._manifest[sheet_name]
+        entry['rows'] += len(rows)
+        if len(rows):
+            entry['last_index'] = rows['Index'].iloc[-1].item()
+
+    def _key(self, sheet_name):
+        """Unique file name / HDF5 key for a window"""
+        existing = self._manifest.get(sheet_name)
+        if existing is not None:
+            return existing['key']
+        taken = {entry['key'] for entry in self._manifest.values()} | {SUMMARY_KEY}
+        base = self._key_base(sheet_name)
+        key, suffix = base, 2
+        while key in taken:
+            key, suffix = f"{base}_{suffix}", suffix + 1
+        return key
+
+    @staticmethod
+    def _key_base(sheet_name):
+        return _safe_name(sheet_name)
+
+    def _check_open(self):
+        if self._closed:
+            raise ValueError("Cannot write to a closed window store")
+
+    def close(self):
+        """Finish every open window and write the manifest"""
+        if self._closed:
+            return
+        self._closed = True
+        for sheet_name in list(self._open):
+            self.finish_sheet(sheet_name)
+        if self._summary is not None:
+            self._write_summary(self._summary)
+        self._write_manifest(list(self._manifest.values()))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+class ParquetWindowWriter(_WindowStoreWriter):
+    """One Parquet file per window in a folder, plus a windows.json manifest"""
+
+    def __init__(self, path, append=False):
+        if not pyarrow_available():
+            raise ImportError("Parquet output needs the pyarrow package (pip install pyarrow)")
+        os.makedirs(path, exist_ok=True)
+        super().__init__(path, append)
+        if not append:
+            # A fresh store replaces the windows of an earlier run; other files in the folder are left alone
+            for entry in self._read_manifest():
+                self._remove(entry['key'])
+            self._remove(SUMMARY_KEY)
+            manifest_path = os.path.join(path, MANIFEST_FILE)
+            if os.path.exists(manifest_path):
+                os.remove(manifest_path)
+
+    def _file(self, sheet_name):
+        return os.path.join(self.filename, f"{self._key(sheet_name)}.parquet")
+
+    def _write(self, sheet_name, window_data):
+        window_data.to_parquet(self._file(sheet_name), index=False)
+
+    def _start(self, sheet_name, rows):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        schema = pa.Schema.from_pandas(rows, preserve_index=False)
+        return pq.ParquetWriter(self._file(sheet_name), schema)
+
+    def _append(self, writer, sheet_name, rows):
+        import pyarrow as pa
+        writer.write_table(pa.Table.from_pandas(rows, schema=writer.schema, preserve_index=False))
+
+    def _finish(self, writer):
+        writer.close()
+
+    def _remove(self, key):
+        file_path = os.path.join(self.filename, f"{key}.parquet")
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+    def _write_summary(self, summary):
+        summary.to_parquet(os.path.join(self.filename, f"{SUMMARY_KEY}.parquet"), index=False)
+
+    def _read_manifest(self):
+        manifest_path = os.path.join(self.filename, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return []
+        with open(manifest_path) as f:
+            return json.load(f)['windows']
+
+    def _write_manifest(self, entries):
+        manifest_path = os.path.join(self.filename, MANIFEST_FILE)
+        temp_path = manifest_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump({'format': 'sensor-windows', 'version': 1, 'windows': entries}, f, indent=1)
+        # Replacing the manifest also bumps the folder mtime, which readers use to notice changes
+        os.replace(temp_path, manifest_path)
+
+
+class HDF5WindowWriter(_WindowStoreWriter):
+    """One table per window under /windows in an HDF5 file (requires PyTables)"""
+
+    def __init__(self, path, append=False):
+        if not tables_available():
+            raise ImportError("HDF5 output needs the PyTables package (pip install tables)")
+        self._store = pd.HDFStore(path, mode='a' if append else 'w', complevel=1, complib='blosc')
+        try:
+            super().__init__(path, append)
+        except Exception:
+            self._store.close()
+            raise
+
+    def close(self):
+        """Finish the store and close the HDF5 file, also when writing it fails"""
+        try:
+            super().close()
+        finally:
+            self._store.close()
+
+    @staticmethod
+    def _key_base(sheet_name):
+        # Window names like '1' or 'A-B' would raise NaturalNameWarning as node names
+        return _natural_name(sheet_name)
+
+    def _node(self, sheet_name):
+        return f"windows/{self._key(sheet_name)}"
+
+    def _write(self, sheet_name, window_data):
+        node = self._node(sheet_name)
+        self._store.put(node, window_data, format='table', index=False)
+        self._store.get_storer(node).attrs.window_name = sheet_name
+
+    def _start(self, sheet_name, rows):
+        node = self._node(sheet_name)
+        if node in self._store:
+            self._store.remove(node)
+        return node
+
+    def _append(self, node, sheet_name, rows):
+        self._store.append(node, rows, format='table', index=False)
+        self._store.get_storer(node).attrs.window_name = sheet_name
+
+    def _finish(self, node):
+        pass
+
+    def _remove(self, key):
+        if f"windows/{key}" in self._store:
+            self._store.remove(f"windows/{key}")
+
+    def _write_summary(self, summary):
+        self._store.put(SUMMARY_KEY, summary, format='table', index=False)
+
+    def _read_manifest(self):
+        if HDF5_MANIFEST_KEY not in self._store:
+            return []
+        return json.loads(self._store.get_storer(HDF5_MANIFEST_KEY).attrs.windows)
+
+    def _write_manifest(self, entries):
+        names = pd.DataFrame({'name': [entry['name'] for entry in entries]})
+        self._store.put(HDF5_MANIFEST_KEY, names, format='fixed')
+        self._store.get_storer(HDF5_MANIFEST_KEY).attrs.windows = json.dumps(entries)
+
+
+def open_store_writer(path, output_format, append=False):
+    """Return a Parquet or HDF5 window writer"""
+    if output_format == 'parquet':
+        return ParquetWindowWriter(path, append=append)
+    if output_format == 'hdf5':
+        return HDF5WindowWriter(path, append=append)
+    raise ValueError(f"Unknown window store format: {output_format}")
+
+
+class WindowStoreFile:
+    """Read a Parquet or HDF5 window store through the pd.ExcelFile calls Tab 3 uses"""
+
+    def __init__(self, path):
+        self.path = store_path(path)
+        self.format = detect_output_format(self.path)
+        self._store = None
+        if self.format == 'parquet':
+            with open(os.path.join(self.path, MANIFEST_FILE)) as f:
+                entries = json.load(f)['windows']
+        elif self.format == 'hdf5':
+            self._store = pd.HDFStore(self.path, mode='r')
+            try:
+                entries = json.loads(self._store.get_storer(HDF5_MANIFEST_KEY).attrs.windows)
+            except Exception:
+                self.close()
+                raise
+        else:
+            raise ValueError(f"Not a window store: {path}")
+        self.windows = {entry['name']: entry for entry in entries}
+
+    @property
+    def sheet_names(self):
+        return list(self.windows)
+
+    def parse(self, sheet_name):
+        """Return one window as a DataFrame"""
+        key = self.windows[sheet_name]['key']
+        if self.format == 'parquet':
+            return pd.read_parquet(os.path.join(self.path, f"{key}.parquet"))
+        return self._store.select(f"windows/{key}")
+
+    def read_summary(self):
+        """Return the per-window statistics table, or None if the store has none"""
+        if self.format == 'parquet':
+            summary_path = os.path.join(self.path, f"{SUMMARY_KEY}.parquet")
+            return pd.read_parquet(summary_path) if os.path.exists(summary_path) else None
+        return self._store.select(SUMMARY_KEY) if SUMMARY_KEY in self._store else None
+
+    def close(self):
+        if self._store is not None:
+            self._store.close()
+            self._store = None
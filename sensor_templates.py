@@ -0,0 +1,148 @@
+"""Template scanning for batch extraction.
+
+An Excel template only contributes one (start, end, points) triple per sheet,
+so reading every sheet into a DataFrame is wasted work. scan_excel_template
+opens the workbook once in openpyxl read-only mode and streams just the
+Index column of each sheet. Text templates hold one "start,end" window per
+line and are parsed by parse_text_template.
+
+Both return (sheet_name, start_index, end_index, data_points) window tuples,
+the format of SensorDataAnalyzer.template_sheets. A window an extraction
+split over continuation sheets (Window_3, Window_3_p2, ...) is scanned as one.
+"""
+import os
+
+from openpyxl import load_workbook
+
+from sensor_export import group_sheet_parts
+from sensor_stats import SUMMARY_SHEET
+
+
+TEMPLATE_TYPES = ('excel', 'text')
+
+
+def template_signature(template_file):
+    """Identify a template file version by path, size and mtime"""
+    stat = os.stat(template_file)
+    return os.path.abspath(template_file), stat.st_size, stat.st_mtime_ns
+
+
+def _scan_index_column(worksheet):
+    """Return (min, max, count) of the Index column, or None if the sheet has none"""
+    header = next(worksheet.iter_rows(min_row=1, max_row=1, values_only=True), None)
+    if not header or 'Index' not in header:
+        return None
+    column = header.index('Index') + 1
+
+    start_index = None
+    end_index = None
+    data_points = 0
+    for (value,) in worksheet.iter_rows(min_row=2, min_col=column, max_col=column, values_only=True):
+        if value is None:
+            continue
+        if start_index is None or value < start_index:
+            start_index = value
+        if end_index is None or value > end_index:
+            end_index = value
+        data_points += 1
+
+    if data_points == 0:
+        return None
+    return start_index, end_index, data_points
+
+
+def scan_excel_template(template_file):
+    """Scan an Excel template without loading its sheets into DataFrames.
+
+    Returns (sheet_names, results) where results holds one
+    (sheet_name, window, error) tuple per scanned sheet: window is the
+    (sheet_name, start_index, end_index, data_points) tuple used for
+    template_sheets, or None with error describing why the sheet was skipped.
+    The default empty 'Sheet' is skipped when other sheets exist, and so is
+    the Summary sheet of an extraction output used as a template.
+    """
+    workbook = load_workbook(template_file, read_only=True, data_only=True)
+    try:
+        sheet_names = workbook.sheetnames
+        results = []
+        for sheet_name, parts in group_sheet_parts(sheet_names).items():
+            # Skip default empty sheets and extraction summaries
+            if (sheet_name == 'Sheet' and len(sheet_names) > 1) or sheet_name == SUMMARY_SHEET:
+                continue
+
+            try:
+                scanned = [result for result in (_scan_index_column(workbook[part]) for part in parts)
+                           if result is not None]
+                if not scanned:
+                    results.append((sheet_name, None, "No valid data (missing 'Index' column or empty)"))
+                else:
+                    start_index = min(result[0] for result in scanned)
+                    end_index = max(result[1] for result in scanned)
+                    data_points = sum(result[2] for result in scanned)
+                    results.append((sheet_name, (sheet_name, int(start_index), int(end_index), data_points), None))
+            except Exception as e:
+                results.append((sheet_name, None, f"Error reading: {str(e)}"))
+        return sheet_names, results
+    finally:
+        workbook.close()
+
+
+def parse_text_template(template_file):
+    """Parse a text template with one "start,end" window per line.
+
+    Returns (line_count, results) where results holds one
+    (label, window, error) tuple per non-empty line: label is the window's
+    sheet name (Window_<line number>) or "Line <n>" for a rejected line.
+    """
+    with open(template_file, 'r') as f:
+        lines = f.readlines()
+
+    results = []
+    for i, line in enumerate(lines):
+        line = line.strip()
+        if not line:  # Skip empty lines
+            continue
+
+        # Parse "start,end" format
+        if ',' not in line:
+            results.append((f"Line {i+1}", None, f"Missing comma - {line}"))
+            continue
+
+        parts = line.split(',')
+        try:
+            start_index = int(parts[0].strip())
+            end_index = int(parts[1].strip())
+        except ValueError:
+            results.append((f"Line {i+1}", None, f"Invalid numbers - {line}"))
+            continue
+        if start_index > end_index:
+            results.append((f"Line {i+1}", None, f"Start after end - {line}"))
+            continue
+
+        sheet_name = f"Window_{i+1}"
+        results.append((sheet_name, (sheet_name, start_index, end_index, "Will be extracted"), None))
+
+    return len(lines), results
+
+
+def infer_template_type(template_file):
+    """Excel workbooks by extension, everything else is a text template"""
+    return 'excel' if os.path.splitext(template_file)[1].lower() in ('.xlsx', '.xlsm') else 'text'
+
+
+def scan_template(template_file, template_type=None):
+    """Return the (label, window, error) results of an Excel or text template"""
+    template_type = template_type or infer_template_type(template_file)
+    if template_type not in TEMPLATE_TYPES:
+        raise ValueError(f"Unknown template type: {template_type}")
+
+    if template_type == 'excel':
+        _, results = scan_excel_template(template_file)
+    else:
+        _, results = parse_text_template(template_file)
+    return results
+
+
+def load_template(template_file, template_type=None):
+    """Return the list of window tuples defined by a template file"""
+    return [window for _, window, _ in scan_template(template_file, template_type) if window is not None]
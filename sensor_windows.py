@@ -0,0 +1,216 @@
+"""Window lookup helpers for the Sensor Data Extractor.
+
+Sensor recordings are almost always written with a monotonically increasing
+Index column. For those, an inclusive (start, end) Index range maps to one
+contiguous block of rows that can be found with two binary searches instead
+of two boolean masks over the whole series. Unsorted recordings get the same
+treatment through a sorted permutation of the Index column built once.
+
+Templates with thousands of short, overlapping windows (one per loading
+cycle, say) are indexed by WindowRouter, an interval tree over the template
+ranges that answers "which windows cover Index i" and "which windows overlap
+this chunk" in O(log W + k).
+"""
+import numpy as np
+
+
+class WindowIndex:
+    """Resolve inclusive (start, end) Index ranges to rows of a sensor DataFrame.
+
+    If the Index column is sorted (or enforce_sorted=True sorts it once), each
+    window is located with np.searchsorted in O(log N) and returned as a
+    positional slice that shares memory with the source data. For unsorted
+    data a stable argsort of the Index column is built on the first lookup;
+    each window is then two binary searches on the sorted copy plus a gather
+    of its rows (in their recorded order), instead of a full boolean mask
+    per window.
+
+    A known sortedness can be passed in data.attrs['index_sorted'] (the parse
+    cache records it), which skips the O(N) scan and keeps memory-mapped
+    columns from being paged in just to check the order.
+    """
+
+    def __init__(self, data, column='Index', enforce_sorted=False):
+        self.column = column
+        index_sorted = data.attrs.get('index_sorted')
+        if index_sorted is None:
+            index_sorted = data[column].is_monotonic_increasing
+        self.is_sorted = bool(index_sorted)
+
+        if not self.is_sorted and enforce_sorted:
+            # Stable sort keeps the recorded order of duplicate Index values
+            data = data.sort_values(column, kind='stable').reset_index(drop=True)
+            self.is_sorted = True
+
+        self.data = data
+        self._index_values = data[column].to_numpy()
+        self._order = None  # argsort of an unsorted Index column, built on first use
+        self._sorted_values = None
+
+    def __len__(self):
+        return len(self.data)
+
+    def _sorted_view(self):
+        """Return the Index values in ascending order (the column itself when it is sorted)"""
+        if self.is_sorted:
+            return self._index_values
+        if self._order is None:
+            self._order = np.argsort(self._index_values, kind='stable')
+            self._sorted_values = self._index_values[self._order]
+        return self._sorted_values
+
+    def bounds(self, start, end):
+        """Return the (first, stop) row positions of a window on sorted data"""
+        if not self.is_sorted:
+            raise ValueError("Row bounds are only available for sorted Index data")
+        first = int(np.searchsorted(self._index_values, start, side='left'))
+        stop = int(np.searchsorted(self._index_values, end, side='right'))
+        return first, max(first, stop)
+
+    def bounds_many(self, starts, ends):
+        """Vectorized bounds: (firsts, stops) arrays for many windows at once.
+
+        On unsorted data the positions refer to the sorted permutation, see
+        rows_between().
+        """
+        values = self._sorted_view()
+        firsts = np.searchsorted(values, starts, side='left')
+        stops = np.searchsorted(values, ends, side='right')
+        return firsts, np.maximum(firsts, stops)
+
+    def sorted_column(self, column):
+        """Values of a column in ascending Index order (the positions bounds_many() returns)"""
+        if column == self.column:
+            return self._sorted_view()
+        values = self.data[column].to_numpy()
+        if self.is_sorted:
+            return values
+        self._sorted_view()
+        return values[self._order]
+
+    def sorted_take(self, column, take):
+        """Values of a column at sorted-order positions take (a slice or an array of positions)"""
+        values = self.data[column].to_numpy()
+        if self.is_sorted:
+            return values[take]
+        self._sorted_view()
+        return values[self._order[take]]
+
+    def rows_between(self, first, stop):
+        """Row positions of sorted-order positions first:stop, in recorded order"""
+        if self.is_sorted:
+            return np.arange(first, stop)
+        self._sorted_view()
+        return np.sort(self._order[first:stop])
+
+    def window(self, start, end):
+        """Return the rows with start <= Index <= end"""
+        if self.is_sorted:
+            first, stop = self.bounds(start, end)
+            return self.data.iloc[first:stop]
+
+        values = self._sorted_view()
+        first = int(np.searchsorted(values, start, side='left'))
+        stop = int(np.searchsorted(values, end, side='right'))
+        return self.data.iloc[self.rows_between(first, max(first, stop))]
+
+    def count(self, start, end):
+        """Return the number of rows with start <= Index <= end"""
+        values = self._sorted_view()
+        first = int(np.searchsorted(values, start, side='left'))
+        stop = int(np.searchsorted(values, end, side='right'))
+        return max(stop - first, 0)
+
+
+class _IntervalNode:
+    """One node of a centered interval tree: the windows that contain its center"""
+
+    __slots__ = ('center', 'start_order', 'starts', 'end_order', 'ends', 'left', 'right')
+
+    def __init__(self, center, positions, starts, ends):
+        self.center = center
+        by_start = positions[np.argsort(starts[positions], kind='stable')]
+        by_end = positions[np.argsort(ends[positions], kind='stable')]
+        self.start_order, self.starts = by_start, starts[by_start]
+        self.end_order, self.ends = by_end, ends[by_end]
+        self.left = None
+        self.right = None
+
+
+class WindowRouter:
+    """Interval tree over the inclusive (start, end) ranges of template windows.
+
+    Each node holds the windows containing its center point, sorted by start
+    and by end, so a query only binary-searches the nodes on one root-to-leaf
+    path and touches no window it does not return: O(log W + k) for k hits.
+    Used by streaming extraction to route each chunk of a data file to the
+    windows it touches, and for "which windows cover Index i" lookups.
+    Raises ValueError for a window whose start is after its end.
+    """
+
+    def __init__(self, windows):
+        self.windows = list(windows)
+        self._starts = np.array([window[1] for window in self.windows])
+        self._ends = np.array([window[2] for window in self.windows])
+        # An inverted window contains no center point, so _build would never place it
+        inverted = np.flatnonzero(~(self._starts <= self._ends))
+        if len(inverted):
+            sheet_name, start_index, end_index = self.windows[inverted[0]][:3]
+            raise ValueError(f"Window {sheet_name} starts after it ends ({start_index} > {end_index})")
+        self._end_order = np.argsort(self._ends, kind='stable')
+        self._sorted_ends = self._ends[self._end_order]
+        self._root = self._build(np.arange(len(self.windows)))
+
+    def _build(self, positions):
+        if len(positions) == 0:
+            return None
+        # The median endpoint splits the remaining windows roughly in half
+        endpoints = np.concatenate([self._starts[positions], self._ends[positions]])
+        center = np.partition(endpoints, len(endpoints) // 2)[len(endpoints) // 2]
+
+        starts = self._starts[positions]
+        ends = self._ends[positions]
+        node = _IntervalNode(center, positions[(starts <= center) & (ends >= center)], self._starts, self._ends)
+        node.left = self._build(positions[ends < center])
+        node.right = self._build(positions[starts > center])
+        return node
+
+    def __len__(self):
+        return len(self.windows)
+
+    def overlapping(self, low, high):
+        """Return the positions (in template order) of windows with start <= high and end >= low"""
+        hits = []
+        pending = [self._root]
+        while pending:
+            node = pending.pop()
+            if node is None:
+                continue
+            if high < node.center:
+                # Every window here ends at or after the center, so only the start matters
+                hits.append(node.start_order[:np.searchsorted(node.starts, high, side='right')])
+                pending.append(node.left)
+            elif low > node.center:
+                # Every window here starts at or before the center, so only the end matters
+                hits.append(node.end_order[np.searchsorted(node.ends, low, side='left'):])
+                pending.append(node.right)
+            else:
+                hits.append(node.start_order)
+                pending.append(node.left)
+                pending.append(node.right)
+
+        if not hits:
+            return np.array([], dtype=np.intp)
+        return np.sort(np.concatenate(hits))
+
+    def covering(self, index_value):
+        """Return the positions (in template order) of the windows that contain one Index value"""
+        return self.overlapping(index_value, index_value)
+
+    def ended_before(self, index_value):
+        """Return the positions of windows whose end is below index_value, ordered by end.
+
+        On a rising Index each call returns the previous result plus the
+        windows closed since, so callers can resume from the old length.
+        """
+        return self._end_order[:np.searchsorted(self._sorted_ends, index_value, side='left')]
@@ -0,0 +1,96 @@
+"""Shared workbook access for the Professional Plotting tab.
+
+pd.read_excel(path, sheet_name=...) re-opens the .xlsx zip and re-parses the
+workbook metadata (including shared strings) on every call. WorkbookSheetCache
+keeps one pd.ExcelFile handle per workbook and an LRU cache of parsed sheets,
+both keyed by the file's modification time so an updated workbook is picked
+up automatically. Parquet and HDF5 window stores are opened as a
+WindowStoreFile, which answers the same calls, so every reader of the cache
+works on all three output formats.
+
+Windows split over continuation sheets (Window_3, Window_3_p2, ...) because
+they exceed Excel's row limit are listed once and read back stitched together.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from sensor_export import group_sheet_parts
+from sensor_store import WindowStoreFile, detect_output_format, store_path
+
+# Parsed rows kept in memory across all cached sheets
+DEFAULT_MAX_CACHED_ROWS = 20_000_000
+
+
+class WorkbookSheetCache:
+    """One ExcelFile handle per workbook plus an LRU cache of parsed sheets"""
+
+    def __init__(self, max_rows=DEFAULT_MAX_CACHED_ROWS):
+        self.max_rows = max_rows
+        self._handles = {}  # path -> (mtime_ns, pd.ExcelFile, {window: [sheet parts]})
+        self._sheets = OrderedDict()  # (path, mtime_ns, sheet_name) -> DataFrame
+        self._cached_rows = 0
+        # Tab 3 previews on the Tk thread while a plot job reads on its worker thread
+        self._lock = threading.RLock()
+
+    def _handle(self, excel_path):
+        """Return (path, mtime_ns, ExcelFile, sheet parts) for a workbook, reopening it if the file changed"""
+        path = os.path.abspath(store_path(excel_path))
+        mtime_ns = os.stat(path).st_mtime_ns
+        cached = self._handles.get(path)
+        if cached is not None and cached[0] == mtime_ns:
+            return (path,) + cached
+
+        if cached is not None:
+            self._forget(path)
+        if detect_output_format(path) == 'xlsx':
+            excel_file = pd.ExcelFile(path)
+        else:
+            excel_file = WindowStoreFile(path)
+        sheet_parts = group_sheet_parts(excel_file.sheet_names)
+        self._handles[path] = (mtime_ns, excel_file, sheet_parts)
+        return path, mtime_ns, excel_file, sheet_parts
+
+    def _forget(self, path):
+        """Drop the handle and every cached sheet of one workbook"""
+        _, excel_file, _ = self._handles.pop(path)
+        excel_file.close()
+        for key in [key for key in self._sheets if key[0] == path]:
+            self._cached_rows -= len(self._sheets.pop(key))
+
+    def sheet_names(self, excel_path):
+        """Return the window sheet names of a workbook (continuation sheets are folded into their window)"""
+        with self._lock:
+            return list(self._handle(excel_path)[3])
+
+    def read(self, excel_path, sheet_name):
+        """Return one parsed sheet, from the cache when possible, with any continuation sheets appended"""
+        with self._lock:
+            path, mtime_ns, excel_file, sheet_parts = self._handle(excel_path)
+            key = (path, mtime_ns, sheet_name)
+            sheet_data = self._sheets.get(key)
+            if sheet_data is not None:
+                self._sheets.move_to_end(key)
+                return sheet_data
+
+            parts = sheet_parts.get(sheet_name, [sheet_name])
+            if len(parts) == 1:
+                sheet_data = excel_file.parse(sheet_name=sheet_name)
+            else:
+                sheet_data = pd.concat([excel_file.parse(sheet_name=part) for part in parts], ignore_index=True)
+            if len(sheet_data) <= self.max_rows:
+                self._sheets[key] = sheet_data
+                self._cached_rows += len(sheet_data)
+                # Evict least recently used sheets beyond the row budget
+                while self._cached_rows > self.max_rows:
+                    _, evicted = self._sheets.popitem(last=False)
+                    self._cached_rows -= len(evicted)
+            return sheet_data
+
+    def clear(self):
+        """Close every workbook handle and drop all cached sheets"""
+        with self._lock:
+            for path in list(self._handles):
+                self._forget(path)
@@ -0,0 +1,17 @@
+"""Shared fixtures for the Sensor Data Extractor tests."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def write_sensor_file(tmp_path):
+    """Write semicolon sensor lines to a file in tmp_path and return its path"""
+    def write(lines, name='sensor.txt'):
+        path = tmp_path / name
+        path.write_text(''.join(f"{line}\n" for line in lines))
+        return str(path)
+    return write
@@ -0,0 +1,38 @@
+import gzip
+import os
+
+import pandas as pd
+import pytest
+
+from sensor_batch import batch_output_path, extract_files_parallel
+
+
+def test_same_stem_files_get_their_own_outputs(tmp_path):
+    lines = ''.join(f"{i};{i * 0.5}\n" for i in range(50))
+    data_files = [str(tmp_path / 'rec.txt'), str(tmp_path / 'rec.csv')]
+    for data_file in data_files:
+        with open(data_file, 'w') as f:
+            f.write(lines)
+    with gzip.open(tmp_path / 'rec.txt.gz', 'wt') as f:
+        f.write(lines.replace(';', ';1'))
+    data_files.append(str(tmp_path / 'rec.txt.gz'))
+
+    output_folder = str(tmp_path / 'out')
+    summary = extract_files_parallel(data_files, [('A', 0, 9, '')], output_folder, workers=2,
+                                     loader_settings={'use_parse_cache': False})
+    assert summary['successful'] == 3
+    assert sorted(os.listdir(output_folder)) == ['rec.csv_windows.xlsx', 'rec.txt.gz_windows.xlsx',
+                                                 'rec.txt_windows.xlsx']
+    window = pd.read_excel(batch_output_path(data_files[2], output_folder), sheet_name='A')
+    assert window['Value'].tolist()[:2] == [10.0, 10.5]
+
+
+def test_same_file_name_in_two_folders_is_refused(tmp_path):
+    data_files = []
+    for folder in ('day1', 'day2'):
+        os.makedirs(tmp_path / folder)
+        (tmp_path / folder / 'rec.txt').write_text("0;1\n")
+        data_files.append(str(tmp_path / folder / 'rec.txt'))
+    with pytest.raises(ValueError, match="rec.txt_windows.xlsx"):
+        extract_files_parallel(data_files, [('A', 0, 9, '')], str(tmp_path / 'out'), workers=1)
+    assert not os.path.exists(tmp_path / 'out')
@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import sensor_export
+from sensor_export import (EXCEL_MAX_DATA_ROWS, BatchExcelWriter, continuation_sheet_name, extract_windows,
+                           extract_windows_streaming, group_sheet_parts)
+from sensor_io import load_sensor_file
+from sensor_stats import SUMMARY_SHEET
+from sensor_store import WindowStoreFile
+
+MODES = ['standard', 'streaming']
+
+
+def sensor_data(rows):
+    return pd.DataFrame({'Index': np.arange(rows), 'Value': np.arange(rows) * 0.25})
+
+
+def read_workbook(output_path):
+    return pd.read_excel(output_path, sheet_name=None)
+
+
+def test_sheet_limit_is_excel_rows_below_the_header():
+    assert EXCEL_MAX_DATA_ROWS == 1_048_576 - 1
+    assert BatchExcelWriter.__init__.__defaults__[-1] == EXCEL_MAX_DATA_ROWS
+
+
+def test_continuation_sheet_names():
+    assert continuation_sheet_name('A', 1) == 'A'
+    assert continuation_sheet_name('A', 2) == 'A_p2'
+    groups = group_sheet_parts(['A', 'A_p2', 'A_p3', 'B_p2', 'C', SUMMARY_SHEET])
+    # B_p2 has no B, so it is a window of its own
+    assert groups == {'A': ['A', 'A_p2', 'A_p3'], 'B_p2': ['B_p2'], 'C': ['C'], SUMMARY_SHEET: [SUMMARY_SHEET]}
+
+
+@pytest.mark.parametrize('mode', MODES)
+@pytest.mark.parametrize('rows, sheets', [(3, ['A']), (4, ['A', 'A_p2']), (7, ['A', 'A_p2', 'A_p3'])])
+def test_long_window_continues_on_p2_sheets(tmp_path, mode, rows, sheets):
+    output_path = str(tmp_path / 'out.xlsx')
+    data = sensor_data(rows)
+    with BatchExcelWriter(output_path, mode=mode, max_sheet_rows=3) as writer:
+        if mode == 'streaming':
+            # Appended in uneven pieces that straddle the sheet boundaries
+            for first, stop in [(0, 2), (2, 6), (6, rows)]:
+                writer.append_rows('A', data.iloc[first:stop])
+            writer.finish_sheet('A')
+        else:
+            writer.write_window('A', data)
+        writer.write_window('B', data.iloc[:1])
+    assert writer.sheet_names == sheets + ['B']
+
+    workbook = read_workbook(output_path)
+    assert list(workbook) == sheets + ['B']
+    assert all(len(workbook[sheet]) <= 3 for sheet in sheets)
+    pd.testing.assert_frame_equal(pd.concat([workbook[sheet] for sheet in sheets], ignore_index=True), data)
+
+
+def test_standard_append_replaces_window_and_drops_stale_parts(tmp_path):
+    output_path = str(tmp_path / 'out.xlsx')
+    with BatchExcelWriter(output_path, max_sheet_rows=3) as writer:
+        writer.write_window('A', sensor_data(7))
+        writer.write_window('B', sensor_data(2))
+    with BatchExcelWriter(output_path, append=True, max_sheet_rows=3) as writer:
+        writer.write_window('A', sensor_data(4))
+        writer.remove_window('B')
+
+    workbook = read_workbook(output_path)
+    assert list(workbook) == ['A', 'A_p2']
+    pd.testing.assert_frame_equal(pd.concat(workbook.values(), ignore_index=True), sensor_data(4))
+
+
+def test_streaming_writer_cannot_append_to_a_workbook(tmp_path):
+    with pytest.raises(ValueError):
+        BatchExcelWriter(str(tmp_path / 'out.xlsx'), mode='streaming', append=True)
+
+
+WINDOWS = [('A', 10, 19, ''), ('Empty', 500, 600, ''), ('B', 15, 40, ''), ('C', 90, 99, '')]
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_extract_windows(tmp_path, mode):
+    output_path = str(tmp_path / 'out.xlsx')
+    data = sensor_data(100)
+    summary = extract_windows(data, WINDOWS, output_path, mode=mode)
+    assert (summary['successful'], summary['failed'], summary['rows']) == (3, 1, 46)
+    assert summary['failures'][0][0] == 'Empty'
+
+    workbook = read_workbook(output_path)
+    assert list(workbook) == ['A', 'B', 'C', SUMMARY_SHEET]
+    pd.testing.assert_frame_equal(workbook['B'], data.iloc[15:41].reset_index(drop=True))
+    assert workbook[SUMMARY_SHEET]['Window'].tolist() == ['A', 'B', 'C']
+    assert workbook[SUMMARY_SHEET]['Rows'].tolist() == [10, 26, 10]
+
+
+def test_streaming_extraction_matches_in_memory_extraction(write_sensor_file, tmp_path):
+    path = write_sensor_file([f"{i};{i * 0.25}" for i in range(100)])
+    summary = extract_windows_streaming(path, WINDOWS, str(tmp_path / 'streamed.xlsx'), chunksize=7)
+    extract_windows(load_sensor_file(path), WINDOWS, str(tmp_path / 'loaded.xlsx'))
+    assert (summary['successful'], summary['failed'], summary['rows']) == (3, 1, 46)
+
+    streamed = read_workbook(str(tmp_path / 'streamed.xlsx'))
+    loaded = read_workbook(str(tmp_path / 'loaded.xlsx'))
+    assert sorted(streamed) == sorted(loaded)
+    for sheet in loaded:
+        pd.testing.assert_frame_equal(streamed[sheet], loaded[sheet], check_exact=False, rtol=1e-12)
+
+
+def test_streaming_fractional_index_restarts_as_float(write_sensor_file, tmp_path):
+    path = write_sensor_file([f"{i / 2};{i}" for i in range(20)])
+    summary = extract_windows_streaming(path, [('A', 1, 3, '')], str(tmp_path / 'out.xlsx'), chunksize=4)
+    assert summary['successful'] == 1
+    window = read_workbook(str(tmp_path / 'out.xlsx'))['A']
+    assert window['Index'].tolist() == [1.0, 1.5, 2.0, 2.5, 3.0]
+
+
+def test_streaming_value_error_is_not_retried(write_sensor_file, tmp_path, monkeypatch):
+    path = write_sensor_file(['0;1', '1;2', '2;not a number'])
+    calls = []
+    stream_windows = sensor_export._stream_windows
+
+    def counting(*args):
+        calls.append(args[4])
+        return stream_windows(*args)
+
+    monkeypatch.setattr(sensor_export, '_stream_windows', counting)
+    with pytest.raises(ValueError, match="not a number"):
+        extract_windows_streaming(path, [('A', 0, 2, '')], str(tmp_path / 'out.xlsx'))
+    assert calls == ['int64']
+
+
+def test_streaming_progress_on_unsorted_data(write_sensor_file, tmp_path):
+    pytest.importorskip('pyarrow')
+    # Sorted in reverse, so no window is finished before the last chunk; large enough for several parser reads
+    path = write_sensor_file([f"{i};{i}" for i in reversed(range(200_000))])
+    windows = [(f"W{i}", i * 20_000, i * 20_000 + 19_999, '') for i in range(10)]
+    reported = []
+    summary = extract_windows_streaming(path, windows, str(tmp_path / 'out.parquet'), chunksize=10_000,
+                                        progress=lambda done, rows, message: reported.append(done))
+    assert summary['successful'] == 10
+    assert reported == sorted(reported)
+    assert 0 < reported[len(reported) // 2] < len(windows)
+    assert reported[-1] == len(windows)
+
+
+@pytest.mark.parametrize('extension', ['xlsx', 'parquet'])
+def test_streaming_index_stepping_back_keeps_each_window_on_one_sheet(write_sensor_file, tmp_path, extension):
+    if extension == 'parquet':
+        pytest.importorskip('pyarrow')
+    # The second pass over 0..29 arrives after W1 and W2 would have been finished
+    path = write_sensor_file([f"{i};{i}" for i in list(range(30)) * 2])
+    output_path = str(tmp_path / f"out.{extension}")
+    windows = [('W1', 0, 4, ''), ('W2', 5, 9, '')]
+    summary = extract_windows_streaming(path, windows, output_path, chunksize=10)
+    assert (summary['successful'], summary['rows']) == (2, 20)
+
+    if extension == 'xlsx':
+        sheets = read_workbook(output_path)
+        assert list(sheets) == ['W1', 'W2', SUMMARY_SHEET]
+    else:
+        store = WindowStoreFile(output_path)
+        sheets = {name: store.parse(name) for name in store.sheet_names}
+        store.close()
+        assert list(sheets) == ['W1', 'W2']
+    assert sheets['W1']['Index'].tolist() == [0, 1, 2, 3, 4] * 2
@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+import sensor_follow
+from sensor_follow import LiveWindowExtractor, SensorFileFollower
+from sensor_io import pyarrow_available
+from sensor_stats import SUMMARY_SHEET
+from sensor_windows import WindowIndex
+
+
+@pytest.mark.parametrize('pyarrow_min_bytes', [sensor_follow.PYARROW_MIN_BYTES, 1])
+def test_fractional_index_is_kept_whatever_the_poll_size(write_sensor_file, monkeypatch, pyarrow_min_bytes):
+    if pyarrow_min_bytes == 1 and not pyarrow_available():
+        pytest.skip("pyarrow is not installed")
+    monkeypatch.setattr(sensor_follow, 'PYARROW_MIN_BYTES', pyarrow_min_bytes)
+    path = write_sensor_file(['0;1', '1;2'])
+    follower = SensorFileFollower(path)
+    assert follower.poll() == 2
+
+    with open(path, 'a') as f:
+        f.write('1.5;3\n2.5;4\n3;5')
+    assert follower.poll() == 2
+    data = follower.data()
+    assert data['Index'].tolist() == [0.0, 1.0, 1.5, 2.5]
+    assert data['Index'].dtype == 'float64'
+    assert follower.last_index == 2.5
+
+
+def test_live_window_closes_when_the_index_reaches_its_end(write_sensor_file, tmp_path):
+    path = write_sensor_file([f"{i};{i}" for i in range(6)])
+    follower = SensorFileFollower(path)
+    follower.poll()
+    extractor = LiveWindowExtractor([('A', 0, 5, ''), ('B', 3, 6, '')], str(tmp_path / 'out.xlsx'))
+    # The last Index read is 5, exactly the end of A
+    assert extractor.update(WindowIndex(follower.data()), follower.last_index) == ['A']
+    assert not extractor.finished
+
+    with open(path, 'a') as f:
+        f.write('6;6\n')
+    follower.poll()
+    assert extractor.update(WindowIndex(follower.data()), follower.last_index) == ['B']
+    assert extractor.finished
+    sheets = pd.read_excel(str(tmp_path / 'out.xlsx'), sheet_name=None)
+    assert sheets['A']['Index'].tolist() == [0, 1, 2, 3, 4, 5]
+    assert sheets['B']['Index'].tolist() == [3, 4, 5, 6]
+
+
+def test_live_excel_windows_are_written_in_batches(write_sensor_file, tmp_path):
+    path = write_sensor_file([f"{i};{i}" for i in range(30)])
+    follower = SensorFileFollower(path)
+    follower.poll()
+    output_path = str(tmp_path / 'out.xlsx')
+    extractor = LiveWindowExtractor([('A', 0, 9, ''), ('B', 10, 19, ''), ('C', 20, 29, ''), ('D', 30, 39, '')],
+                                    output_path, flush_seconds=3600)
+    data_index = WindowIndex(follower.data())
+    # The first completed windows are written at once, later ones wait for the next flush
+    assert extractor.update(data_index, 9) == ['A']
+    assert extractor.update(data_index, 19) == []
+    assert extractor.update(data_index, 29) == []
+    assert extractor.waiting == 2 and not extractor.finished
+    assert list(pd.read_excel(output_path, sheet_name=None)) == ['A', SUMMARY_SHEET]
+
+    assert extractor.flush() == ['B', 'C']
+    assert extractor.waiting == 0
+    assert list(pd.read_excel(output_path, sheet_name=None)) == ['A', 'B', 'C', SUMMARY_SHEET]
+
+    # The last window is written as soon as it completes
+    with open(path, 'a') as f:
+        f.write(''.join(f"{i};{i}\n" for i in range(30, 40)))
+    follower.poll()
+    assert extractor.update(WindowIndex(follower.data()), follower.last_index) == ['D']
+    assert extractor.finished
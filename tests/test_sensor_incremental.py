@@ -0,0 +1,121 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sensor_incremental import extract_windows_incremental
+from sensor_io import load_sensor_file, pyarrow_available
+from sensor_stats import SUMMARY_SHEET
+from sensor_store import WindowStoreFile
+
+FORMATS = ['xlsx', pytest.param('parquet', marks=pytest.mark.skipif(not pyarrow_available(), reason="needs pyarrow"))]
+
+
+@pytest.fixture
+def data_file(write_sensor_file):
+    # Tiny values with many significant digits, which a rounded manifest would change
+    values = np.random.default_rng(0).normal(0, 1e-8, 200)
+    return write_sensor_file([f"{i};{float(value)!r}" for i, value in enumerate(values)])
+
+
+@pytest.fixture(params=FORMATS)
+def output_path(request, tmp_path):
+    return str(tmp_path / f"out.{request.param}")
+
+
+class Loader:
+    """load_data callback that counts how often the data file is loaded"""
+
+    def __init__(self, data_file):
+        self.data_file = data_file
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return load_sensor_file(self.data_file)
+
+
+def run(data_file, windows, output_path, loader=None):
+    return extract_windows_incremental(data_file, windows, output_path, loader or Loader(data_file))
+
+
+def read_output(output_path):
+    """(window name -> rows, Summary table) of a workbook or a Parquet store"""
+    if output_path.endswith('.xlsx'):
+        sheets = pd.read_excel(output_path, sheet_name=None)
+        return {name: rows for name, rows in sheets.items() if name != SUMMARY_SHEET}, sheets[SUMMARY_SHEET]
+    store = WindowStoreFile(output_path)
+    try:
+        return {name: store.parse(name) for name in store.sheet_names}, store.read_summary()
+    finally:
+        store.close()
+
+
+def test_edit_rerun_delete_cycle(data_file, output_path):
+    data = load_sensor_file(data_file)
+    windows = [('A', 0, 49, ''), ('B', 50, 99, ''), ('C', 100, 149, '')]
+    summary = run(data_file, windows, output_path)
+    assert summary['full_reason'] == "no extraction manifest"
+    assert (summary['successful'], summary['rows']) == (3, 150)
+
+    # Nothing changed: the data file is not even loaded
+    loader = Loader(data_file)
+    summary = run(data_file, windows, output_path, loader)
+    assert (summary['full_reason'], summary['unchanged'], summary['rows'], loader.calls) == (None, 3, 0, 0)
+
+    # Move B and add D: only those two are written
+    windows = [('A', 0, 49, ''), ('B', 60, 120, ''), ('C', 100, 149, ''), ('D', 180, 250, '')]
+    loader = Loader(data_file)
+    summary = run(data_file, windows, output_path, loader)
+    assert (summary['full_reason'], summary['unchanged'], summary['successful'], loader.calls) == (None, 2, 4, 1)
+    assert summary['rows'] == 61 + 20
+    sheets, table = read_output(output_path)
+    assert sorted(sheets) == ['A', 'B', 'C', 'D']
+    pd.testing.assert_frame_equal(sheets['B'], data.iloc[60:121].reset_index(drop=True))
+    assert table['Window'].tolist() == ['A', 'B', 'C', 'D']
+    assert table['Rows'].tolist() == [50, 61, 50, 20]
+
+    # Delete C and move D past the end of the data
+    windows = [('A', 0, 49, ''), ('B', 60, 120, ''), ('D', 300, 400, '')]
+    summary = run(data_file, windows, output_path)
+    assert (summary['removed'], summary['unchanged'], summary['failed']) == (1, 2, 1)
+    sheets, table = read_output(output_path)
+    assert sorted(sheets) == ['A', 'B']
+    assert table['Window'].tolist() == ['A', 'B']
+
+
+def test_changed_data_file_forces_a_full_run(data_file, output_path):
+    windows = [('A', 0, 49, '')]
+    run(data_file, windows, output_path)
+    with open(data_file, 'a') as f:
+        f.write("200;1.0\n")
+    summary = run(data_file, windows, output_path)
+    assert summary['full_reason'] == "data file changed"
+    assert summary['unchanged'] == 0 and summary['successful'] == 1
+
+
+def test_output_modified_outside_forces_a_full_run(data_file, tmp_path):
+    output_path = str(tmp_path / 'out.xlsx')
+    windows = [('A', 0, 49, '')]
+    run(data_file, windows, output_path)
+    pd.DataFrame({'x': [1]}).to_excel(output_path, index=False)
+    os.utime(output_path, ns=(0, 0))
+    summary = run(data_file, windows, output_path)
+    assert summary['full_reason'] == "output was modified outside incremental extraction"
+    assert list(read_output(output_path)[0]) == ['A']
+
+
+def test_kept_statistics_are_not_rounded(data_file, output_path):
+    run(data_file, [('A', 0, 49, ''), ('B', 50, 99, ''), ('C', 100, 149, '')], output_path)
+    summary = run(data_file, [('A', 0, 49, ''), ('B', 60, 120, ''), ('C', 100, 149, '')], output_path)
+    assert summary['full_reason'] is None and summary['unchanged'] == 2
+
+    # A and C come back from the manifest; B is computed again
+    table = read_output(output_path)[1].set_index('Window')
+    values = load_sensor_file(data_file)['Value']
+    for name, first, last in [('A', 0, 49), ('B', 60, 120), ('C', 100, 149)]:
+        window = values.iloc[first:last + 1]
+        expected = [window.min(), window.max(), window.mean(), np.sqrt((window ** 2).mean()), window.std()]
+        np.testing.assert_allclose(table.loc[name, ['Min', 'Max', 'Mean', 'RMS', 'Std']].to_numpy(float),
+                                   expected, rtol=1e-12)
@@ -0,0 +1,91 @@
+import pytest
+
+import sensor_cache
+import sensor_io
+from sensor_cache import SensorFileCache
+from sensor_io import IndexDtypeError, iter_sensor_chunks, load_sensor_file, pyarrow_available
+
+ENGINES = ['c', 'auto'] + (['pyarrow'] if pyarrow_available() else [])
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('chunksize', [None, 2])
+def test_fractional_index_falls_back_to_float64(write_sensor_file, engine, chunksize):
+    path = write_sensor_file(['0.0;1', '0.5;2', '1.0;3', '1.5;4'])
+    data = load_sensor_file(path, engine=engine, chunksize=chunksize)
+    assert data['Index'].dtype == 'float64'
+    assert data['Index'].tolist() == [0.0, 0.5, 1.0, 1.5]
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('chunksize', [None, 1])
+def test_int32_index_that_overflows_falls_back_to_float64(write_sensor_file, engine, chunksize):
+    path = write_sensor_file(['3000000000;1', '3000000001;2'])
+    data = load_sensor_file(path, index_dtype='int32', engine=engine, chunksize=chunksize)
+    assert data['Index'].tolist() == [3000000000, 3000000001]
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('chunksize', [None, 2])
+@pytest.mark.parametrize('index_dtype, value_dtype', [('int64', 'float64'), ('int32', 'float32'), ('float64', 'float32')])
+def test_requested_dtypes(write_sensor_file, engine, chunksize, index_dtype, value_dtype):
+    path = write_sensor_file(['1;0.5', '2;-1.25', '3;1e3'])
+    data = load_sensor_file(path, index_dtype=index_dtype, value_dtype=value_dtype, engine=engine, chunksize=chunksize)
+    assert data.dtypes.astype(str).tolist() == [index_dtype, value_dtype]
+    assert data['Index'].tolist() == [1, 2, 3]
+    assert data['Value'].tolist() == [0.5, -1.25, 1000.0]
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_channel_layouts(write_sensor_file, engine):
+    data = load_sensor_file(write_sensor_file(['0;1;2', '1;3;4']), engine=engine)
+    assert data.columns.tolist() == ['Index', 'Channel_1', 'Channel_2']
+    data = load_sensor_file(write_sensor_file(['Index;Force;Strain', '0;1;2', '1;3;4']), engine=engine)
+    assert data.columns.tolist() == ['Index', 'Force', 'Strain']
+    assert data['Strain'].tolist() == [2.0, 4.0]
+
+
+def test_chunks_raise_index_dtype_error(write_sensor_file):
+    path = write_sensor_file(['0;1', '1;2', '1.5;3'])
+    with pytest.raises(IndexDtypeError):
+        list(iter_sensor_chunks(path, 2))
+    with pytest.raises(IndexDtypeError):
+        list(iter_sensor_chunks(write_sensor_file(['0;1', '99999999999999999999;2']), 2))
+
+
+@pytest.mark.parametrize('chunksize', [None, 2])
+def test_unparsable_value_is_not_an_index_error(write_sensor_file, chunksize):
+    path = write_sensor_file(['0;1', '1;2', '2;not a number'])
+    with pytest.raises(ValueError) as raised:
+        load_sensor_file(path, engine='c', chunksize=chunksize)
+    assert not isinstance(raised.value, IndexDtypeError)
+
+
+@pytest.mark.parametrize('chunksize', [None, 2])
+def test_parse_errors_are_not_retried_as_float64(write_sensor_file, monkeypatch, chunksize):
+    calls = []
+    load = sensor_io._load
+    monkeypatch.setattr(sensor_io, '_load', lambda path, index_dtype, *args: calls.append(index_dtype) or
+                        load(path, index_dtype, *args))
+    for lines in (['0;1', '1;not a number'], ['0;1', 'abc;2'], ['0;1', '1;2;3']):
+        calls.clear()
+        with pytest.raises(ValueError):
+            load_sensor_file(write_sensor_file(lines), engine='c', chunksize=chunksize)
+        assert calls == ['int64']
+
+    calls.clear()
+    load_sensor_file(write_sensor_file(['0;1', '0.5;2']), engine='c', chunksize=chunksize)
+    assert calls == ['int64', 'float64']
+
+
+def test_cache_build_does_not_retry_parse_errors(write_sensor_file, tmp_path, monkeypatch):
+    calls = []
+    iter_chunks = sensor_cache.iter_sensor_chunks
+    monkeypatch.setattr(sensor_cache, 'iter_sensor_chunks', lambda path, chunksize, index_dtype, *args:
+                        calls.append(index_dtype) or iter_chunks(path, chunksize, index_dtype, *args))
+    cache = SensorFileCache(cache_dir=str(tmp_path / 'cache'))
+    with pytest.raises(ValueError):
+        cache.build(write_sensor_file(['0;1', '1;not a number']), chunksize=1)
+    assert calls == ['int64']
+    cache.build(write_sensor_file(['0;1', '0.5;2'], name='fraction.txt'), chunksize=1)
+    assert calls == ['int64', 'int64', 'float64']
@@ -0,0 +1,27 @@
+import pytest
+
+from sensor_offsets import build_offset_index
+
+
+def test_read_window_parses_only_the_window(write_sensor_file):
+    path = write_sensor_file([f"{i};{i * 0.5}" for i in range(100)])
+    offset_index = build_offset_index(path, every=8)
+    rows = offset_index.read_window(path, 17, 42)
+    assert rows['Index'].tolist() == list(range(17, 43))
+    assert rows['Value'].tolist() == [i * 0.5 for i in range(17, 43)]
+    assert offset_index.read_window(path, 200, 300).empty
+
+
+def test_unsorted_lines_between_samples_raise(write_sensor_file):
+    # Lines 0, 4, 8, ... are sampled and ascending; 5 and 6 are swapped between them
+    indexes = [0, 1, 2, 3, 4, 6, 5, 7, 8, 9, 10, 11]
+    path = write_sensor_file([f"{i};1.0" for i in indexes])
+    offset_index = build_offset_index(path, every=4)
+    with pytest.raises(ValueError, match="not sorted"):
+        offset_index.read_window(path, 5, 6)
+
+
+def test_unsorted_samples_raise(write_sensor_file):
+    path = write_sensor_file([f"{i};1.0" for i in [0, 1, 5, 3, 2, 6]])
+    with pytest.raises(ValueError, match="not sorted"):
+        build_offset_index(path, every=2)
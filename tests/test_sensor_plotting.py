@@ -0,0 +1,34 @@
+import matplotlib
+import numpy as np
+import pandas as pd
+import pytest
+
+from sensor_plotting import plot_workbook_sheets, plot_workbook_sheets_parallel
+
+OPTIONS = {'width': 4, 'height': 3, 'dpi': 50, 'file_format': 'png', 'style': 'ggplot',
+           'x_label': 'Index', 'y_label': 'Value'}
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = str(tmp_path / 'windows.xlsx')
+    with pd.ExcelWriter(path) as writer:
+        for name in ('A', 'B'):
+            pd.DataFrame({'Index': np.arange(10), 'Value': np.arange(10) * 0.5}).to_excel(writer, sheet_name=name,
+                                                                                           index=False)
+    return path
+
+
+def test_rendering_leaves_the_process_style_alone(workbook, tmp_path):
+    rc_before = dict(matplotlib.rcParams)
+    summary = plot_workbook_sheets(workbook, ['A', 'B'], str(tmp_path), OPTIONS)
+    assert summary['successful'] == 2
+    assert (tmp_path / 'A.png').exists()
+    assert dict(matplotlib.rcParams) == rc_before
+
+
+def test_parallel_plotting_reports_wall_time(workbook, tmp_path):
+    summary = plot_workbook_sheets_parallel(workbook, ['A', 'B', 'Missing'], str(tmp_path), OPTIONS, workers=2)
+    assert (summary['successful'], summary['failed'], summary['workers']) == (2, 1, 2)
+    assert summary['seconds'] > 0 and 'speedup' not in summary
+    assert (tmp_path / 'B.png').exists()
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sensor_stats import STATISTICS, SUMMARY_COLUMNS, WindowStatistics, summary_columns, window_summary
+from sensor_windows import WindowIndex
+
+
+def reference_summary(data, windows, channel='Value'):
+    """Per-window statistics computed one boolean mask at a time with pandas"""
+    rows = []
+    for name, start, end, _ in windows:
+        window = data[(data['Index'] >= start) & (data['Index'] <= end)]
+        if window.empty:
+            continue
+        values = window[channel]
+        rows.append([values.min(), values.max(), values.mean(), np.sqrt((values ** 2).mean()),
+                     values.max() - values.min(), values.std()])
+    return np.array(rows)
+
+
+def make_windows(layout, rows, rng):
+    if layout == 'sparse':
+        starts, lengths = rng.integers(0, rows, 20), np.full(20, 300)
+    elif layout == 'dense':
+        starts, lengths = np.arange(0, rows, 1000), np.full(rows // 1000, 999)
+    else:
+        starts, lengths = rng.integers(0, rows, 200), rng.integers(0, 5000, 200)
+    windows = [(f"Window_{i+1}", int(start), int(start + length), 'x')
+               for i, (start, length) in enumerate(zip(starts, lengths))]
+    # A window past the end of the data has no Summary row
+    return windows + [('Window_empty', rows + 10, rows + 20, 'x')]
+
+
+@pytest.mark.parametrize('index_sorted', [True, False])
+@pytest.mark.parametrize('layout', ['sparse', 'dense', 'overlapping'])
+def test_window_summary_matches_pandas(index_sorted, layout):
+    rng = np.random.default_rng(0)
+    rows = 50_000
+    index = np.arange(rows) if index_sorted else rng.permutation(rows)
+    # A large offset checks that the shifted sums keep the variance precise
+    data = pd.DataFrame({'Index': index, 'Value': rng.normal(5000.0, 0.01, rows)})
+    windows = make_windows(layout, rows, rng)
+
+    table = window_summary(WindowIndex(data), windows)
+    expected = reference_summary(data, windows)
+
+    assert list(table.columns) == SUMMARY_COLUMNS
+    assert 'Window_empty' not in table['Window'].tolist()
+    np.testing.assert_allclose(table[STATISTICS].to_numpy(), expected, rtol=1e-9)
+    counts = [data['Index'].between(start, end).sum() for _, start, end, _ in windows[:-1]]
+    assert table['Rows'].tolist() == [count for count in counts if count]
+
+
+def test_blocks_added_one_at_a_time_match_one_pass():
+    rng = np.random.default_rng(1)
+    data = pd.DataFrame({'Index': np.arange(30_000), 'Value': rng.normal(0.0, 1.0, 30_000)})
+    windows = make_windows('overlapping', 30_000, rng)
+
+    statistics = WindowStatistics(windows)
+    for first in range(0, len(data), 7_000):
+        statistics.add(WindowIndex(data.iloc[first:first + 7_000]))
+
+    pd.testing.assert_frame_equal(statistics.table(), window_summary(WindowIndex(data), windows), rtol=1e-9)
+
+
+def test_multi_channel_columns():
+    data = pd.DataFrame({'Index': np.arange(10), 'a': np.arange(10.0), 'b': -np.arange(10.0)})
+    table = window_summary(WindowIndex(data), [('Window_1', 2, 5, 'x')])
+    assert list(table.columns) == summary_columns(['a', 'b'])
+    assert table[['a Min', 'a Max', 'b Min', 'b Max']].iloc[0].tolist() == [2.0, 5.0, -5.0, -2.0]
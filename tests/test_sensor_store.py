@@ -0,0 +1,109 @@
+import os
+import warnings
+
+import pandas as pd
+import pytest
+
+from sensor_store import (HDF5WindowWriter, ParquetWindowWriter, WindowStoreFile, detect_output_format,
+                          tables_available)
+
+
+def window(first, count):
+    return pd.DataFrame({'Index': range(first, first + count), 'Value': [float(i) for i in range(count)]})
+
+
+def test_detect_output_format(tmp_path):
+    assert detect_output_format(str(tmp_path / 'out.parquet')) == 'parquet'
+    assert detect_output_format(str(tmp_path / 'out.h5')) == 'hdf5'
+    assert detect_output_format(str(tmp_path / 'out.xlsx')) == 'xlsx'
+    # A plain folder is not a store; one with a windows.json is, whatever its name
+    assert detect_output_format(str(tmp_path)) == 'xlsx'
+    (tmp_path / 'windows.json').write_text('{"windows": []}')
+    assert detect_output_format(str(tmp_path)) == 'parquet'
+
+
+def test_parquet_rewrite_removes_only_its_own_windows(tmp_path):
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'out.parquet')
+    os.makedirs(path)
+    window(0, 3).to_parquet(os.path.join(path, 'unrelated.parquet'))
+    with ParquetWindowWriter(path) as writer:
+        writer.write_window('A', window(0, 5), bounds=(0, 4))
+        writer.write_window('B', window(5, 5), bounds=(5, 9))
+        writer.write_summary(pd.DataFrame({'Window': ['A', 'B']}))
+
+    with ParquetWindowWriter(path) as writer:
+        writer.write_window('C', window(10, 2), bounds=(10, 11))
+
+    assert sorted(os.listdir(path)) == ['C.parquet', 'unrelated.parquet', 'windows.json']
+    store = WindowStoreFile(path)
+    assert store.sheet_names == ['C']
+    assert store.read_summary() is None
+
+
+@pytest.mark.skipif(tables_available(), reason="PyTables is installed")
+def test_hdf5_needs_pytables(tmp_path):
+    with pytest.raises(ImportError, match="PyTables"):
+        HDF5WindowWriter(str(tmp_path / 'out.h5'))
+
+
+def test_hdf5_round_trip(tmp_path):
+    pytest.importorskip('tables')
+    path = str(tmp_path / 'out.h5')
+    with HDF5WindowWriter(path) as writer:
+        writer.write_window('A', window(0, 5), bounds=(0, 4))
+        writer.append_rows('B', window(5, 3), bounds=(5, 9))
+        writer.append_rows('B', window(8, 2), bounds=(5, 9))
+        writer.write_summary(pd.DataFrame({'Window': ['A', 'B'], 'Rows': [5, 5]}))
+
+    store = WindowStoreFile(path)
+    try:
+        assert store.sheet_names == ['A', 'B']
+        assert store.windows['B']['rows'] == 5 and store.windows['B']['last_index'] == 9
+        pd.testing.assert_frame_equal(store.parse('B').reset_index(drop=True),
+                                      pd.concat([window(5, 3), window(8, 2)], ignore_index=True))
+        assert store.read_summary()['Rows'].tolist() == [5, 5]
+    finally:
+        store.close()
+
+
+def test_hdf5_file_is_closed_when_writing_fails(tmp_path):
+    pytest.importorskip('tables')
+    path = str(tmp_path / 'out.h5')
+    writer = HDF5WindowWriter(path)
+    with pytest.raises(RuntimeError):
+        with writer:
+            writer.write_window('A', window(0, 5))
+            raise RuntimeError("extraction failed")
+    assert not writer._store.is_open
+    # A summary that cannot be stored fails close() itself
+    writer = HDF5WindowWriter(path)
+    writer.write_summary(pd.DataFrame({'Window': [object()]}))
+    with pytest.raises(Exception):
+        writer.close()
+    assert not writer._store.is_open
+
+
+def test_hdf5_window_names_are_natural_names(tmp_path):
+    tables = pytest.importorskip('tables')
+    path = str(tmp_path / 'out.h5')
+    names = ['1', '2.5-x', 'class', '_summary', 'A', 'A.']
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', tables.NaturalNameWarning)
+        with HDF5WindowWriter(path) as writer:
+            for position, name in enumerate(names):
+                if position % 2:
+                    writer.append_rows(name, window(position, 2))
+                else:
+                    writer.write_window(name, window(position, 2))
+
+        store = WindowStoreFile(path)
+        try:
+            assert store.sheet_names == names
+            assert [store.windows[name]['key'] for name in names] == ['w_1', 'w_2_5_x', 'w_class', 'w__summary',
+                                                                       'A', 'A_']
+            for position, name in enumerate(names):
+                assert store._store.get_storer(f"windows/{store.windows[name]['key']}").attrs.window_name == name
+                assert store.parse(name)['Index'].tolist() == [position, position + 1]
+        finally:
+            store.close()
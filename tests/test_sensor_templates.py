@@ -0,0 +1,15 @@
+from sensor_templates import parse_text_template
+
+
+def test_text_template_lines(tmp_path):
+    path = tmp_path / 'template.txt'
+    path.write_text("100,500\n\n500,100\nabc,5\n600 700\n700,700\n")
+    line_count, results = parse_text_template(str(path))
+    assert line_count == 6
+    assert results == [
+        ('Window_1', ('Window_1', 100, 500, "Will be extracted"), None),
+        ('Line 3', None, "Start after end - 500,100"),
+        ('Line 4', None, "Invalid numbers - abc,5"),
+        ('Line 5', None, "Missing comma - 600 700"),
+        ('Window_6', ('Window_6', 700, 700, "Will be extracted"), None),
+    ]
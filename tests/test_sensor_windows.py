@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sensor_windows import WindowIndex, WindowRouter
+
+
+def sensor_data(index):
+    return pd.DataFrame({'Index': np.asarray(index), 'Value': np.arange(len(index), dtype=float)})
+
+
+def masked(data, start, end):
+    return data[(data['Index'] >= start) & (data['Index'] <= end)]
+
+
+SORTED = [0, 1, 2, 2, 2, 3, 5, 8, 8, 9]
+UNSORTED = [5, 2, 8, 0, 2, 9, 1, 8, 3, 2]
+RANGES = [(2, 2), (2, 8), (-5, 0), (9, 20), (4, 4), (6, 7), (10, 20), (-9, -1), (3, 1), (0, 9), (1.5, 2.5)]
+
+
+@pytest.mark.parametrize('index', [SORTED, UNSORTED])
+@pytest.mark.parametrize('start, end', RANGES)
+def test_window_matches_boolean_mask(index, start, end):
+    data = sensor_data(index)
+    data_index = WindowIndex(data)
+    expected = masked(data, start, end)
+    pd.testing.assert_frame_equal(data_index.window(start, end), expected)
+    assert data_index.count(start, end) == len(expected)
+
+
+def test_sorted_window_is_a_contiguous_slice():
+    data_index = WindowIndex(sensor_data(SORTED))
+    assert data_index.is_sorted
+    # Both ends are inclusive, and every duplicate of a boundary value is included
+    assert data_index.bounds(2, 8) == (2, 9)
+    assert data_index.bounds(4, 4) == (6, 6)
+    assert data_index.bounds(3, 1) == (5, 5)
+    with pytest.raises(ValueError):
+        WindowIndex(sensor_data(UNSORTED)).bounds(2, 8)
+
+
+@pytest.mark.parametrize('index', [SORTED, UNSORTED])
+def test_bounds_many_matches_single_lookups(index):
+    data_index = WindowIndex(sensor_data(index))
+    starts = np.array([start for start, _ in RANGES])
+    ends = np.array([end for _, end in RANGES])
+    firsts, stops = data_index.bounds_many(starts, ends)
+    for first, stop, start, end in zip(firsts, stops, starts, ends):
+        assert stop - first == data_index.count(start, end)
+        values = data_index.sorted_column('Index')[first:stop]
+        assert np.all((values >= start) & (values <= end))
+
+
+def test_enforce_sorted_and_known_sortedness():
+    data_index = WindowIndex(sensor_data(UNSORTED), enforce_sorted=True)
+    assert data_index.is_sorted
+    assert data_index.window(2, 2)['Value'].tolist() == [1.0, 4.0, 9.0]
+
+    # attrs['index_sorted'] is trusted instead of scanning the column
+    data = sensor_data(SORTED)
+    data.attrs['index_sorted'] = False
+    assert not WindowIndex(data).is_sorted
+
+
+def brute_force_overlapping(windows, low, high):
+    return [position for position, (_, start, end) in enumerate(windows) if start <= high and end >= low]
+
+
+def test_router_matches_brute_force():
+    rng = np.random.default_rng(0)
+    starts = rng.integers(0, 1000, 300)
+    windows = [(f"W{i}", int(start), int(start + length)) for i, (start, length)
+               in enumerate(zip(starts, rng.integers(0, 50, 300)))]
+    router = WindowRouter(windows)
+    for low in range(-10, 1060, 7):
+        for high in (low, low + 3, low + 40):
+            assert router.overlapping(low, high).tolist() == brute_force_overlapping(windows, low, high)
+
+
+def test_router_endpoints_are_inclusive():
+    windows = [('A', 0, 10), ('B', 10, 20), ('C', 21, 30), ('D', 5, 5)]
+    router = WindowRouter(windows)
+    assert router.covering(10).tolist() == [0, 1]
+    assert router.covering(5).tolist() == [0, 3]
+    assert router.covering(20.5).tolist() == []
+    assert router.overlapping(20, 21).tolist() == [1, 2]
+    assert router.overlapping(31, 40).tolist() == []
+    assert router.overlapping(-5, -1).tolist() == []
+
+
+def test_router_ended_before():
+    router = WindowRouter([('A', 0, 10), ('B', 10, 20), ('C', 0, 5), ('D', 12, 20)])
+    assert router.ended_before(5).tolist() == []
+    assert router.ended_before(6).tolist() == [2]
+    assert router.ended_before(20).tolist() == [2, 0]
+    assert router.ended_before(21).tolist() == [2, 0, 1, 3]
+
+
+def test_empty_router():
+    router = WindowRouter([])
+    assert len(router) == 0
+    assert router.overlapping(0, 100).tolist() == []
+    assert router.ended_before(100).tolist() == []
+
+
+def test_router_rejects_inverted_windows():
+    with pytest.raises(ValueError, match="b starts after it ends"):
+        WindowRouter([('a', 0, 10), ('b', 10, 5)])
+    # A single-point window is a valid interval
+    assert WindowRouter([('a', 5, 5)]).covering(5).tolist() == [0]